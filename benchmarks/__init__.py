@@ -0,0 +1 @@
+"""Benchmarks do catálogo sobre dados sintéticos (executar com ``python -m benchmarks.<nome>``)"""
@@ -0,0 +1,129 @@
+"""Gerador de catálogos sintéticos no formato do JSON de filmes.
+
+Uso: ``python -m benchmarks.catalog --size 100k --output /tmp/movies-100k.json``
+"""
+import argparse
+import atexit
+import os
+import random
+import shutil
+import tempfile
+
+GENRES = ('Action', 'Adventure', 'Comedy', 'Crime', 'Drama', 'Fantasy', 'Horror', 'Romance', 'Sci-Fi', 'Thriller')
+WORDS = (
+    'amor', 'guerra', 'noite', 'cidade', 'segredo', 'viagem', 'família', 'destino', 'sombra', 'herói',
+    'mar', 'estrela', 'último', 'perdido', 'futuro', 'vingança', 'ação', 'sonho', 'fogo', 'silêncio',
+)
+LANGUAGES = ('English', 'Portuguese', 'Spanish', 'French', 'Japanese', 'Korean')
+COUNTRIES = ('USA', 'Brazil', 'Spain', 'France', 'Japan', 'South Korea', 'UK')
+# Tamanhos de catálogo usados nos benchmarks
+SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+
+
+def iter_synthetic_movies(count, seed=0):
+    """Gera ``count`` filmes com ids 1..count no formato de ``convert_omdb_to_movie``"""
+    rng = random.Random(seed)
+    for pk in range(1, count + 1):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).capitalize()
+        yield {
+            'id': pk,
+            'title': f'{title} {pk}',
+            'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(15, 40))),
+            'genre': ', '.join(rng.sample(GENRES, rng.randint(1, 3))),
+            'release_year': rng.randint(1950, 2025),
+            'duration_minutes': rng.randint(70, 200),
+            'rating': round(rng.uniform(1, 10), 1),
+            'thumbnail_url': f'https://example.com/thumbs/{pk}.jpg',
+            'video_url': f'https://example.com/videos/{pk}.mp4',
+            'is_featured': rng.random() < 0.05,
+            'imdb_id': f'tt{pk:07d}',
+            'director': f'Diretor {rng.randint(1, 2000)}',
+            'actors': ', '.join(f'Ator {rng.randint(1, 20000)}' for _ in range(3)),
+            'writer': f'Roteirista {rng.randint(1, 3000)}',
+            'language': rng.choice(LANGUAGES),
+            'country': rng.choice(COUNTRIES),
+            'awards': rng.choice(('', 'N/A', '2 wins & 5 nominations')),
+            'metascore': str(rng.randint(20, 100)),
+            'imdb_votes': f'{rng.randint(100, 2000000):,}',
+            'created_at': '2024-01-01T00:00:00',
+            'updated_at': '2024-01-01T00:00:00',
+        }
+
+
+def synthetic_movies(count, seed=0):
+    """Lista com ``count`` filmes sintéticos (ver ``iter_synthetic_movies``)"""
+    return list(iter_synthetic_movies(count, seed))
+
+
+def parse_size(value):
+    """Aceita os nomes de ``SIZES`` (1k, 100k, 1m) ou um número de filmes"""
+    return SIZES.get(value.lower()) or int(value)
+
+
+def write_catalog(path, count, seed=0):
+    """Grava um catálogo sintético no formato do snapshot do store, filme a filme"""
+    from movies.encoding import dumps
+
+    with open(path, 'wb') as file:
+        file.write(b'{"movies":[')
+        for pk, movie in enumerate(iter_synthetic_movies(count, seed), start=1):
+            if pk > 1:
+                file.write(b',')
+            file.write(dumps(movie))
+        file.write(b'],' + dumps({'last_id': count, 'seq': 0, 'modified_at': None})[1:])
+    return path
+
+
+def setup_django(count, seed=0, catalog=None, **overrides):
+    """Configura o Django para usar um catálogo sintético em um diretório temporário.
+
+    ``catalog`` reaproveita um arquivo gerado por ``python -m benchmarks.catalog``
+    (é copiado para o diretório temporário, pois os benchmarks gravam nele).
+    Deve ser chamada antes de importar ``movies.store``; retorna o caminho do
+    catálogo. O diretório é removido ao fim do processo.
+    """
+    configure_django(None, **overrides)
+    directory = tempfile.mkdtemp(prefix='movies-bench-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    path = os.path.join(directory, 'movies.json')
+    if catalog:
+        shutil.copyfile(catalog, path)
+    else:
+        write_catalog(path, count, seed)
+    from django.conf import settings
+    settings.MOVIES_JSON_FILE = path
+    return path
+
+
+def configure_django(path, **overrides):
+    """Configura o Django dos benchmarks para usar o catálogo em ``path`` (None: definido depois)"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netflix_project.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    if path is not None:
+        settings.MOVIES_JSON_FILE = path
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['localhost']
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help='Arquivo JSON a gerar')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netflix_project.settings')
+    import django
+    django.setup()
+    write_catalog(args.output, args.size, args.seed)
+    print(f'{args.size} filmes gravados em {args.output} ({os.path.getsize(args.output) / 2**20:.1f}MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""Driver de carga local: repete tráfego misto de leitura e escrita nas aplicações WSGI e ASGI.
+
+As requisições são entregues diretamente à aplicação (sem servidor HTTP),
+então o resultado mede o Django, a API e o store, não a rede.
+
+Uso: ``python -m benchmarks.load --size 100k --interface both --requests 5000 --concurrency 8``
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from .catalog import GENRES, SIZES, WORDS, parse_size, setup_django
+from .results import print_results, summarize, write_results
+
+HOST = 'localhost'
+# Peso de cada tipo de requisição no tráfego de leitura
+READ_MIX = (
+    ('list', 30),
+    ('list_filtered', 20),
+    ('search', 10),
+    ('detail', 25),
+    ('cursor', 5),
+    ('multi_get', 10),
+)
+# Peso de cada tipo de requisição no tráfego de escrita
+WRITE_MIX = (
+    ('create', 1),
+    ('patch', 3),
+)
+
+
+def new_movie(rng):
+    return {
+        'title': f'Carga {rng.randint(1, 10**9)}',
+        'description': ' '.join(rng.choice(WORDS) for _ in range(20)),
+        'genre': rng.choice(GENRES),
+        'release_year': rng.randint(1950, 2025),
+        'duration_minutes': rng.randint(70, 200),
+        'rating': round(rng.uniform(1, 10), 1),
+        'thumbnail_url': 'https://example.com/thumbs/carga.jpg',
+        'video_url': 'https://example.com/videos/carga.mp4',
+    }
+
+
+def build_traffic(count, requests, write_ratio, seed):
+    """Lista determinística de (tipo, método, caminho, query, corpo) para ``requests`` requisições"""
+    rng = random.Random(seed)
+    read_kinds, read_weights = zip(*READ_MIX)
+    write_kinds, write_weights = zip(*WRITE_MIX)
+    traffic = []
+    for _ in range(requests):
+        if rng.random() < write_ratio:
+            kind = rng.choices(write_kinds, write_weights)[0]
+        else:
+            kind = rng.choices(read_kinds, read_weights)[0]
+        method, path, query, body = 'GET', '/api/movies/', {}, None
+        if kind == 'list':
+            query = {'page': rng.randint(1, 20)}
+        elif kind == 'list_filtered':
+            query = {'genre': rng.choice(GENRES), 'min_rating': rng.randint(1, 8), 'ordering': '-rating'}
+        elif kind == 'search':
+            query = {'search': ' '.join(rng.sample(WORDS, 2))}
+        elif kind == 'detail':
+            path = f'/api/movies/{rng.randint(1, count)}/'
+        elif kind == 'cursor':
+            query = {'cursor': '', 'ordering': '-release_year'}
+        elif kind == 'multi_get':
+            query = {'ids': ','.join(str(rng.randint(1, count)) for _ in range(20))}
+        elif kind == 'create':
+            method, body = 'POST', new_movie(rng)
+        elif kind == 'patch':
+            method = 'PATCH'
+            path = f'/api/movies/{rng.randint(1, count)}/'
+            body = {'rating': round(rng.uniform(1, 10), 1)}
+        traffic.append((kind, method, path, urlencode(query), json.dumps(body).encode() if body else b''))
+    return traffic
+
+
+def wsgi_environ(method, path, query, body):
+    return {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': HOST,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def run_wsgi(application, traffic, concurrency):
+    """Executa o tráfego com ``concurrency`` threads; retorna [(tipo, status, duração)] e o tempo total"""
+    samples = []
+    lock = threading.Lock()
+
+    def call(request):
+        kind, method, path, query, body = request
+        status = []
+        start = time.perf_counter()
+        result = application(wsgi_environ(method, path, query, body), lambda line, headers: status.append(line))
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.append((kind, int(status[0].split()[0]), elapsed))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(call, traffic))
+    return samples, time.perf_counter() - start
+
+
+async def asgi_call(application, method, path, query, body):
+    """Entrega uma requisição HTTP à aplicação ASGI e retorna o status"""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': (HOST, 80),
+    }
+    done = asyncio.Event()
+    sent = False
+    status = None
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        # O Django aguarda a desconexão em paralelo à resposta: só ocorre no fim
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body'):
+            done.set()
+
+    await application(scope, receive, send)
+    done.set()
+    return status
+
+
+async def run_asgi_async(application, traffic, concurrency):
+    samples = []
+    pending = iter(traffic)
+
+    async def worker():
+        for kind, method, path, query, body in pending:
+            start = time.perf_counter()
+            status = await asgi_call(application, method, path, query, body)
+            samples.append((kind, status, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def run_asgi(application, traffic, concurrency):
+    """Executa o tráfego com ``concurrency`` tarefas asyncio; retorna [(tipo, status, duração)] e o tempo total"""
+    return asyncio.run(run_asgi_async(application, traffic, concurrency))
+
+
+def summarize_run(interface, samples, elapsed, results):
+    """Acrescenta a ``results`` o resumo geral e por tipo de requisição; retorna os erros"""
+    by_kind = defaultdict(list)
+    errors = 0
+    for kind, status, duration in samples:
+        by_kind[kind].append(duration)
+        if status >= 500 or status in (400, 404):
+            errors += 1
+    results[f'{interface}[all]'] = {
+        **summarize([duration for _, _, duration in samples], elapsed=elapsed), 'errors': errors,
+    }
+    for kind in sorted(by_kind):
+        results[f'{interface}[{kind}]'] = summarize(by_kind[kind])
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--catalog', help='Catálogo gerado por benchmarks.catalog (em vez de gerar um)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--interface', choices=('wsgi', 'asgi', 'both'), default='both')
+    parser.add_argument('--requests', type=int, default=5000, help='Requisições por interface')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--write-ratio', type=float, default=0.05, help='Fração de escritas (padrão: 0.05)')
+    parser.add_argument('--warmup', type=int, default=200, help='Requisições de aquecimento não medidas')
+    parser.add_argument('--async-views', action='store_true',
+                        help='Usa as views assíncronas (MOVIES_ASYNC_VIEWS), como no deploy ASGI')
+    parser.add_argument('--output', help='Arquivo de resultados (padrão: benchmarks/results/load-<revisão>.json)')
+    args = parser.parse_args()
+
+    if args.async_views:
+        os.environ['MOVIES_ASYNC_VIEWS'] = '1'
+    setup_django(args.size, args.seed, args.catalog)
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from movies.store import get_store
+
+    count = len(get_store().snapshot())
+    print(f'{count} filmes; {args.requests} requisições por interface, concorrência {args.concurrency}, '
+          f'{args.write_ratio:.0%} escritas')
+    runners = {'wsgi': (run_wsgi, get_wsgi_application), 'asgi': (run_asgi, get_asgi_application)}
+    interfaces = ('wsgi', 'asgi') if args.interface == 'both' else (args.interface,)
+    results = {}
+    for interface in interfaces:
+        run, get_application = runners[interface]
+        application = get_application()
+        run(application, build_traffic(count, args.warmup, args.write_ratio, args.seed + 1), args.concurrency)
+        samples, elapsed = run(
+            application, build_traffic(count, args.requests, args.write_ratio, args.seed), args.concurrency,
+        )
+        errors = summarize_run(interface, samples, elapsed, results)
+        if errors:
+            print(f'  {interface}: {errors} requisições com erro')
+
+    print_results(results)
+    parameters = {'movies': count, 'seed': args.seed, 'requests': args.requests,
+                  'concurrency': args.concurrency, 'write_ratio': args.write_ratio, 'warmup': args.warmup,
+                  'async_views': args.async_views}
+    print(f'Resultados em {write_results("load", parameters, results, args.output)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Memória por filme do catálogo em dicionários e na representação colunar (MOVIES_CATALOG_LAYOUT).
+
+Mede com ``tracemalloc`` o que fica alocado depois de carregar o catálogo:
+só os filmes (lista de dicionários x ``ColumnarCatalog``) e o snapshot
+completo, com os índices. Também mede o custo de materializar um filme.
+
+Uso: ``python -m benchmarks.memory --size 100k [--output resultado.json]``
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from .catalog import SIZES, parse_size, setup_django
+from .results import write_results
+
+
+def retained(build):
+    """Bytes que continuam alocados pelo objeto retornado por ``build()``, e o objeto"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--catalog', help='Catálogo gerado por benchmarks.catalog (em vez de gerar um)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=10000, help='Filmes materializados na medição de tempo')
+    parser.add_argument('--output', help='Arquivo de resultados (padrão: benchmarks/results/memory-<revisão>.json)')
+    args = parser.parse_args()
+
+    path = setup_django(args.size, args.seed, args.catalog)
+    from movies.columnar import ColumnarCatalog
+    from movies.encoding import loads
+    from movies.store import CatalogSnapshot
+
+    def parsed():
+        with open(path, 'rb') as file:
+            return loads(file.read())['movies']
+
+    count = len(parsed())
+    cases = {
+        'movies[dict]': parsed,
+        'movies[columnar]': lambda: ColumnarCatalog(parsed()),
+        'snapshot[dict]': lambda: CatalogSnapshot(parsed(), layout='dict'),
+        'snapshot[columnar]': lambda: CatalogSnapshot(parsed(), layout='columnar'),
+    }
+    results = {}
+    print(f'{count} filmes')
+    print(f'  {"caso":<24} {"MB":>10} {"bytes/filme":>12} {"x dict":>8}')
+    for name, build in cases.items():
+        size, value = retained(build)
+        baseline = results.get(name.replace('columnar', 'dict'), {}).get('bytes', size)
+        results[name] = {'bytes': size, 'bytes_per_movie': size / count, 'ratio': size / baseline}
+        print(f'  {name:<24} {size / 2**20:10.1f} {size / count:12.0f} {size / baseline:8.2f}')
+        if name == 'movies[columnar]':
+            columns, rng = value.columns, random.Random(args.seed)
+            rows = [rng.randrange(count) for _ in range(args.repeat)]
+            start = time.perf_counter()
+            for row in rows:
+                columns.materialize(row)
+            elapsed = (time.perf_counter() - start) / len(rows)
+            results['materialize'] = {'us_per_movie': elapsed * 1e6}
+            print(f'  {"materializar um filme":<24} {elapsed * 1e6:10.2f} µs')
+        del value
+
+    parameters = {'movies': count, 'seed': args.seed, 'repeat': args.repeat}
+    print(f'Resultados em {write_results("memory", parameters, results, args.output)}')
+
+
+if __name__ == '__main__':
+    main()
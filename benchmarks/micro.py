@@ -0,0 +1,112 @@
+"""Micro-benchmarks do store e das listagens da API sobre um catálogo sintético.
+
+Uso: ``python -m benchmarks.micro --size 100k [--repeat 200] [--output resultado.json]``
+"""
+import argparse
+import random
+import time
+
+from .catalog import SIZES, parse_size, setup_django
+from .results import print_results, summarize, write_results
+
+# Consultas de ``get_all_movies`` medidas (nome -> query string)
+LIST_QUERIES = {
+    'list': '',
+    'list_page_50': 'page=50',
+    'list_no_count': 'count=false',
+    'search': 'search=amor+noite',
+    'genre': 'genre=Drama',
+    'genre_multi': 'genre=Drama,Crime',
+    'year': 'year=1999',
+    'featured': 'featured=true',
+    'rating_range': 'min_rating=7&max_rating=9',
+    'year_range': 'year_from=1990&year_to=2000',
+    'duration_range': 'min_duration=90&max_duration=120',
+    'ordering': 'ordering=-rating',
+    'combined': 'genre=Action&min_rating=6&ordering=-release_year',
+    'cursor': 'cursor=&ordering=-rating',
+    'multi_get': 'ids=' + ','.join(str(pk) for pk in range(1, 200, 7)),
+    'fields_card': 'fields=card',
+}
+
+
+def measure(function, repeat, batch=1):
+    """Duração de cada uma das ``repeat`` amostras, por operação (uma amostra executa ``batch`` chamadas)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(batch):
+            function()
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--catalog', help='Catálogo gerado por benchmarks.catalog (em vez de gerar um)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=200, help='Amostras por caso de leitura')
+    parser.add_argument('--load-repeat', type=int, default=5, help='Amostras das cargas completas do catálogo')
+    parser.add_argument('--write-repeat', type=int, default=20, help='Amostras das gravações')
+    parser.add_argument('--layout', choices=('dict', 'columnar'), default='dict',
+                        help='Representação do catálogo em memória (MOVIES_CATALOG_LAYOUT)')
+    parser.add_argument('--output', help='Arquivo de resultados (padrão: benchmarks/results/micro-<revisão>.json)')
+    args = parser.parse_args()
+
+    path = setup_django(
+        args.size, args.seed, args.catalog, MOVIES_RESPONSE_CACHE=None, MOVIES_CATALOG_LAYOUT=args.layout,
+    )
+    from rest_framework.request import Request
+    from django.test import RequestFactory
+    from movies.store import MovieStore, get_store, load_movies, save_movies
+    from movies.views import get_all_movies, paginate_response
+
+    store = get_store()
+    snapshot = store.snapshot()
+    count = len(snapshot)
+    print(f'{count} filmes em {path}')
+    rng = random.Random(args.seed)
+    factory = RequestFactory(HTTP_HOST='localhost')
+    results = {}
+
+    def record(name, samples):
+        results[name] = summarize(samples)
+
+    record('load_movies_cold', measure(lambda: MovieStore(path).snapshot(), args.load_repeat))
+    record('load_movies', measure(load_movies, args.load_repeat))
+    record('find_movie', measure(lambda: snapshot.index.get(rng.randint(1, count)), args.repeat, batch=100))
+    record('find_movie_imdb_id', measure(
+        lambda: snapshot.index.get_by_imdb_id(f'tt{rng.randint(1, count):07d}'), args.repeat, batch=100,
+    ))
+
+    for name, query in LIST_QUERIES.items():
+        def list_movies(query=query):
+            response = get_all_movies(factory.get('/api/movies/', QUERY_STRING=query))
+            assert response.status_code == 200, (query, response.status_code)
+            response.render()
+        record(f'get_all_movies[{name}]', measure(list_movies, args.repeat))
+
+    request = Request(factory.get('/api/movies/', {'page': 3}))
+    results_all = snapshot.query()
+    record('paginate_response', measure(lambda: paginate_response(results_all, request), args.repeat))
+
+    def save_one():
+        movies = load_movies()
+        index = rng.randrange(len(movies))
+        movies[index] = {**movies[index], 'rating': round(rng.uniform(1, 10), 1)}
+        assert save_movies(movies)
+    record('save_movies', measure(save_one, args.write_repeat))
+    record('store_update', measure(
+        lambda: store.update(rng.randint(1, count), lambda movie: {**movie, 'rating': 5.0}), args.write_repeat,
+    ))
+
+    print_results(results)
+    parameters = {'movies': count, 'seed': args.seed, 'repeat': args.repeat,
+                  'load_repeat': args.load_repeat, 'write_repeat': args.write_repeat}
+    print(f'Resultados em {write_results("micro", parameters, results, args.output)}')
+
+
+if __name__ == '__main__':
+    main()
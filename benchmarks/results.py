@@ -0,0 +1,134 @@
+"""Estatísticas e arquivos de resultado dos benchmarks, e comparação entre execuções.
+
+Uso: ``python -m benchmarks.results base.json novo.json [--threshold 10]``
+(retorna 1 se algum p50/p95 piorou mais que ``threshold`` por cento)
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentile(ordered, fraction):
+    """Percentil por posição mais próxima sobre amostras já ordenadas"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, elapsed=None, operations=None):
+    """p50/p95/p99 e média (ms) das durações em segundos e vazão em operações/s.
+
+    ``elapsed`` é o tempo total de parede (padrão: soma das amostras) e
+    ``operations`` o número de operações nele (padrão: uma por amostra).
+    """
+    ordered = sorted(samples)
+    elapsed = sum(ordered) if elapsed is None else elapsed
+    operations = len(ordered) if operations is None else operations
+    return {
+        'samples': len(ordered),
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'mean_ms': sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        'throughput_per_s': operations / elapsed if elapsed else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(RESULTS_DIR),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Dados da execução gravados junto dos resultados"""
+    from django.conf import settings
+    from movies import encoding
+
+    return {
+        'git_revision': git_revision(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'json_backend': encoding.BACKEND,
+        'storage_backend': getattr(settings, 'MOVIES_STORAGE_BACKEND', 'json'),
+        'catalog_layout': getattr(settings, 'MOVIES_CATALOG_LAYOUT', 'dict'),
+    }
+
+
+def write_results(suite, parameters, results, output=None):
+    """Grava os resultados em JSON (padrão: benchmarks/results/<suite>-<revisão>.json)"""
+    document = {'suite': suite, **environment(), 'parameters': parameters, 'results': results}
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f'{suite}-{document["git_revision"] or "local"}.json')
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2, ensure_ascii=False)
+        file.write('\n')
+    return output
+
+
+def print_results(results):
+    print(f'  {"caso":<40} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"ops/s":>11}')
+    for name, result in results.items():
+        print(
+            f'  {name:<40} {result["p50_ms"]:9.3f} {result["p95_ms"]:9.3f} '
+            f'{result["p99_ms"]:9.3f} {result["throughput_per_s"]:11.1f}'
+        )
+
+
+def compare(base, candidate, threshold):
+    """Imprime a variação de cada caso e retorna os nomes que pioraram além de ``threshold`` (%)"""
+    regressions = []
+    print(f'  {"caso":<40} {"p50":>16} {"p95":>16} {"ops/s":>16}')
+    for name, result in candidate['results'].items():
+        previous = base['results'].get(name)
+        if previous is None:
+            print(f'  {name:<40} (novo)')
+            continue
+        if 'p50_ms' not in result:
+            continue  # casos sem latência (ex.: memória) não entram na comparação
+        changes = []
+        for key in ('p50_ms', 'p95_ms', 'throughput_per_s'):
+            change = (result[key] / previous[key] - 1) * 100 if previous[key] else 0.0
+            changes.append(change)
+        if changes[0] > threshold or changes[1] > threshold:
+            regressions.append(name)
+        marker = '  <- regressão' if name in regressions else ''
+        print(f'  {name:<40} {changes[0]:+15.1f}% {changes[1]:+15.1f}% {changes[2]:+15.1f}%{marker}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('base')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Piora máxima aceita em p50/p95, em porcentagem (padrão: 10)')
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as file:
+        base = json.load(file)
+    with open(args.candidate, encoding='utf-8') as file:
+        candidate = json.load(file)
+    print(f'{base["suite"]}: {base.get("git_revision")} -> {candidate.get("git_revision")}')
+    regressions = compare(base, candidate, args.threshold)
+    if regressions:
+        print(f'{len(regressions)} caso(s) com regressão acima de {args.threshold:g}%')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
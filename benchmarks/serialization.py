@@ -0,0 +1,87 @@
+"""Compara a serialização padrão (json / JSONRenderer) com ``movies.encoding`` e os fragmentos.
+
+Uso: ``python -m benchmarks.serialization --movies 100000 --page-size 100 [--backend json]``
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netflix_project.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from .catalog import synthetic_movies  # noqa: E402
+
+
+def best_of(function, repeat):
+    """Menor tempo (segundos) entre ``repeat`` execuções"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def list_payloads(movies, page_size):
+    """Envelopes de paginação como os de ``paginate_response``, um por página"""
+    return [
+        {
+            'count': len(movies),
+            'next': None,
+            'previous': None,
+            'results': {'count': len(movies), 'results': movies[start:start + page_size]},
+        }
+        for start in range(0, len(movies), page_size)
+    ]
+
+
+def report(label, baseline, candidate, unit='s'):
+    print(f'  {label:<38} {baseline:9.3f}{unit} -> {candidate:9.3f}{unit}  ({baseline / candidate:5.1f}x)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--backend', choices=('auto', 'json'), default='auto',
+                        help='MOVIES_JSON_BACKEND usado nesta execução')
+    args = parser.parse_args()
+
+    django.setup()
+    settings.MOVIES_JSON_BACKEND = args.backend
+    from rest_framework.renderers import JSONRenderer
+    from movies import encoding
+    from movies.renderers import encode
+
+    movies = synthetic_movies(args.movies)
+    by_id = {movie['id']: movie for movie in movies}
+    print(f'{args.movies} filmes sintéticos, backend JSON: {encoding.BACKEND}')
+
+    print('Arquivo do catálogo:')
+    document = {'movies': movies}
+    pretty = json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')
+    compact = encoding.dumps(document)
+    report('gravação (indent=2 -> compacto)', best_of(
+        lambda: json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8'), args.repeat,
+    ), best_of(lambda: encoding.dumps(document), args.repeat))
+    report('leitura', best_of(lambda: json.loads(pretty), args.repeat),
+           best_of(lambda: encoding.loads(compact), args.repeat))
+    print(f'  {"tamanho":<38} {len(pretty) / 2**20:8.1f}MB -> {len(compact) / 2**20:8.1f}MB')
+
+    payloads = list_payloads(movies, args.page_size)
+    renderer = JSONRenderer()
+    print(f'Listagens ({len(payloads)} páginas de {args.page_size} filmes):')
+    baseline = best_of(lambda: [renderer.render(payload) for payload in payloads], args.repeat)
+    cold = best_of(lambda: [encoding.dumps(payload) for payload in payloads], args.repeat)
+    report('JSONRenderer -> backend rápido', baseline, cold)
+    [encode(payload, by_id) for payload in payloads]
+    warm = best_of(lambda: [encode(payload, by_id) for payload in payloads], args.repeat)
+    report('JSONRenderer -> fragmentos em cache', baseline, warm)
+
+
+if __name__ == '__main__':
+    main()
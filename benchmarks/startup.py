@@ -0,0 +1,124 @@
+"""Partida a frio: tempo até a primeira requisição atendida por um novo processo, com e sem a imagem do catálogo.
+
+Cada amostra inicia um novo interpretador (como um worker novo após um
+deploy ou reciclagem), configura o Django e atende ``GET /api/movies/``
+pela aplicação WSGI. Cenários:
+
+- ``json``: sem imagem (MOVIES_SHARED_SNAPSHOT desligado), lê e indexa o JSON;
+- ``image``: mapeia a imagem já publicada (``manage.py build_catalog_image``);
+- ``image_copied``: o JSON foi copiado (novo inode e mtime, mesmo conteúdo), e
+  a imagem é validada pelo checksum;
+- ``rebuild``: sem imagem válida, o processo lê o JSON e publica uma nova.
+
+Uso: ``python -m benchmarks.startup --size 100k [--repeat 5] [--output resultado.json]``
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from .catalog import SIZES, configure_django, parse_size, setup_django
+from .results import print_results, summarize, write_results
+
+SCENARIOS = ('json', 'image', 'image_copied', 'rebuild')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(path, shared, layout):
+    """Processo medido: configura o Django, atende a primeira requisição e informa os tempos"""
+    start = time.perf_counter()
+    configure_django(path, MOVIES_SHARED_SNAPSHOT=shared, MOVIES_CATALOG_LAYOUT=layout)
+    from django.core.wsgi import get_wsgi_application
+    from .load import wsgi_environ
+
+    application = get_wsgi_application()
+    setup = time.perf_counter() - start
+    status = []
+    response = application(wsgi_environ('GET', '/api/movies/', '', b''), lambda line, headers: status.append(line))
+    body = b''.join(response)
+    response.close()
+    first_request = time.perf_counter() - start - setup
+    print(json.dumps({'status': int(status[0].split()[0]), 'bytes': len(body),
+                      'setup': setup, 'first_request': first_request}), flush=True)
+
+
+def prepare(scenario, path):
+    """Deixa os arquivos no estado do cenário antes de iniciar o processo"""
+    from movies.store import MovieStore
+
+    store = MovieStore(path, shared=True)
+    if scenario == 'rebuild':
+        if os.path.exists(store.image_path):
+            os.remove(store.image_path)
+    elif scenario in ('image', 'image_copied'):
+        store.publish_image()
+        if scenario == 'image_copied':
+            copy = f'{path}.copy'
+            shutil.copyfile(path, copy)
+            os.replace(copy, path)
+
+
+def measure(scenario, path, layout):
+    """Inicia um processo e retorna (tempo até a primeira resposta, tempos informados por ele)"""
+    prepare(scenario, path)
+    command = [sys.executable, '-m', 'benchmarks.startup', '--child', path, '--layout', layout]
+    if scenario != 'json':
+        command.append('--shared')
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.wait()
+    if not line:
+        raise RuntimeError(f'O processo do cenário {scenario} terminou sem responder (código {process.returncode})')
+    report = json.loads(line)
+    if report['status'] != 200:
+        raise RuntimeError(f'Cenário {scenario}: status {report["status"]}')
+    return elapsed, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--catalog', help='Catálogo gerado por benchmarks.catalog (em vez de gerar um)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='Processos iniciados por cenário')
+    parser.add_argument('--layout', choices=('dict', 'columnar'), default='dict',
+                        help='MOVIES_CATALOG_LAYOUT do cenário json')
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append',
+                        help='Cenário a medir (repetível; padrão: todos)')
+    parser.add_argument('--output', help='Arquivo de resultados (padrão: benchmarks/results/startup-<revisão>.json)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--shared', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.shared, args.layout)
+        return
+
+    path = setup_django(args.size, args.seed, args.catalog)
+    size = os.path.getsize(path) / 2**20
+    scenarios = args.scenario or SCENARIOS
+    print(f'{args.size} filmes ({size:.1f}MB); {args.repeat} processos por cenário')
+    results = {}
+    for scenario in scenarios:
+        totals, first_requests = [], []
+        for _ in range(args.repeat):
+            elapsed, report = measure(scenario, path, args.layout)
+            totals.append(elapsed)
+            first_requests.append(report['first_request'])
+        results[f'startup[{scenario}]'] = summarize(totals)
+        results[f'first_request[{scenario}]'] = summarize(first_requests)
+
+    print_results(results)
+    parameters = {'movies': args.size, 'seed': args.seed, 'repeat': args.repeat, 'layout': args.layout,
+                  'scenarios': list(scenarios)}
+    print(f'Resultados em {write_results("startup", parameters, results, args.output)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Memória e propagação de escritas com vários processos, com e sem o snapshot compartilhado (MOVIES_SHARED_SNAPSHOT).
+
+Cada worker é um processo (como os do gunicorn sem ``--preload``) que
+carrega o catálogo por conta própria e informa o tempo de carga e a memória
+(RSS, PSS e USS de ``/proc/self/smaps_rollup``, só no Linux). Depois o
+processo principal grava filmes e compacta o store; cada worker mede a
+leitura que passa a enxergar a alteração.
+
+Uso: ``python -m benchmarks.workers --size 100k --workers 4 [--output resultado.json]``
+"""
+import argparse
+import multiprocessing
+import random
+import time
+
+from .catalog import SIZES, parse_size, setup_django
+from .results import print_results, summarize, write_results
+
+MODES = {'private': False, 'shared': True}
+# Campos de /proc/self/smaps_rollup (kB) e o nome no resultado
+SMAPS_FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'uss', 'Private_Dirty': 'uss'}
+
+
+def memory():
+    """RSS, PSS e USS do processo em MB (vazio fora do Linux)"""
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup', encoding='ascii') as file:
+            for line in file:
+                name, _, value = line.partition(':')
+                if name in SMAPS_FIELDS:
+                    key = SMAPS_FIELDS[name]
+                    usage[key] = usage.get(key, 0.0) + int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return usage
+
+
+def exercise(snapshot, count):
+    """Leituras típicas, para que a memória medida inclua as colunas e os índices usados"""
+    rng = random.Random(0)
+    snapshot.query(genre='Drama', ordering='-rating')[:20]
+    snapshot.count(search='amor')
+    for _ in range(200):
+        snapshot.index.get(rng.randint(1, count))
+
+
+def worker(path, shared, count, connection):
+    """Carrega o catálogo, informa tempo e memória e mede cada alteração anunciada pelo processo principal"""
+    from movies.store import MovieStore
+
+    store = MovieStore(path, shared=shared)
+    start = time.perf_counter()
+    snapshot = store.snapshot()
+    load = time.perf_counter() - start
+    exercise(snapshot, count)
+    connection.send((load, memory()))
+    for pk, rating in iter(connection.recv, None):
+        start = time.perf_counter()
+        snapshot = store.snapshot()
+        elapsed = time.perf_counter() - start
+        if (snapshot.index.get(pk) or {}).get('rating') != rating:
+            raise RuntimeError(f'O worker não enxergou a alteração do filme {pk}')
+        exercise(snapshot, count)
+        connection.send(elapsed)
+    connection.send(memory())
+
+
+def run(path, shared, count, workers, writes, compactions, seed):
+    """Executa os workers de um modo; retorna os resultados (carga, escritas, compactações e memória)"""
+    from movies.store import MovieStore
+
+    context = multiprocessing.get_context('fork')
+    connections, processes = [], []
+    for _ in range(workers):
+        parent, child = context.Pipe()
+        process = context.Process(target=worker, args=(path, shared, count, child))
+        process.start()
+        connections.append(parent)
+        processes.append(process)
+
+    loads, usages = zip(*(connection.recv() for connection in connections))
+    store = MovieStore(path, shared=shared)
+    rng = random.Random(seed)
+    samples = {'write': [], 'compaction': []}
+    for round_ in range(compactions + 1):
+        for step in range(writes if round_ < compactions else writes // 2 or 1):
+            kind = 'compaction' if round_ and not step else 'write'
+            pk, rating = rng.randint(1, count), round(rng.uniform(1, 10), 1)
+            store.update(pk, lambda movie: {**movie, 'rating': rating})
+            for connection in connections:
+                connection.send((pk, rating))
+            samples[kind].extend(connection.recv() for connection in connections)
+        if round_ < compactions:
+            store.compact()
+    for connection in connections:
+        connection.send(None)
+    final = [connection.recv() for connection in connections]
+    for process in processes:
+        process.join()
+
+    results = {'load': summarize(loads), 'write': summarize(samples['write']),
+               'compaction': summarize(samples['compaction'])}
+    for name, usage in (('memory', usages), ('memory_final', final)):
+        results[name] = {
+            f'{key}_mb': sum(value.get(key, 0.0) for value in usage) / workers for key in ('rss', 'pss', 'uss')
+        }
+        results[name]['pss_total_mb'] = sum(value.get('pss', 0.0) for value in usage)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=SIZES['100k'],
+                        help='Número de filmes ou um de: ' + ', '.join(SIZES))
+    parser.add_argument('--catalog', help='Catálogo gerado por benchmarks.catalog (em vez de gerar um)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=20, help='Escritas entre compactações')
+    parser.add_argument('--compactions', type=int, default=3)
+    parser.add_argument('--mode', choices=(*MODES, 'both'), default='both')
+    parser.add_argument('--output', help='Arquivo de resultados (padrão: benchmarks/results/workers-<revisão>.json)')
+    args = parser.parse_args()
+
+    path = setup_django(args.size, args.seed, args.catalog)
+    from movies.store import MovieStore
+
+    count = len(MovieStore(path).snapshot())
+    print(f'{count} filmes; {args.workers} workers')
+    modes = tuple(MODES) if args.mode == 'both' else (args.mode,)
+    results, memory_results = {}, {}
+    for mode in modes:
+        measured = run(path, MODES[mode], count, args.workers, args.writes, args.compactions, args.seed)
+        for name in ('load', 'write', 'compaction'):
+            results[f'{name}[{mode}]'] = measured[name]
+        for name in ('memory', 'memory_final'):
+            memory_results[f'{name}[{mode}]'] = measured[name]
+
+    print_results(results)
+    print(f'  {"memória por worker":<40} {"RSS MB":>9} {"PSS MB":>9} {"USS MB":>9} {"PSS total":>11}')
+    for name, usage in memory_results.items():
+        print(f'  {name:<40} {usage["rss_mb"]:9.1f} {usage["pss_mb"]:9.1f} '
+              f'{usage["uss_mb"]:9.1f} {usage["pss_total_mb"]:11.1f}')
+    parameters = {'movies': count, 'seed': args.seed, 'workers': args.workers, 'writes': args.writes,
+                  'compactions': args.compactions}
+    print(f'Resultados em {write_results("workers", parameters, {**results, **memory_results}, args.output)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Variantes assíncronas das páginas do catálogo, usadas no deploy ASGI (MOVIES_ASYNC_VIEWS)
+
+O snapshot é carregado pelo ``AsyncMovieStore`` (recarga compartilhada no
+executor); a renderização do template e o cache de fragmentos, que podem
+fazer I/O, rodam fora do loop com ``sync_to_async``.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from movies.async_store import get_async_store
+from movies.conditional import catalog_last_modified, conditional_get, query_etag
+from .views import movie_page_etag, movie_page_last_modified, render_detalhes, render_home
+
+
+@login_required
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+async def home(request):
+    """Exibe catálogo de filmes do JSON, paginado"""
+    await get_async_store().snapshot()
+    return await sync_to_async(render_home)(request)
+
+
+@conditional_get(etag_func=movie_page_etag, last_modified_func=movie_page_last_modified)
+async def detalhes_filme(request, imdb_id):
+    """Exibe detalhes do filme buscando do JSON"""
+    await get_async_store().snapshot()
+    return await sync_to_async(render_detalhes)(request, imdb_id)
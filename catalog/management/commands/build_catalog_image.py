@@ -0,0 +1,52 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from movies.store import JSON_FILE_PATH, MovieStore
+
+# Mensagem de cada situação retornada por ``MovieStore.publish_image``
+STATUS_MESSAGES = {
+    'valid': 'Imagem já corresponde ao catálogo',
+    'signed': 'Imagem reaproveitada (mesmo conteúdo, checksum conferido); assinatura atualizada',
+    'built': 'Imagem gerada',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera a imagem binária do catálogo e dos índices (movies.json.image) usada na partida dos workers '
+        'com MOVIES_SHARED_SNAPSHOT; é validada pelo checksum do JSON e só é refeita se estiver desatualizada'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            default=JSON_FILE_PATH,
+            help='Arquivo JSON do catálogo (padrão: MOVIES_JSON_FILE)',
+        )
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            help='Compacta o log de mutações antes (a imagem passa a conter todos os lotes gravados)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regera a imagem mesmo que a atual ainda corresponda ao catálogo',
+        )
+
+    def handle(self, *args, **options):
+        path = options['file']
+        if not os.path.exists(path):
+            raise CommandError(f'Catálogo não encontrado: {path}')
+        store = MovieStore(path, shared=True)
+        start = time.perf_counter()
+        if options['compact']:
+            store.compact()
+        status = store.publish_image(force=options['force'])
+        if status == 'failed':
+            raise CommandError('Não foi possível gerar a imagem deste catálogo; os workers continuam lendo o JSON')
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(store.image_path) / 2**20
+        self.stdout.write(self.style.SUCCESS(
+            f'{STATUS_MESSAGES[status]}: {store.image_path} ({size:.1f}MB, {elapsed:.2f}s)'
+        ))
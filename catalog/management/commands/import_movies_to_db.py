@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from movies.models import CatalogState, Movie
+from movies.orm_store import dict_to_movie, write_index
+from movies.store import JSON_FILE_PATH, MovieStore, movie_version
+
+
+class Command(BaseCommand):
+    help = 'Importa o catálogo do movies.json (snapshot + log de mutações) para o modelo Movie'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            default=JSON_FILE_PATH,
+            help='Arquivo JSON do catálogo (padrão: MOVIES_JSON_FILE)',
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Apaga os filmes do banco antes de importar (o banco fica igual ao JSON)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Filmes gravados por INSERT (padrão: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        snapshot = MovieStore(options['file']).snapshot()
+        self.stdout.write(f'Importando {len(snapshot)} filmes de {options["file"]}...')
+
+        fields = [field.name for field in Movie._meta.concrete_fields if field.name != 'id']
+        batch_size = max(1, options['batch_size'])
+        with transaction.atomic():
+            if options['replace']:
+                removed, _ = Movie.objects.all().delete()
+                self.stdout.write(f'{removed} filmes removidos do banco')
+            movies = [movie for movie in snapshot if movie.get('id') is not None]
+            rows = [dict_to_movie(movie, movie_version(movie)) for movie in movies]
+            for start in range(0, len(rows), batch_size):
+                Movie.objects.bulk_create(
+                    rows[start:start + batch_size], update_conflicts=True, unique_fields=['id'], update_fields=fields,
+                )
+                write_index(movies[start:start + batch_size], batch_size)
+
+            state, _ = CatalogState.objects.select_for_update().get_or_create(pk=1)
+            state.last_id = max(state.last_id, snapshot.last_id)
+            state.seq = max(state.seq, snapshot.seq) + 1
+            state.modified_at = timezone.now()
+            state.save()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Importação concluída: {Movie.objects.count()} filmes no banco. '
+            f'Use MOVIES_STORAGE_BACKEND = "orm" para servir o catálogo a partir dele.'
+        ))
@@ -1,9 +1,15 @@
-import json
+import hashlib
 import os
-import requests
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from catalog.omdb import (
+    OMDB_BASE_URL, OmdbClient, OmdbNotFound, OmdbResponseCache, convert_omdb_to_movie, is_imdb_id,
+    iter_dump_records, movie_changed,
+)
+from movies.store import get_store
 
 # Lista de IDs IMDB para sincronizar (copiada do projeto original)
 LISTA_IMDB = [
@@ -28,155 +34,379 @@ LISTA_IMDB = [
     "tt0110413",  # Léon: The Professional
 ]
 
-JSON_FILE_PATH = os.path.join(settings.BASE_DIR, 'movies', 'data', 'movies.json')
 OMDB_API_KEY = getattr(settings, 'OMDB_API_KEY', 'bd8a882')
+# Tamanho padrão dos lotes gravados no catálogo ao importar um dump
+DUMP_CHUNK_SIZE = 5000
+# Ids já sincronizados na execução corrente; permite retomar uma execução interrompida
+CHECKPOINT_PATH = os.path.join(settings.BASE_DIR, 'movies', 'data', 'sync_omdb.checkpoint')
+# Primeira linha do checkpoint: hash da lista de ids de origem, conferido ao retomar
+CHECKPOINT_SOURCE = '# source '
+# Cache em disco das respostas da OMDB e tempo (segundos) em que uma resposta é considerada nova
+OMDB_CACHE_DIR = getattr(settings, 'OMDB_CACHE_DIR', os.path.join(settings.BASE_DIR, 'movies', 'data', 'omdb_cache'))
+OMDB_CACHE_TTL = getattr(settings, 'OMDB_CACHE_TTL', 7 * 24 * 60 * 60)
 
 
 class Command(BaseCommand):
     help = 'Sincroniza filmes da API OMDB para o arquivo JSON'
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--ids-file',
+            help='Arquivo com um id IMDB por linha ("-" lê da entrada padrão); padrão: LISTA_IMDB',
+        )
+        parser.add_argument(
+            '--dump',
+            help='Importa um dump OMDB (array JSON ou JSON Lines) sem acessar a rede ("-" lê da entrada padrão)',
+        )
         parser.add_argument(
             '--api-key',
             type=str,
             help='Chave da API OMDB (ou use OMDB_API_KEY nas settings)',
         )
+        parser.add_argument(
+            '--base-url',
+            default=OMDB_BASE_URL,
+            help='URL da API OMDB (útil para apontar para um servidor local de testes)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Número de requisições simultâneas à OMDB (padrão: 8)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=10.0,
+            help='Máximo de requisições por segundo; 0 desativa o limite (padrão: 10)',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=3,
+            help='Novas tentativas por id em erros de rede, 429 e 5xx (padrão: 3)',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10.0,
+            help='Timeout de cada requisição em segundos (padrão: 10)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help=f'Filmes gravados no catálogo por lote (padrão: 100, ou {DUMP_CHUNK_SIZE} com --dump)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=CHECKPOINT_PATH,
+            help='Arquivo com os ids já sincronizados, usado para retomar execuções interrompidas '
+                 '(não usado com ids da entrada padrão)',
+        )
+        parser.add_argument(
+            '--cache-dir',
+            default=OMDB_CACHE_DIR,
+            help='Diretório do cache de respostas da OMDB',
+        )
+        parser.add_argument(
+            '--cache-ttl',
+            type=int,
+            default=OMDB_CACHE_TTL,
+            help='Idade máxima (segundos) de uma resposta em cache antes de revalidar na OMDB',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Busca tudo na OMDB sem usar o cache de respostas',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignora o checkpoint e sincroniza todos os ids novamente',
+        )
 
     def handle(self, *args, **options):
+        if options['dump'] and options['ids_file']:
+            raise CommandError('Use --ids-file ou --dump, não os dois')
+        
+        self.synced_count = 0
+        self.updated_count = 0
+        self.error_count = 0
+        self.unchanged_count = 0
+        
+        self.verbosity = options['verbosity']
+        if options['dump']:
+            self.show_titles = options['verbosity'] >= 2
+            self.import_dump(options['dump'], options['chunk_size'] or DUMP_CHUNK_SIZE)
+            self.report()
+            return
+        
         api_key = options.get('api_key') or OMDB_API_KEY
+        checkpoint = options['checkpoint']
+        self.show_titles = True
         
         self.stdout.write(self.style.SUCCESS('Iniciando sincronização OMDB...'))
         
-        # Carregar filmes existentes
-        movies = self.load_movies()
-        existing_imdb_ids = {m.get('imdb_id') for m in movies if m.get('imdb_id')}
-        
-        synced_count = 0
-        updated_count = 0
-        error_count = 0
+        fingerprint = self.source_fingerprint(options['ids_file'])
+        if fingerprint is None:
+            # A entrada padrão não pode ser relida para conferir um checkpoint
+            checkpoint = None
+        done = set()
+        if checkpoint and not options['restart']:
+            source, done = self.load_checkpoint(checkpoint)
+            if done and source != fingerprint:
+                raise CommandError(
+                    f'O checkpoint {checkpoint} é de outra lista de ids; '
+                    f'use --restart para sincronizar esta lista desde o início'
+                )
+        if done:
+            self.stdout.write(f'Retomando sincronização: {len(done)} ids já processados')
+        elif checkpoint:
+            self.start_checkpoint(checkpoint, fingerprint)
+        pending = (imdb_id for imdb_id in self.read_ids(options['ids_file']) if imdb_id not in done)
+        chunk_size = options['chunk_size'] or 100
         
-        for imdb_id in LISTA_IMDB:
-            try:
-                # Buscar dados do OMDB
-                url = f"http://www.omdbapi.com/?apikey={api_key}&i={imdb_id}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                omdb_data = response.json()
-                
-                if omdb_data.get('Response') == 'False':
+        concurrency = max(1, options['concurrency'])
+        client = OmdbClient(
+            api_key,
+            base_url=options['base_url'],
+            timeout=options['timeout'],
+            retries=options['retries'],
+            rate=options['rate'],
+            pool_size=concurrency,
+            cache=None if options['no_cache'] else OmdbResponseCache(options['cache_dir'], options['cache_ttl']),
+        )
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        batch = []
+        try:
+            for imdb_id, omdb_data, error in self.fetch_all(executor, client, pending, concurrency * 4):
+                if isinstance(error, OmdbNotFound):
                     self.stdout.write(self.style.WARNING(f'Filme {imdb_id} não encontrado na OMDB'))
-                    error_count += 1
-                    continue
-                
-                # Converter dados OMDB para formato do JSON
-                movie_data = self.convert_omdb_to_movie(omdb_data)
-                
-                # Verificar se já existe
-                existing_index = None
-                for i, m in enumerate(movies):
-                    if m.get('imdb_id') == imdb_id:
-                        existing_index = i
-                        break
-                
-                if existing_index is not None:
-                    # Atualizar filme existente
-                    movies[existing_index].update(movie_data)
-                    movies[existing_index]['updated_at'] = datetime.now().isoformat()
-                    updated_count += 1
-                    self.stdout.write(self.style.SUCCESS(f'✓ Atualizado: {movie_data["title"]}'))
+                    self.error_count += 1
+                    self.mark_done(checkpoint, [imdb_id])
+                elif error is not None:
+                    self.stdout.write(self.style.ERROR(f'Erro ao buscar {imdb_id}: {str(error)}'))
+                    self.error_count += 1
                 else:
-                    # Adicionar novo filme
-                    new_id = max((m.get('id', 0) for m in movies), default=0) + 1
-                    movie_data['id'] = new_id
-                    movie_data['created_at'] = datetime.now().isoformat()
-                    movie_data['updated_at'] = datetime.now().isoformat()
-                    movies.append(movie_data)
-                    synced_count += 1
-                    self.stdout.write(self.style.SUCCESS(f'✓ Adicionado: {movie_data["title"]}'))
-                    
-            except requests.RequestException as e:
-                self.stdout.write(self.style.ERROR(f'Erro ao buscar {imdb_id}: {str(e)}'))
-                error_count += 1
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'Erro ao processar {imdb_id}: {str(e)}'))
-                error_count += 1
-        
-        # Salvar filmes atualizados
-        if self.save_movies(movies):
-            self.stdout.write(self.style.SUCCESS(
-                f'\nSincronização concluída!\n'
-                f'  - Novos filmes: {synced_count}\n'
-                f'  - Filmes atualizados: {updated_count}\n'
-                f'  - Erros: {error_count}\n'
-                f'  - Total de filmes no JSON: {len(movies)}'
+                    try:
+                        batch.append((imdb_id, self.convert_omdb_to_movie(omdb_data)))
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f'Erro ao processar {imdb_id}: {str(e)}'))
+                        self.error_count += 1
+                if len(batch) >= chunk_size:
+                    self.commit(batch, checkpoint)
+                    batch = []
+            self.commit(batch, checkpoint)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.stdout.write(self.style.WARNING(
+                f'Sincronização interrompida; execute novamente para retomar a partir de {checkpoint}'
             ))
-        else:
-            self.stdout.write(self.style.ERROR('Erro ao salvar filmes no JSON'))
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            client.close()
+        
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.report(
+            f'  - Respostas do cache: {client.stats["cached"] + client.stats["revalidated"]}'
+            f' (requisições à OMDB: {client.stats["fetched"] + client.stats["revalidated"]})\n'
+        )
+
+    def report(self, extra=''):
+        self.stdout.write(self.style.SUCCESS(
+            f'\nSincronização concluída!\n'
+            f'  - Novos filmes: {self.synced_count}\n'
+            f'  - Filmes atualizados: {self.updated_count}\n'
+            f'  - Filmes sem alteração: {self.unchanged_count}\n'
+            f'{extra}'
+            f'  - Erros: {self.error_count}\n'
+            f'  - Total de filmes no JSON: {len(get_store().snapshot())}'
+        ))
+
+    def open_input(self, path):
+        if path == '-':
+            return sys.stdin
+        return open(path, 'r', encoding='utf-8')
+
+    def read_ids(self, path):
+        """Gera os ids a sincronizar, sem repetição, de ``path`` ou da LISTA_IMDB.
 
-    def load_movies(self):
-        """Carrega filmes do arquivo JSON"""
+        Linhas vazias e comentários (``# ...``) são ignorados; ids fora do
+        formato ``tt<dígitos>`` são descartados com um aviso.
+        """
+        if not path:
+            yield from dict.fromkeys(LISTA_IMDB)
+            return
+        seen = set()
+        source = self.open_input(path)
         try:
-            if os.path.exists(JSON_FILE_PATH):
-                with open(JSON_FILE_PATH, 'r', encoding='utf-8') as file:
-                    return json.load(file).get('movies', [])
-            return []
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def save_movies(self, movies):
-        """Salva filmes no arquivo JSON"""
+            for line in source:
+                imdb_id = line.split('#', 1)[0].strip()
+                if imdb_id and not is_imdb_id(imdb_id):
+                    self.stdout.write(self.style.WARNING(f'Id IMDB inválido ignorado: {imdb_id!r}'))
+                    continue
+                if imdb_id and imdb_id not in seen:
+                    seen.add(imdb_id)
+                    yield imdb_id
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    def source_fingerprint(self, path):
+        """Hash do conteúdo da lista de ids (arquivo ou LISTA_IMDB); None para a entrada padrão"""
+        if path == '-':
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        if not path:
+            digest.update('\n'.join(LISTA_IMDB).encode('utf-8'))
+            return digest.hexdigest()
         try:
-            os.makedirs(os.path.dirname(JSON_FILE_PATH), exist_ok=True)
-            with open(JSON_FILE_PATH, 'w', encoding='utf-8') as file:
-                json.dump({'movies': movies}, file, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Erro ao salvar: {str(e)}'))
-            return False
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+        except OSError as e:
+            raise CommandError(f'Não foi possível ler {path}: {e}')
+        return digest.hexdigest()
 
-    def convert_omdb_to_movie(self, omdb_data):
-        """Converte dados da API OMDB para formato do JSON"""
-        # Extrair duração em minutos do runtime (ex: "136 min" -> 136)
-        runtime_str = omdb_data.get('Runtime', '0 min')
-        duration_minutes = 0
+    def import_dump(self, path, chunk_size):
+        """Importa um dump de respostas OMDB em lotes, sem requisições HTTP"""
+        self.stdout.write(self.style.SUCCESS(f'Importando dump OMDB de {path}...'))
+        source = self.open_input(path)
+        batch = []
+        processed = 0
         try:
-            duration_minutes = int(runtime_str.replace(' min', '').strip())
-        except (ValueError, AttributeError):
-            pass
-        
-        # Extrair ano do release_year
-        release_year = 0
+            for record in iter_dump_records(source):
+                processed += 1
+                if not isinstance(record, dict) or record.get('Response') == 'False' or not record.get('imdbID'):
+                    self.error_count += 1
+                    continue
+                try:
+                    batch.append((record['imdbID'], self.convert_omdb_to_movie(record)))
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f'Erro ao processar {record["imdbID"]}: {str(e)}'))
+                    self.error_count += 1
+                if len(batch) >= chunk_size:
+                    self.commit(batch)
+                    batch = []
+                    if self.verbosity >= 1:
+                        self.stdout.write(f'{processed} registros processados...')
+            self.commit(batch)
+        except ValueError as e:
+            raise CommandError(f'Dump inválido após {processed} registros: {e}')
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    def fetch_all(self, executor, client, imdb_ids, window):
+        """Busca os ids em paralelo, com no máximo ``window`` requisições pendentes.
+
+        Gera (imdb_id, dados OMDB, erro) na ordem em que as respostas chegam.
+        """
+        remaining = iter(imdb_ids)
+        futures = {}
+
+        def submit_next():
+            for imdb_id in remaining:
+                futures[executor.submit(client.fetch, imdb_id)] = imdb_id
+                return
+
+        for _ in range(window):
+            submit_next()
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                imdb_id = futures.pop(future)
+                submit_next()
+                try:
+                    yield imdb_id, future.result(), None
+                except Exception as e:
+                    yield imdb_id, None, e
+
+    def commit(self, batch, checkpoint=None):
+        """Grava no catálogo, com uma única escrita, os filmes do lote que mudaram.
+
+        Filmes cujo conteúdo convertido é igual ao gravado não são reescritos
+        e mantêm o ``updated_at``; um lote sem mudanças não toca o disco.
+        """
+        if not batch:
+            return
+        added, updated, unchanged = [], [], []
+
+        def build(snapshot):
+            added.clear()
+            updated.clear()
+            unchanged.clear()
+            next_id = snapshot.last_id
+            puts = {}
+            for imdb_id, movie_data in batch:
+                now = timezone.now().isoformat()
+                existing = puts.get(imdb_id) or snapshot.index.get_by_imdb_id(imdb_id)
+                if existing is not None and not movie_changed(existing, movie_data):
+                    unchanged.append(movie_data['title'])
+                elif existing is not None:
+                    # Os filmes do snapshot são compartilhados: grava uma cópia atualizada
+                    puts[imdb_id] = {**existing, **movie_data, 'updated_at': now}
+                    updated.append(movie_data['title'])
+                else:
+                    next_id += 1
+                    puts[imdb_id] = {**movie_data, 'id': next_id, 'created_at': now, 'updated_at': now}
+                    added.append(movie_data['title'])
+            return list(puts.values()), []
+
+        store = get_store()
         try:
-            release_year = int(omdb_data.get('Year', '0').split('–')[0].strip())
-        except (ValueError, AttributeError):
-            pass
-        
-        # Extrair rating (IMDB rating como float)
-        rating = 0.0
+            # Verificação sem lock: se nada mudou não há por que disputar o lock de escrita
+            puts, _ = build(store.snapshot())
+            if puts:
+                store.transact(build)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Erro ao salvar: {str(e)}'))
+            self.error_count += len(batch)
+            return
+        if self.show_titles:
+            for title in updated:
+                self.stdout.write(self.style.SUCCESS(f'✓ Atualizado: {title}'))
+            for title in added:
+                self.stdout.write(self.style.SUCCESS(f'✓ Adicionado: {title}'))
+        self.updated_count += len(updated)
+        self.synced_count += len(added)
+        self.unchanged_count += len(unchanged)
+        self.mark_done(checkpoint, [imdb_id for imdb_id, _ in batch])
+
+    def load_checkpoint(self, path):
+        """Retorna (hash da lista de origem ou None, ids já processados)"""
+        source, done = None, set()
         try:
-            rating = float(omdb_data.get('imdbRating', '0') or '0')
-        except (ValueError, AttributeError):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        continue  # linha incompleta de uma gravação interrompida
+                    if line.startswith(CHECKPOINT_SOURCE):
+                        source = line[len(CHECKPOINT_SOURCE):].strip()
+                    elif line.strip():
+                        done.add(line.strip())
+        except FileNotFoundError:
             pass
-        
-        return {
-            'title': omdb_data.get('Title', ''),
-            'description': omdb_data.get('Plot', ''),
-            'genre': omdb_data.get('Genre', ''),
-            'release_year': release_year,
-            'duration_minutes': duration_minutes,
-            'rating': rating,
-            'thumbnail_url': omdb_data.get('Poster', ''),
-            'video_url': '',  # OMDB não fornece video_url
-            'is_featured': False,  # Pode ser configurado manualmente depois
-            'imdb_id': omdb_data.get('imdbID', ''),
-            # Campos adicionais do OMDB para uso futuro
-            'director': omdb_data.get('Director', ''),
-            'actors': omdb_data.get('Actors', ''),
-            'writer': omdb_data.get('Writer', ''),
-            'language': omdb_data.get('Language', ''),
-            'country': omdb_data.get('Country', ''),
-            'awards': omdb_data.get('Awards', ''),
-            'metascore': omdb_data.get('Metascore', ''),
-            'imdb_votes': omdb_data.get('imdbVotes', ''),
-        }
+        return source, done
 
+    def start_checkpoint(self, path, fingerprint):
+        """Recria o checkpoint vazio, registrando a lista de origem"""
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f'{CHECKPOINT_SOURCE}{fingerprint}\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def mark_done(self, path, imdb_ids):
+        """Acrescenta ids ao checkpoint"""
+        if path is None:
+            return
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(''.join(f'{imdb_id}\n' for imdb_id in imdb_ids))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def convert_omdb_to_movie(self, omdb_data):
+        """Converte dados da API OMDB para formato do JSON"""
+        return convert_omdb_to_movie(omdb_data)
@@ -0,0 +1,326 @@
+"""Cliente HTTP da API OMDB usado pela sincronização do catálogo"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from movies.journal import write_atomic
+
+OMDB_BASE_URL = 'http://www.omdbapi.com/'
+# Status HTTP que valem nova tentativa
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Maior espera (segundos) aceita de um cabeçalho Retry-After
+MAX_RETRY_AFTER = 60
+# Formato dos ids IMDB aceitos (também usados como nome de arquivo no cache)
+IMDB_ID_PATTERN = re.compile(r'tt\d+')
+
+
+class OmdbNotFound(Exception):
+    """A OMDB respondeu ``Response: False`` para o id"""
+
+
+class TokenBucket:
+    """Limitador de taxa compartilhado entre threads: ``rate`` requisições por segundo"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def defer(self, seconds):
+        """Suspende as aquisições por ``seconds`` (ex.: Retry-After do servidor), sem rajada depois"""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._resume_at:
+                self._resume_at = self._updated = resume_at
+                self._tokens = 0.0
+
+    def acquire(self):
+        """Bloqueia até haver um token disponível"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    wait = self._resume_at - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_after(response):
+    """Segundos pedidos no cabeçalho Retry-After (número ou data HTTP), limitados a MAX_RETRY_AFTER, ou None"""
+    value = response.headers.get('Retry-After', '').strip() if response is not None else ''
+    if not value:
+        return None
+    if value.isdigit():
+        seconds = int(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def is_imdb_id(value):
+    """Indica se ``value`` é um id IMDB válido (``tt`` seguido de dígitos)"""
+    return isinstance(value, str) and IMDB_ID_PATTERN.fullmatch(value) is not None
+
+
+def payload_digest(data):
+    """Hash do conteúdo de uma resposta, independente da ordem das chaves"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class OmdbResponseCache:
+    """Cache em disco das respostas da OMDB, um arquivo JSON por id.
+
+    Cada entrada guarda o corpo, o hash do conteúdo, o instante da busca e
+    os validadores HTTP (ETag / Last-Modified) recebidos. Entradas mais novas
+    que ``ttl`` segundos são servidas sem acessar a rede; as vencidas são
+    revalidadas com uma requisição condicional quando há validadores.
+    """
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, imdb_id):
+        if not is_imdb_id(imdb_id):
+            # O id vira nome de arquivo: nada fora do padrão (ex.: ``../x``) chega ao sistema de arquivos
+            raise ValueError(f'Id IMDB inválido: {imdb_id!r}')
+        # Subdiretórios pelo prefixo do id evitam diretórios com milhões de arquivos
+        return os.path.join(self.directory, imdb_id[:5], f'{imdb_id}.json')
+
+    def get(self, imdb_id):
+        try:
+            with open(self._path(imdb_id), 'rb') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def put(self, imdb_id, data, etag=None, last_modified=None):
+        entry = {
+            'fetched_at': time.time(),
+            'digest': payload_digest(data),
+            'etag': etag,
+            'last_modified': last_modified,
+            'data': data,
+        }
+        path = self._path(imdb_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        return entry
+
+    def touch(self, imdb_id, entry):
+        """Marca uma entrada revalidada como nova sem alterar o conteúdo"""
+        return self.put(imdb_id, entry['data'], entry.get('etag'), entry.get('last_modified'))
+
+
+class OmdbClient:
+    """Busca filmes na OMDB com sessão HTTP reaproveitada, limite de taxa e retentativas"""
+
+    def __init__(self, api_key, base_url=OMDB_BASE_URL, timeout=10, retries=3, backoff=0.5,
+                 rate=None, pool_size=10, cache=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.stats = {'cached': 0, 'revalidated': 0, 'fetched': 0}
+        self._stats_lock = threading.Lock()
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate) if rate else None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def fetch(self, imdb_id):
+        """Retorna o JSON da OMDB para o id, consultando antes o cache em disco.
+
+        Levanta ``OmdbNotFound`` quando a OMDB não conhece o id e
+        ``requests.RequestException`` quando as tentativas se esgotam.
+        """
+        entry = self.cache.get(imdb_id) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self._count('cached')
+            data = entry['data']
+        else:
+            data = self._request(imdb_id, entry)
+        if data.get('Response') == 'False':
+            raise OmdbNotFound(data.get('Error', 'Filme não encontrado'))
+        return data
+
+    def _request(self, imdb_id, entry=None):
+        """GET na OMDB com retentativas; condicional quando há uma entrada vencida no cache"""
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        attempt = 0
+        while True:
+            if self.bucket:
+                self.bucket.acquire()
+            try:
+                response = self.session.get(
+                    self.base_url, params={'apikey': self.api_key, 'i': imdb_id},
+                    headers=headers, timeout=self.timeout,
+                )
+                if response.status_code == 304 and entry is not None:
+                    self._count('revalidated')
+                    self.cache.touch(imdb_id, entry)
+                    return entry['data']
+                if response.status_code in RETRY_STATUS and attempt < self.retries:
+                    raise requests.HTTPError(f'HTTP {response.status_code}', response=response)
+                response.raise_for_status()
+                data = response.json()
+            except requests.RequestException as error:
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                # Backoff exponencial com jitter para não sincronizar as threads
+                delay = self.backoff * (2 ** (attempt - 1)) * (1 + random.random())
+                requested = retry_after(error.response)
+                if requested is not None:
+                    # 429/503 com Retry-After: espera o pedido e pausa também as demais threads
+                    delay = max(delay, requested)
+                    if self.bucket:
+                        self.bucket.defer(requested)
+                time.sleep(delay)
+                continue
+            self._count('fetched')
+            if self.cache:
+                self.cache.put(imdb_id, data, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return data
+
+
+def iter_dump_records(stream, chunk_size=1 << 16):
+    """Lê registros OMDB de um dump sem carregá-lo inteiro em memória.
+
+    Aceita um array JSON (``[{...}, {...}]``) ou JSON Lines / objetos
+    concatenados. O texto é lido em blocos de ``chunk_size`` caracteres e
+    cada registro é decodificado assim que está completo.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = None
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        # Pula espaços e separadores entre registros
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ',')):
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            fill()
+        if position >= len(buffer):
+            if in_array:
+                raise ValueError('dump JSON truncado: array sem "]"')
+            return
+        if in_array is None:
+            in_array = buffer[position] == '['
+            if in_array:
+                position += 1
+                continue
+        if in_array and buffer[position] == ']':
+            return
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        position = end
+        yield record
+
+
+def movie_changed(existing, movie_data):
+    """Indica se ``movie_data`` altera algum campo do filme já gravado"""
+    return any(existing.get(field) != value for field, value in movie_data.items())
+
+
+def convert_omdb_to_movie(omdb_data):
+    """Converte dados da API OMDB para formato do JSON"""
+    # Extrair duração em minutos do runtime (ex: "136 min" -> 136)
+    runtime_str = omdb_data.get('Runtime', '0 min')
+    duration_minutes = 0
+    try:
+        duration_minutes = int(runtime_str.replace(' min', '').strip())
+    except (ValueError, AttributeError):
+        pass
+
+    # Extrair ano do release_year
+    release_year = 0
+    try:
+        release_year = int(omdb_data.get('Year', '0').split('–')[0].strip())
+    except (ValueError, AttributeError):
+        pass
+
+    # Extrair rating (IMDB rating como float)
+    rating = 0.0
+    try:
+        rating = float(omdb_data.get('imdbRating', '0') or '0')
+    except (ValueError, AttributeError):
+        pass
+
+    return {
+        'title': omdb_data.get('Title', ''),
+        'description': omdb_data.get('Plot', ''),
+        'genre': omdb_data.get('Genre', ''),
+        'release_year': release_year,
+        'duration_minutes': duration_minutes,
+        'rating': rating,
+        'thumbnail_url': omdb_data.get('Poster', ''),
+        'video_url': '',  # OMDB não fornece video_url
+        'is_featured': False,  # Pode ser configurado manualmente depois
+        'imdb_id': omdb_data.get('imdbID', ''),
+        # Campos adicionais do OMDB para uso futuro
+        'director': omdb_data.get('Director', ''),
+        'actors': omdb_data.get('Actors', ''),
+        'writer': omdb_data.get('Writer', ''),
+        'language': omdb_data.get('Language', ''),
+        'country': omdb_data.get('Country', ''),
+        'awards': omdb_data.get('Awards', ''),
+        'metascore': omdb_data.get('Metascore', ''),
+        'imdb_votes': omdb_data.get('imdbVotes', ''),
+    }
@@ -0,0 +1,86 @@
+"""Servidor OMDB local e fixtures dos testes de sincronização"""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def omdb_record(imdb_id, title, **fields):
+    """Resposta da OMDB para um filme, no formato da API"""
+    return {
+        'Title': title, 'Year': '2001', 'Runtime': '101 min', 'Genre': 'Drama, Crime', 'Director': 'Diretora',
+        'Actors': 'Ator Um, Atriz Dois', 'Plot': f'Sinopse de {title}', 'Poster': f'https://example.com/{imdb_id}.jpg',
+        'imdbRating': '7.3', 'imdbID': imdb_id, 'Response': 'True', **fields,
+    }
+
+
+class StubOmdbServer:
+    """Servidor HTTP local (em uma thread) que responde como a OMDB.
+
+    ``records`` mapeia imdb_id -> resposta; ids desconhecidos recebem
+    ``Response: False``. ``failures`` mapeia imdb_id -> lista de
+    (status, cabeçalhos) devolvidos, um por requisição, antes da resposta
+    real. ``requests`` registra (imdb_id, cabeçalhos) de cada requisição.
+    Cada resposta traz um ETag do conteúdo e um If-None-Match igual recebe 304.
+    """
+
+    def __init__(self, records=()):
+        self.records = {record['imdbID']: record for record in records}
+        self.failures = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def requested(self):
+        """Ids requisitados, na ordem de chegada"""
+        with self.lock:
+            return [imdb_id for imdb_id, _ in self.requests]
+
+    def respond(self, imdb_id, headers):
+        """Retorna (status, corpo, cabeçalhos) da resposta a ``imdb_id``"""
+        with self.lock:
+            self.requests.append((imdb_id, headers))
+            pending = self.failures.get(imdb_id)
+            failure = pending.pop(0) if pending else None
+        if failure is not None:
+            status, extra = failure
+            return status, {'Response': 'False', 'Error': 'Falha simulada'}, extra
+        record = self.records.get(imdb_id, {'Response': 'False', 'Error': 'Incorrect IMDb ID.'})
+        etag = '"%s"' % hashlib.blake2b(json.dumps(record, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+        if headers.get('If-None-Match') == etag:
+            return 304, None, {'ETag': etag}
+        return 200, record, {'ETag': etag}
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                imdb_id = parse_qs(urlparse(self.path).query).get('i', [''])[0]
+                status, body, headers = stub.respond(imdb_id, dict(self.headers))
+                data = json.dumps(body).encode('utf-8') if body is not None else b''
+                self.send_response(status)
+                if body is not None:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
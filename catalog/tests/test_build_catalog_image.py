@@ -0,0 +1,26 @@
+import os
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from movies.shared import open_image
+from movies.store import file_signature
+from movies.tests.base import CatalogFileMixin
+
+
+class BuildCatalogImageTests(CatalogFileMixin, TestCase):
+    def build(self, *args):
+        output = StringIO()
+        call_command('build_catalog_image', f'--file={self.path}', *args, stdout=output)
+        return output.getvalue()
+
+    def test_corrupt_image_is_rebuilt(self):
+        self.assertIn('Imagem gerada', self.build())
+        self.assertIn('Imagem já corresponde', self.build())
+        image_path = f'{self.path}.image'
+        with open(image_path, 'r+b') as file:
+            file.seek(os.path.getsize(image_path) // 2)
+            file.write(b'\xff' * 64)
+            file.truncate()
+        self.assertIsNone(open_image(image_path, file_signature(self.path)))
+        self.assertIn('Imagem gerada', self.build())
+        self.assertIsNotNone(open_image(image_path, file_signature(self.path)))
@@ -0,0 +1,73 @@
+from io import StringIO
+from unittest import mock
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from movies.models import CatalogState, Movie, MovieGenre, MovieTerm
+from movies.orm_store import OrmMovieStore
+from movies.tests.base import CatalogFileMixin, make_movies
+
+
+# Consultas da API comparadas entre o catálogo JSON e o importado para o banco
+API_QUERIES = (
+    ('/api/movies/', {'search': 'acao'}),
+    ('/api/movies/', {'search': 'noite', 'ordering': '-rating'}),
+    ('/api/movies/', {'genre': 'drama', 'ordering': 'release_year', 'page': 2}),
+    ('/api/movies/', {'featured': 'true', 'cursor': '', 'page_size': 3}),
+    ('/api/movies/', {'min_rating': 6, 'ordering': '-duration_minutes', 'cursor': '', 'page_size': 5}),
+    ('/api/movies/genre/action/', {}),
+    ('/api/movies/featured/', {}),
+    ('/api/movies/7/', {}),
+)
+# Campos gravados no JSON de teste; o banco acrescenta as demais colunas do modelo com valores padrão
+FIXTURE_FIELDS = frozenset(make_movies(1)[0])
+
+
+def comparable(data):
+    """Resposta da API com cada filme reduzido aos campos do JSON de teste"""
+    if isinstance(data, list):
+        return [comparable(item) for item in data]
+    if isinstance(data, dict):
+        if 'title' in data:
+            return {key: value for key, value in data.items() if key in FIXTURE_FIELDS}
+        return {key: comparable(value) for key, value in data.items()}
+    return data
+
+
+class ImportMoviesToDbTests(CatalogFileMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        call_command('import_movies_to_db', file=self.path, stdout=StringIO())
+
+    def responses(self):
+        for alias in ('movies', 'catalog'):
+            caches[alias].clear()
+        return [self.client.get(url, params) for url, params in API_QUERIES]
+
+    def test_import_indexes_terms_and_genres(self):
+        self.assertEqual(Movie.objects.count(), len(self.movies))
+        self.assertTrue(MovieTerm.objects.filter(movie_id=1, token='acao').exists())
+        self.assertEqual(
+            set(MovieGenre.objects.filter(movie_id=3).values_list('genre', flat=True)), {'sci-fi', 'action'},
+        )
+
+    def test_import_advances_catalog_state(self):
+        state = CatalogState.objects.get(pk=1)
+        self.assertEqual((state.last_id, state.seq), (30, 1))
+        self.assertEqual(OrmMovieStore().snapshot().seq, 1)
+
+    def test_api_returns_same_results_from_json_and_orm(self):
+        expected = self.responses()
+        with mock.patch('movies.store._store', OrmMovieStore()):
+            responses = self.responses()
+        for (url, params), json_response, orm_response in zip(API_QUERIES, expected, responses):
+            with self.subTest(url=url, **params):
+                self.assertEqual(orm_response.status_code, json_response.status_code)
+                self.assertEqual(comparable(orm_response.json()), comparable(json_response.json()))
+
+    def test_movie_page_from_orm(self):
+        with mock.patch('movies.store._store', OrmMovieStore()):
+            response = self.client.get('/filme/tt0000006/')
+            self.assertContains(response, 'Coração Valente 6')
+            self.assertEqual(self.client.get('/filme/tt0000006/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+            self.assertEqual(self.client.get('/filme/tt9999999/').status_code, 404)
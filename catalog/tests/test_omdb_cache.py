@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from catalog.omdb import OmdbResponseCache
+from movies.tests.base import CatalogFileMixin
+from .base import StubOmdbServer, omdb_record
+
+IDS = ['tt9900001', 'tt9900002', 'tt9900003']
+
+
+class OmdbResponseCacheSyncTests(CatalogFileMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.stub = StubOmdbServer([omdb_record(imdb_id, f'Filme {imdb_id}') for imdb_id in IDS]).start()
+        self.addCleanup(self.stub.stop)
+        directory = os.path.dirname(self.path)
+        self.ids_file = os.path.join(directory, 'ids.txt')
+        self.cache_dir = os.path.join(directory, 'omdb_cache')
+        with open(self.ids_file, 'w', encoding='utf-8') as file:
+            file.write(''.join(f'{imdb_id}\n' for imdb_id in IDS))
+
+    def sync(self, **options):
+        out = StringIO()
+        options = {
+            'ids_file': self.ids_file, 'base_url': self.stub.url, 'cache_dir': self.cache_dir,
+            'checkpoint': os.path.join(os.path.dirname(self.path), 'sync.checkpoint'), 'rate': 0, **options,
+        }
+        call_command('sync_omdb', stdout=out, **options)
+        return out.getvalue()
+
+    def synced(self):
+        index = self.store.snapshot().index
+        return {imdb_id: index.get_by_imdb_id(imdb_id) for imdb_id in IDS}
+
+    def test_fresh_entries_are_served_without_requests_or_writes(self):
+        self.sync()
+        before, seq = self.synced(), self.store.snapshot().seq
+        mtime = os.stat(self.path).st_mtime_ns
+        first_run = len(self.stub.requested())
+
+        output = self.sync()
+        self.assertEqual(len(self.stub.requested()), first_run)
+        self.assertIn('Respostas do cache: 3 (requisições à OMDB: 0)', output)
+        self.assertIn('Filmes sem alteração: 3', output)
+        self.assertEqual(self.synced(), before)
+        self.assertEqual(self.store.snapshot().seq, seq)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+
+    def test_expired_entries_are_revalidated_with_the_etag(self):
+        self.sync()
+        before, seq = self.synced(), self.store.snapshot().seq
+        first_run = len(self.stub.requests)
+
+        output = self.sync(cache_ttl=0)
+        revalidations = self.stub.requests[first_run:]
+        self.assertEqual(sorted(imdb_id for imdb_id, _ in revalidations), IDS)
+        self.assertTrue(all(headers.get('If-None-Match') for _, headers in revalidations))
+        self.assertIn('Respostas do cache: 3 (requisições à OMDB: 3)', output)
+        self.assertEqual(self.synced(), before)
+        self.assertEqual(self.store.snapshot().seq, seq)
+
+    def test_changed_upstream_response_updates_only_that_movie(self):
+        self.sync()
+        before = self.synced()
+        self.stub.records['tt9900002'] = omdb_record('tt9900002', 'Título Novo')
+
+        output = self.sync(cache_ttl=0)
+        after = self.synced()
+        self.assertIn('Filmes atualizados: 1', output)
+        self.assertEqual(after['tt9900002']['title'], 'Título Novo')
+        self.assertNotEqual(after['tt9900002']['updated_at'], before['tt9900002']['updated_at'])
+        self.assertEqual(after['tt9900001'], before['tt9900001'])
+        self.assertEqual(OmdbResponseCache(self.cache_dir, 60).get('tt9900002')['data']['Title'], 'Título Novo')
+
+    def test_no_cache_fetches_everything(self):
+        self.sync()
+        first_run = len(self.stub.requested())
+        self.sync(no_cache=True)
+        self.assertEqual(len(self.stub.requested()) - first_run, 3)
+
+
+class OmdbResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = OmdbResponseCache(tempfile.mkdtemp(prefix='omdb-cache-'), 60)
+        self.addCleanup(shutil.rmtree, self.cache.directory, ignore_errors=True)
+
+    def test_rejects_ids_outside_the_imdb_format(self):
+        with self.assertRaises(ValueError):
+            self.cache.put('../x', {})
+        self.assertIsNone(self.cache.get('../x'))
+
+    def test_entries_expire_after_the_ttl(self):
+        entry = self.cache.put('tt0000001', {'Title': 'Filme'}, etag='"a"')
+        self.assertEqual(self.cache.get('tt0000001'), entry)
+        self.assertTrue(self.cache.is_fresh(entry))
+        self.assertFalse(self.cache.is_fresh({**entry, 'fetched_at': time.time() - 61}))
@@ -0,0 +1,237 @@
+import json
+import os
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from catalog.management.commands.sync_omdb import CHECKPOINT_SOURCE, Command
+from catalog.omdb import OmdbClient, TokenBucket, is_imdb_id, iter_dump_records, retry_after
+from movies.store import MovieStore
+from movies.tests.base import CatalogFileMixin
+from .base import StubOmdbServer, omdb_record
+
+IDS = [f'tt99{number:05d}' for number in range(1, 13)]
+
+
+class SyncOmdbTests(CatalogFileMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        records = [omdb_record(imdb_id, f'Filme {imdb_id}') for imdb_id in IDS]
+        records.append(omdb_record('tt0000001', 'Título da OMDB'))
+        self.stub = StubOmdbServer(records).start()
+        self.addCleanup(self.stub.stop)
+        directory = os.path.dirname(self.path)
+        self.ids_file = os.path.join(directory, 'ids.txt')
+        self.checkpoint = os.path.join(directory, 'sync.checkpoint')
+        self.write_ids(IDS)
+
+    def write_ids(self, ids):
+        with open(self.ids_file, 'w', encoding='utf-8') as file:
+            file.write(''.join(f'{imdb_id}\n' for imdb_id in ids))
+
+    def sync(self, **options):
+        out = StringIO()
+        options = {
+            'ids_file': self.ids_file, 'base_url': self.stub.url, 'checkpoint': self.checkpoint,
+            'rate': 0, 'concurrency': 4, 'chunk_size': 4, 'no_cache': True, **options,
+        }
+        call_command('sync_omdb', stdout=out, **options)
+        return out.getvalue()
+
+    def by_imdb_id(self, imdb_id):
+        return self.store.snapshot().index.get_by_imdb_id(imdb_id)
+
+    def test_syncs_every_id_once_against_the_stub_server(self):
+        self.write_ids(IDS + ['tt0000001', 'tt7777777'])
+        output = self.sync()
+        self.assertEqual(sorted(self.stub.requested()), sorted(IDS + ['tt0000001', 'tt7777777']))
+        self.assertEqual(sorted(self.by_imdb_id(imdb_id)['id'] for imdb_id in IDS), list(range(31, 43)))
+        self.assertEqual(self.by_imdb_id('tt0000001')['id'], 1)
+        self.assertEqual(self.by_imdb_id('tt0000001')['title'], 'Título da OMDB')
+        self.assertIsNone(self.by_imdb_id('tt7777777'))
+        self.assertIn('Novos filmes: 12', output)
+        self.assertIn('Filmes atualizados: 1', output)
+        self.assertIn('Erros: 1', output)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        transact = MovieStore.transact
+        calls = []
+
+        def interrupt_after_first_batch(store, build):
+            calls.append(build)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            return transact(store, build)
+
+        with mock.patch.object(MovieStore, 'transact', interrupt_after_first_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                self.sync(concurrency=1)
+        _, done = Command().load_checkpoint(self.checkpoint)
+        self.assertEqual(len(done), 4)
+
+        first_run = len(self.stub.requested())
+        output = self.sync()
+        self.assertIn('4 ids já processados', output)
+        self.assertEqual(sorted(self.stub.requested()[first_run:]), sorted(set(IDS) - done))
+        self.assertEqual(sum(self.by_imdb_id(imdb_id) is not None for imdb_id in IDS), 12)
+
+    def test_checkpoint_from_another_list_is_refused(self):
+        with open(self.checkpoint, 'w', encoding='utf-8') as file:
+            file.write(f'{CHECKPOINT_SOURCE}outra-lista\n{IDS[0]}\n')
+        with self.assertRaisesMessage(CommandError, '--restart'):
+            self.sync()
+        self.assertEqual(self.stub.requested(), [])
+
+        self.sync(restart=True)
+        self.assertEqual(sorted(self.stub.requested()), sorted(IDS))
+
+    def test_checkpoint_records_the_source_list(self):
+        with mock.patch.object(MovieStore, 'transact', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.sync()
+        source, _ = Command().load_checkpoint(self.checkpoint)
+        self.assertEqual(source, Command().source_fingerprint(self.ids_file))
+        self.write_ids(IDS[:3])
+        self.assertNotEqual(source, Command().source_fingerprint(self.ids_file))
+
+
+class SyncSourcesTests(CatalogFileMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.stub = StubOmdbServer([omdb_record(imdb_id, f'Filme {imdb_id}') for imdb_id in IDS]).start()
+        self.addCleanup(self.stub.stop)
+        self.directory = os.path.dirname(self.path)
+        self.checkpoint = os.path.join(self.directory, 'sync.checkpoint')
+
+    def sync(self, **options):
+        out = StringIO()
+        options = {'base_url': self.stub.url, 'checkpoint': self.checkpoint, 'rate': 0, 'no_cache': True, **options}
+        call_command('sync_omdb', stdout=out, **options)
+        return out.getvalue()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_ids_file_skips_comments_invalid_ids_and_repeats(self):
+        path = self.write('ids.txt', f'# lista\n\n{IDS[0]}  # comentário\n../x\n{IDS[1]}\n{IDS[0]}\n')
+        output = self.sync(ids_file=path)
+        self.assertEqual(sorted(self.stub.requested()), IDS[:2])
+        self.assertIn("Id IMDB inválido ignorado: '../x'", output)
+        self.assertIn('Novos filmes: 2', output)
+
+    def test_ids_from_stdin_run_without_checkpoint(self):
+        with mock.patch('sys.stdin', StringIO(''.join(f'{imdb_id}\n' for imdb_id in IDS[:3]))):
+            with mock.patch.object(Command, 'mark_done') as mark_done:
+                self.sync(ids_file='-')
+        self.assertEqual(sorted(self.stub.requested()), IDS[:3])
+        self.assertTrue(all(call.args[0] is None for call in mark_done.call_args_list))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_dump_json_array_is_imported_in_chunks_without_requests(self):
+        records = [omdb_record(imdb_id, f'Dump {imdb_id}') for imdb_id in IDS[:5]]
+        records.append({'Response': 'False', 'Error': 'Incorrect IMDb ID.'})
+        path = self.write('dump.json', json.dumps(records))
+        with mock.patch.object(MovieStore, 'transact', autospec=True, side_effect=MovieStore.transact) as transact:
+            output = self.sync(dump=path, chunk_size=2)
+        self.assertEqual(transact.call_count, 3)
+        self.assertEqual(self.stub.requested(), [])
+        self.assertIn('Novos filmes: 5', output)
+        self.assertIn('Erros: 1', output)
+        self.assertEqual(self.store.snapshot().index.get_by_imdb_id(IDS[4])['title'], f'Dump {IDS[4]}')
+
+    def test_dump_json_lines_updates_existing_movies(self):
+        records = [omdb_record('tt0000001', 'Título do Dump'), omdb_record(IDS[0], 'Novo')]
+        path = self.write('dump.jsonl', ''.join(json.dumps(record) + '\n' for record in records))
+        output = self.sync(dump=path)
+        self.assertIn('Novos filmes: 1', output)
+        self.assertIn('Filmes atualizados: 1', output)
+        self.assertEqual(self.store.snapshot().index.get(1)['title'], 'Título do Dump')
+
+    def test_truncated_dump_is_rejected(self):
+        path = self.write('dump.json', json.dumps([omdb_record(IDS[0], 'Filme')])[:-1])
+        with self.assertRaisesMessage(CommandError, 'Dump inválido'):
+            self.sync(dump=path)
+
+
+class IterDumpRecordsTests(SimpleTestCase):
+    def records(self, text, chunk_size=7):
+        return list(iter_dump_records(StringIO(text), chunk_size=chunk_size))
+
+    def test_records_split_across_reads(self):
+        records = [{'imdbID': f'tt{number:07d}', 'Title': 'x' * number} for number in range(1, 20)]
+        self.assertEqual(self.records(json.dumps(records)), records)
+        self.assertEqual(self.records('\n'.join(json.dumps(record) for record in records)), records)
+        self.assertEqual(self.records(''.join(json.dumps(record) for record in records)), records)
+
+    def test_empty_inputs(self):
+        self.assertEqual(self.records(''), [])
+        self.assertEqual(self.records(' [ ] '), [])
+        with self.assertRaises(ValueError):
+            self.records('[{"a": 1},')
+
+
+class ImdbIdTests(SimpleTestCase):
+    def test_is_imdb_id(self):
+        for value in ('tt0111161', 'tt12345678'):
+            self.assertTrue(is_imdb_id(value), value)
+        for value in ('', 'tt', '0111161', 'tt0111161/../x', 'TT0111161 ', None):
+            self.assertFalse(is_imdb_id(value), value)
+
+
+class OmdbClientRetryTests(SimpleTestCase):
+    def setUp(self):
+        self.stub = StubOmdbServer([omdb_record('tt0000001', 'Filme')]).start()
+        self.addCleanup(self.stub.stop)
+
+    def fetch(self, **options):
+        client = OmdbClient('chave', base_url=self.stub.url, backoff=0.001, **options)
+        self.addCleanup(client.close)
+        with mock.patch('catalog.omdb.time.sleep') as sleep:
+            data = client.fetch('tt0000001')
+        return client, data, [call.args[0] for call in sleep.call_args_list]
+
+    def test_retry_after_sets_the_retry_delay(self):
+        self.stub.failures['tt0000001'] = [(429, {'Retry-After': '7'}), (503, {})]
+        _, data, sleeps = self.fetch()
+        self.assertEqual(data['Title'], 'Filme')
+        self.assertEqual(len(self.stub.requested()), 3)
+        self.assertEqual(sleeps[0], 7)
+        self.assertLess(sleeps[1], 1)
+
+    def test_retry_after_pauses_the_shared_rate_limiter(self):
+        self.stub.failures['tt0000001'] = [(503, {'Retry-After': '30'})]
+        with mock.patch.object(TokenBucket, 'defer') as defer:
+            self.fetch(rate=100)
+        defer.assert_called_once_with(30)
+
+    def test_gives_up_after_the_configured_retries(self):
+        self.stub.failures['tt0000001'] = [(500, {})] * 3
+        with self.assertRaises(Exception):
+            self.fetch(retries=2)
+        self.assertEqual(len(self.stub.requested()), 3)
+
+
+class RetryAfterTests(SimpleTestCase):
+    def response(self, value):
+        return mock.Mock(headers={'Retry-After': value} if value is not None else {})
+
+    def test_seconds_and_http_dates(self):
+        self.assertEqual(retry_after(self.response('12')), 12)
+        self.assertEqual(retry_after(self.response('100000')), 60)
+        self.assertEqual(retry_after(self.response('Wed, 21 Oct 2015 07:28:00 GMT')), 0)
+        self.assertIsNone(retry_after(self.response('amanhã')))
+        self.assertIsNone(retry_after(self.response(None)))
+        self.assertIsNone(retry_after(None))
+
+    def test_deferred_bucket_waits_before_next_token(self):
+        bucket = TokenBucket(rate=1000)
+        bucket.defer(5)
+        with mock.patch('catalog.omdb.time.sleep', side_effect=InterruptedError) as sleep:
+            with self.assertRaises(InterruptedError):
+                bucket.acquire()
+        self.assertAlmostEqual(sleep.call_args.args[0], 5, delta=0.5)
@@ -0,0 +1,51 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase
+from catalog.views import home_movies
+from movies.orm_store import OrmMovieStore
+from movies.tests.base import CatalogFileMixin
+
+
+class CatalogPagesTests(CatalogFileMixin, TestCase):
+    def test_home_requires_login_and_lists_movies(self):
+        self.assertEqual(self.client.get('/').status_code, 302)
+        self.client.force_login(User.objects.create_user('ana'))
+        response = self.client.get('/')
+        self.assertContains(response, 'Ação na Noite 5')
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        self.store.update(5, lambda movie: {**movie, 'title': 'Outro Título'})
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertContains(response, 'Outro Título')
+        self.assertNotContains(response, 'Ação na Noite 5')
+
+    def test_movie_page_reflects_updates(self):
+        self.assertContains(self.client.get('/filme/tt0000001/'), 'Coração Valente 1')
+        self.store.update(1, lambda movie: {**movie, 'description': 'Enredo novo'})
+        self.assertContains(self.client.get('/filme/tt0000001/'), 'Enredo novo')
+
+
+class HomeMoviesTests(CatalogFileMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.store.create({'title': 'Sem IMDB'})
+        self.client.force_login(User.objects.create_user('ana'))
+
+    def test_json_list_is_built_once_per_catalog_version(self):
+        movies = home_movies(self.store, self.store.snapshot())
+        self.assertEqual([movie['id'] for movie in movies], list(range(1, 31)))
+        self.assertIs(home_movies(self.store, self.store.snapshot()), movies)
+        self.store.delete(30)
+        self.assertEqual(len(home_movies(self.store, self.store.snapshot())), 29)
+
+    def test_orm_home_pages_in_the_database(self):
+        orm = OrmMovieStore()
+        orm.apply(puts=list(self.store.snapshot()))
+        movies = home_movies(orm, orm.snapshot())
+        with self.assertNumQueries(2):
+            self.assertEqual(movies.count(), 30)
+            self.assertEqual([movie['id'] for movie in movies[24:30]], list(range(25, 31)))
+        with mock.patch('movies.store._store', orm):
+            response = self.client.get('/', {'page': 2})
+        self.assertContains(response, 'Acaso 29')
+        self.assertNotContains(response, 'Sem IMDB')
@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth.views import LogoutView
-from .views import home, detalhes_filme
+from . import async_views, views
 
-urlpatterns = [
-    path("", home, name="home"),
-    path("filme/<str:imdb_id>/", detalhes_filme, name="detalhes_filme"),
-    path("logout/", LogoutView.as_view(next_page='/accounts/login/'), name="logout"),
-]
 
+def page_urlpatterns(pages):
+    """Rotas do catálogo web servidas pelas views de ``pages`` (``views`` ou ``async_views``)"""
+    return [
+        path("", pages.home, name="home"),
+        path("filme/<str:imdb_id>/", pages.detalhes_filme, name="detalhes_filme"),
+        path("logout/", LogoutView.as_view(next_page='/accounts/login/'), name="logout"),
+    ]
+
+
+# Views assíncronas no deploy ASGI (ver MOVIES_ASYNC_VIEWS)
+urlpatterns = page_urlpatterns(async_views if getattr(settings, 'MOVIES_ASYNC_VIEWS', False) else views)
@@ -1,51 +1,89 @@
-import json
-import os
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
 from django.shortcuts import render
 from django.http import Http404
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import condition
+from movies.conditional import catalog_last_modified, movie_etag, parse_timestamp, query_etag
+from movies.store import get_store, movie_version
 
-JSON_FILE_PATH = os.path.join(settings.BASE_DIR, 'movies', 'data', 'movies.json')
+# Cache dos fragmentos HTML renderizados (grade da home, cards e detalhes)
+FRAGMENT_CACHE = getattr(settings, 'CATALOG_FRAGMENT_CACHE', 'default')
+FRAGMENT_TIMEOUT = getattr(settings, 'CATALOG_FRAGMENT_TIMEOUT', 3600)
+# Filmes por página na home
+HOME_PAGE_SIZE = getattr(settings, 'CATALOG_HOME_PAGE_SIZE', 24)
+# (store, seq, filmes da home) da última versão do catálogo exibida
+_home_movies = (None, None, [])
 
 
-def load_movies():
-    """Carrega filmes do arquivo JSON"""
-    try:
-        if os.path.exists(JSON_FILE_PATH):
-            with open(JSON_FILE_PATH, 'r', encoding='utf-8') as file:
-                return json.load(file).get('movies', [])
-        return []
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def find_movie_by_imdb_id(imdb_id):
+    """Encontra filme por imdb_id no índice do catálogo"""
+    return get_store().snapshot().index.get_by_imdb_id(imdb_id)
 
 
-def find_movie_by_imdb_id(imdb_id):
-    """Encontra filme por imdb_id no JSON"""
-    movies = load_movies()
-    for movie in movies:
-        if movie.get('imdb_id') == imdb_id:
-            return movie
-    return None
+def movie_page_etag(request, imdb_id):
+    movie = find_movie_by_imdb_id(imdb_id)
+    return movie_etag(movie) if movie else None
+
+
+def movie_page_last_modified(request, imdb_id):
+    movie = find_movie_by_imdb_id(imdb_id)
+    return parse_timestamp(movie.get('updated_at')) if movie else None
+
+
+def page_number(request):
+    try:
+        return max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        return 1
 
 
 @login_required
+@condition(etag_func=query_etag, last_modified_func=catalog_last_modified)
 def home(request):
-    """Exibe catálogo de filmes do JSON"""
-    movies = load_movies()
-    # Filtrar apenas filmes que têm imdb_id (vindos do OMDB)
-    movies_with_imdb = [m for m in movies if m.get('imdb_id')]
-    return render(request, "catalog/home.html", {"filmes": movies_with_imdb})
+    """Exibe catálogo de filmes do JSON, paginado"""
+    return render_home(request)
 
 
-def detalhes_filme(request, imdb_id):
-    """Exibe detalhes do filme buscando do JSON"""
-    movie = find_movie_by_imdb_id(imdb_id)
-    
-    if not movie:
-        raise Http404("Filme não encontrado")
-    
-    # Converter formato JSON para formato compatível com template (campos OMDB)
-    filme_data = {
+def home_movies(store, snapshot):
+    """Filmes da home (apenas os que têm imdb_id, vindos do OMDB).
+
+    No backend ORM o Paginator conta e fatia uma consulta filtrada; no JSON a
+    lista é montada uma vez por versão do catálogo (``seq``).
+    """
+    with_imdb_id = getattr(snapshot, 'with_imdb_id', None)
+    if with_imdb_id is not None:
+        return with_imdb_id()
+    global _home_movies
+    cached = _home_movies
+    if cached[0] is not store or cached[1] != snapshot.seq:
+        cached = _home_movies = (store, snapshot.seq, [movie for movie in snapshot if movie.get('imdb_id')])
+    return cached[2]
+
+
+def render_home(request):
+    """Renderiza a home.
+
+    A grade de cada página é cacheada por versão do catálogo e número da
+    página efetivamente exibida (``?page=999`` e a última página usam o
+    mesmo fragmento); cada card é cacheado por versão do filme.
+    """
+    store = get_store()
+    snapshot = store.snapshot()
+    page = Paginator(home_movies(store, snapshot), HOME_PAGE_SIZE).get_page(page_number(request))
+    return render(request, "catalog/home.html", {
+        "pagina": page,
+        "pagina_numero": page.number,
+        "versao_catalogo": snapshot.seq,
+        "fragment_cache": FRAGMENT_CACHE,
+        "fragment_timeout": FRAGMENT_TIMEOUT,
+    })
+
+
+def detail_data(movie):
+    """Converte formato JSON para formato compatível com template (campos OMDB)"""
+    return {
         'Title': movie.get('title', ''),
         'Year': str(movie.get('release_year', '')),
         'Poster': movie.get('thumbnail_url', ''),
@@ -56,6 +94,26 @@ def detalhes_filme(request, imdb_id):
         'Plot': movie.get('description', 'N/A'),
         'imdbRating': str(movie.get('rating', 'N/A')),
     }
-    
-    return render(request, "catalog/detalhes.html", {"filme": filme_data})
 
+
+@condition(etag_func=movie_page_etag, last_modified_func=movie_page_last_modified)
+def detalhes_filme(request, imdb_id):
+    """Exibe detalhes do filme buscando do JSON"""
+    return render_detalhes(request, imdb_id)
+
+
+def render_detalhes(request, imdb_id):
+    """Renderiza a página do filme; o corpo é cacheado por versão do filme"""
+    movie = find_movie_by_imdb_id(imdb_id)
+    
+    if not movie:
+        raise Http404("Filme não encontrado")
+    
+    return render(request, "catalog/detalhes.html", {
+        "filme": SimpleLazyObject(lambda: detail_data(movie)),
+        "titulo": movie.get('title', ''),
+        "filme_id": movie['id'],
+        "filme_versao": f"{movie_version(movie)}-{movie.get('updated_at')}",
+        "fragment_cache": FRAGMENT_CACHE,
+        "fragment_timeout": FRAGMENT_TIMEOUT,
+    })
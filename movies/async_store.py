@@ -0,0 +1,148 @@
+"""Acesso assíncrono ao catálogo, usado pelas views ASGI.
+
+Buscas pontuais (por id) usam o snapshot em memória direto no event loop;
+listagens (filtro, ordenação e busca, proporcionais ao catálogo) rodam em um
+executor próprio. Recarregar os arquivos, gravar e qualquer acesso ao banco
+(backend ORM) também rodam fora do loop. As gravações de um loop passam por
+um ``asyncio.Lock``, de modo que no máximo uma thread do executor fica
+bloqueada no lock de arquivo do store enquanto as demais requisições
+continuam sendo atendidas.
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .store import get_store
+
+# Threads para recarga e gravação dos arquivos do catálogo
+IO_WORKERS = getattr(settings, 'MOVIES_ASYNC_IO_WORKERS', 4)
+# Threads para as listagens sobre o snapshot em memória (separadas para não atrasar recargas e gravações)
+QUERY_WORKERS = getattr(settings, 'MOVIES_ASYNC_QUERY_WORKERS', 4)
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def executor(name, workers):
+    """Executor do processo para ``name``, criado no primeiro uso e compartilhado entre os stores"""
+    pool = _executors.get(name)
+    if pool is None:
+        with _executors_lock:
+            pool = _executors.get(name)
+            if pool is None:
+                pool = _executors[name] = ThreadPoolExecutor(workers, thread_name_prefix=f'movies-{name}')
+    return pool
+
+
+class LoopState:
+    """Lock de escrita e recarga em andamento de um event loop"""
+
+    def __init__(self):
+        self.write_lock = asyncio.Lock()
+        self.refresh = None
+
+
+class AsyncMovieStore:
+    """Interface assíncrona sobre o store do processo (``MovieStore`` ou ``OrmMovieStore``).
+
+    ``in_memory`` indica que o snapshot é mantido em memória (backend JSON):
+    buscas pontuais não fazem I/O e rodam no próprio loop. No backend ORM as
+    consultas vão ao banco e são executadas com ``sync_to_async``.
+    """
+
+    def __init__(self, store, in_memory=None):
+        self.store = store
+        self.in_memory = hasattr(store, 'cached_snapshot') if in_memory is None else in_memory
+        self.executor = executor('io', IO_WORKERS)
+        self._loops = weakref.WeakKeyDictionary()
+        self._loops_lock = threading.Lock()
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            with self._loops_lock:
+                state = self._loops.setdefault(loop, LoopState())
+        return loop, state
+
+    async def _blocking(self, func, *args):
+        """Executa ``func`` fora do event loop"""
+        if self.in_memory:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args))
+        # O ORM precisa das conexões gerenciadas pelo Django (thread_sensitive)
+        return await sync_to_async(func)(*args)
+
+    async def snapshot(self):
+        """Snapshot atual; se os arquivos mudaram, a recarga roda no executor e é compartilhada"""
+        if not self.in_memory:
+            return await self._blocking(self.store.snapshot)
+        current = self.store.cached_snapshot()
+        if current is not None:
+            return current
+        loop, state = self._state()
+        if state.refresh is None or state.refresh.done():
+            state.refresh = loop.run_in_executor(self.executor, self.store.snapshot)
+        return await asyncio.shield(state.refresh)
+
+    async def read(self, func, *args):
+        """Executa ``func(snapshot, *args)`` no loop; para buscas pontuais (custo independente do catálogo)"""
+        if self.in_memory:
+            return func(await self.snapshot(), *args)
+        return await self._blocking(lambda: func(self.store.snapshot(), *args))
+
+    async def query(self, func, *args):
+        """Executa ``func(snapshot, *args)`` fora do loop; para listagens que percorrem o catálogo"""
+        if self.in_memory:
+            snapshot = await self.snapshot()
+            return await asyncio.get_running_loop().run_in_executor(
+                executor('query', QUERY_WORKERS), partial(func, snapshot, *args),
+            )
+        return await self._blocking(lambda: func(self.store.snapshot(), *args))
+
+    async def run(self, func, *args):
+        """Executa ``func(*args)``, que lê o catálogo pelo ``get_store()`` síncrono"""
+        if self.in_memory:
+            await self.snapshot()
+            return func(*args)
+        return await self._blocking(func, *args)
+
+    async def write(self, func, *args):
+        """Executa ``func(store, *args)`` fora do loop, uma gravação por vez neste loop"""
+        _, state = self._state()
+        async with state.write_lock:
+            return await self._blocking(func, self.store, *args)
+
+    async def create(self, movie):
+        return await self.write(lambda store: store.create(movie))
+
+    async def update(self, pk, change, expected_versions=None):
+        return await self.write(lambda store: store.update(pk, change, expected_versions))
+
+    async def delete(self, pk, expected_versions=None):
+        return await self.write(lambda store: store.delete(pk, expected_versions))
+
+    async def transact(self, build):
+        return await self.write(lambda store: store.transact(build))
+
+    async def apply(self, puts=(), deletes=()):
+        return await self.write(lambda store: store.apply(puts, deletes))
+
+
+# store síncrono -> AsyncMovieStore; resolvido a cada chamada para acompanhar o ``get_store()`` atual
+_async_stores = weakref.WeakKeyDictionary()
+_async_stores_lock = threading.Lock()
+
+
+def get_async_store():
+    """Retorna o store assíncrono sobre o ``get_store()`` atual"""
+    store = get_store()
+    async_store = _async_stores.get(store)
+    if async_store is None:
+        with _async_stores_lock:
+            async_store = _async_stores.get(store)
+            if async_store is None:
+                async_store = _async_stores[store] = AsyncMovieStore(store)
+    return async_store
@@ -0,0 +1,133 @@
+"""Variantes assíncronas das views da API, usadas no deploy ASGI (MOVIES_ASYNC_VIEWS).
+
+Mesmas URLs, parâmetros e respostas das views DRF de ``views.py``, cujas
+funções compartilhadas contêm as regras. Cada requisição passa pelas mesmas
+etapas do ``APIView`` (autenticação, permissões e throttling, fora do loop);
+buscas por id rodam no event loop sobre o snapshot em memória, listagens no
+executor de consultas e gravações pelo ``AsyncMovieStore`` (executor + lock
+asyncio).
+"""
+from inspect import isawaitable
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .async_store import get_async_store
+from .cache import cache_list_response
+from .conditional import (
+    catalog_last_modified,
+    conditional_get,
+    movie_detail_etag,
+    movie_detail_last_modified,
+    query_etag,
+)
+from .views import (
+    apply_bulk,
+    change_movie,
+    create_movie,
+    if_match_versions,
+    list_movies,
+    list_movies_by_genre,
+    list_response,
+    retrieve_movie,
+)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` com handlers assíncronos.
+
+    Só o ``dispatch`` muda: ``initial`` (negociação, autenticação, permissões
+    e throttling, que podem consultar sessão e banco) roda com
+    ``sync_to_async`` e o handler é aguardado no loop; exceções, cabeçalhos e
+    renderers seguem o ``APIView``. A resposta é renderizada no loop, pois o
+    JSON dos filmes vem dos fragmentos em memória.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(self.response, Response):
+            self.response.render()
+        return self.response
+
+    def get_renderer_context(self):
+        """Inclui os filmes publicados do snapshot já carregado (o renderer não consulta o store)"""
+        store = get_async_store()
+        snapshot = store.store.cached_snapshot() if store.in_memory else None
+        return {
+            **super().get_renderer_context(),
+            'catalog_by_id': snapshot.index.by_id if snapshot is not None else {},
+        }
+
+
+def async_api_view(methods):
+    """Equivalente assíncrono de ``@api_view``: monta um ``AsyncAPIView`` com ``func`` nos métodos dados"""
+    def decorator(func):
+        async def handler(self, request, *args, **kwargs):
+            return await func(request, *args, **kwargs)
+
+        attrs = {method.lower(): handler for method in methods}
+        attrs.update(
+            __doc__=func.__doc__, __module__=func.__module__,
+            http_method_names=[method.lower() for method in methods] + ['options'],
+        )
+        return type(func.__name__, (AsyncAPIView,), attrs).as_view()
+    return decorator
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@async_api_view(['GET', 'POST'])
+async def get_all_movies(request):
+    """GET: Lista filmes com filtros (ou busca vários por ``?ids=``) | POST: Cria novo filme"""
+    if request.method in SAFE_METHODS:
+        return await get_async_store().query(list_movies, request)
+    return await get_async_store().write(create_movie, request.data)
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@async_api_view(['GET'])
+async def get_movies_by_genre(request, genre):
+    """GET: Lista filmes por gênero"""
+    return await get_async_store().query(list_movies_by_genre, request, genre)
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@async_api_view(['GET'])
+async def get_featured_movies(request):
+    """GET: Lista filmes em destaque"""
+    return await get_async_store().query(lambda snapshot: list_response(snapshot, {'featured': True}, request))
+
+
+@conditional_get(etag_func=movie_detail_etag, last_modified_func=movie_detail_last_modified)
+@async_api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
+async def movie_detail(request, pk):
+    """GET: Busca filme | PUT: Atualiza completo | PATCH: Atualiza parcial | DELETE: Remove"""
+    if request.method in SAFE_METHODS:
+        return await get_async_store().read(retrieve_movie, request, pk)
+    data = request.data if request.method != 'DELETE' else None
+    return await get_async_store().write(change_movie, pk, request.method, data, if_match_versions(request, pk))
+
+
+@async_api_view(['POST'])
+async def bulk_movies(request):
+    """POST: Aplica um lote de operações em uma única gravação (ver ``views.bulk_movies``)"""
+    return await get_async_store().write(apply_bulk, request.data)
@@ -0,0 +1,160 @@
+"""Cache das respostas de listagem, versionado pela versão do catálogo"""
+import hashlib
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from .async_store import get_async_store
+from .metrics import RESPONSE_CACHE
+from .store import get_store
+
+# Alias em settings.CACHES usado para as respostas; None desativa o cache
+RESPONSE_CACHE_ALIAS = getattr(settings, 'MOVIES_RESPONSE_CACHE', 'movies')
+# Cabeçalhos que não são copiados da resposta guardada (recalculados a cada acerto)
+STORED_ELSEWHERE = {'content-type', 'content-length', 'x-cache'}
+
+_sizes = {}
+_totals = {}
+
+
+class ByteBudgetLocMemCache(LocMemCache):
+    """LocMemCache LRU limitado também pelo total de bytes (``OPTIONS['MAX_BYTES']``)"""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get('OPTIONS', {})
+        self._max_bytes = int(options.get('MAX_BYTES', 32 * 1024 * 1024))
+        self._sizes = _sizes.setdefault(name, {})
+        self._total = _totals.setdefault(name, [0])
+
+    @property
+    def total_bytes(self):
+        return self._total[0]
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._forget(key)
+        super()._set(key, value, timeout)
+        self._sizes[key] = len(value)
+        self._total[0] += len(value)
+        # O fim do OrderedDict guarda as entradas usadas há mais tempo
+        while self._total[0] > self._max_bytes and len(self._cache) > 1:
+            oldest, _ = self._cache.popitem()
+            del self._expire_info[oldest]
+            self._forget(oldest)
+
+    def _forget(self, key):
+        self._total[0] -= self._sizes.pop(key, 0)
+
+    def _cull(self):
+        super()._cull()
+        for key in [key for key in self._sizes if key not in self._cache]:
+            self._forget(key)
+
+    def _delete(self, key):
+        self._forget(key)
+        return super()._delete(key)
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if key in self._cache:
+                self._forget(key)
+                self._sizes[key] = len(self._cache[key])
+                self._total[0] += self._sizes[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._sizes.clear()
+            self._total[0] = 0
+
+
+def canonical_query(request):
+    """Parâmetros da query ordenados e sem ``page=1``"""
+    return sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+        if not (key == 'page' and value == '1')
+    )
+
+
+def response_cache_key(request):
+    """Chave da resposta: esquema, host, caminho e query (os links next/previous do corpo são absolutos)"""
+    digest = hashlib.blake2b(
+        repr((request.scheme, request.get_host(), request.path, canonical_query(request))).encode('utf-8'),
+        digest_size=16,
+    ).hexdigest()
+    return f'movies:response:{digest}'
+
+
+def cache_list_response(view):
+    """Serve GETs de listagem a partir do cache de respostas.
+
+    A chave é o caminho mais a query normalizada e a versão do cache é a
+    versão do catálogo: qualquer gravação incrementa ``seq`` e as entradas
+    antigas deixam de ser encontradas, saindo do cache pelo LRU.
+    """
+    if iscoroutinefunction(view):
+        return async_cache_list_response(view)
+
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        if request.method != 'GET' or not RESPONSE_CACHE_ALIAS:
+            return view(request, *args, **kwargs)
+        seq = get_store().snapshot().seq
+        response = cached_response(request, seq)
+        if response is None:
+            response = store_response(request, seq, view(request, *args, **kwargs))
+        return response
+    return inner
+
+
+def async_cache_list_response(view):
+    """``cache_list_response`` para views assíncronas (o cache em memória é consultado no loop)"""
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method != 'GET' or not RESPONSE_CACHE_ALIAS:
+            return await view(request, *args, **kwargs)
+        seq = (await get_async_store().snapshot()).seq
+        response = cached_response(request, seq)
+        if response is None:
+            response = store_response(request, seq, await view(request, *args, **kwargs))
+        return response
+    return inner
+
+
+def cached_response(request, seq):
+    """Resposta guardada para a requisição na versão ``seq`` do catálogo, ou None"""
+    cached = caches[RESPONSE_CACHE_ALIAS].get(response_cache_key(request), version=seq)
+    if cached is None:
+        RESPONSE_CACHE.labels('miss').inc()
+        return None
+    RESPONSE_CACHE.labels('hit').inc()
+    content_type, content, headers = cached
+    response = HttpResponse(content, content_type=content_type)
+    for header, value in headers:
+        response[header] = value
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def store_response(request, seq, response):
+    """Guarda a resposta (se 200 e não streaming) com os cabeçalhos da view (Allow, Vary) e a retorna"""
+    if response.status_code == 200 and not response.streaming:
+        if hasattr(response, 'render'):
+            response.render()
+        headers = tuple(
+            (header, value) for header, value in response.items() if header.lower() not in STORED_ELSEWHERE
+        )
+        caches[RESPONSE_CACHE_ALIAS].set(
+            response_cache_key(request), (response['Content-Type'], response.content, headers), version=seq,
+        )
+        response['X-Cache'] = 'MISS'
+    return response
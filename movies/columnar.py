@@ -0,0 +1,339 @@
+"""Representação colunar compacta do catálogo (``MOVIES_CATALOG_LAYOUT = 'columnar'``).
+
+Em vez de um dicionário por filme, os campos ficam em colunas: arrays para
+id, ano, duração e nota, códigos de dicionário para os textos repetidos
+(gênero, idioma, país, diretor) e listas para os demais valores, com as
+strings curtas deduplicadas. O dicionário de um filme só é montado quando
+ele é lido; os mais recentes ficam guardados para que leituras seguidas
+devolvam o mesmo objeto (os fragmentos JSON dos renderers dependem disso).
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from django.conf import settings
+from .encoding import dumps
+from .persistent import PersistentMap
+
+# Campos guardados em arrays (typecode); valores de outro tipo ficam em ``irregular``
+NUMERIC_FIELDS = {'id': 'q', 'release_year': 'i', 'duration_minutes': 'i', 'rating': 'd'}
+# Campos de baixa cardinalidade guardados como códigos de um dicionário de valores
+DICTIONARY_FIELDS = ('genre', 'language', 'country', 'director', 'is_featured')
+# Strings até este tamanho nas demais colunas são deduplicadas (datas, metascore, prêmios)
+DEDUPLICATE_MAX_LENGTH = 32
+# Quantidade de filmes materializados mantidos em memória por conjunto de colunas
+MATERIALIZED_CACHE_SIZE = getattr(settings, 'MOVIES_COLUMNAR_CACHE_SIZE', 10000)
+# Alterações desde a montagem das colunas (fração do catálogo) a partir das quais elas são refeitas
+REBUILD_FRACTION = 0.125
+REBUILD_MIN = 1024
+
+NUMERIC_TYPES = {'q': int, 'i': int, 'd': float}
+NUMERIC_LIMITS = {'q': 2 ** 63, 'i': 2 ** 31}
+
+
+def fits(value, typecode):
+    """Indica se ``value`` cabe no array sem mudar de tipo (bool e int grande não cabem)"""
+    if type(value) is not NUMERIC_TYPES[typecode]:
+        return False
+    limit = NUMERIC_LIMITS.get(typecode)
+    return limit is None or -limit <= value < limit
+
+
+def copy_array(typecode, values):
+    """Cópia de ``values`` (array ou memoryview do mesmo tipo) em um novo array"""
+    copy = array(typecode)
+    copy.frombytes(memoryview(values).cast('B'))
+    return copy
+
+
+def code_array(codes, size):
+    """Array de códigos com o menor typecode que comporta ``size`` valores distintos"""
+    return array('B' if size <= 2 ** 8 else 'H' if size <= 2 ** 16 else 'I', codes)
+
+
+class MovieColumns:
+    """Colunas imutáveis de um conjunto de filmes ordenado por id.
+
+    A ordem das chaves de cada filme é preservada (``layouts``), então o
+    dicionário materializado serializa exatamente como o original.
+    """
+
+    def __init__(self, movies):
+        movies = list(movies)
+        count = len(movies)
+        layouts, layout_codes = {}, []
+        numbers = {field: array(typecode, bytes(array(typecode).itemsize * count))
+                   for field, typecode in NUMERIC_FIELDS.items()}
+        dictionaries = {field: {} for field in DICTIONARY_FIELDS}
+        codes = {field: [0] * count for field in DICTIONARY_FIELDS}
+        objects = {}
+        irregular = {}
+        pool = {}
+
+        for row, movie in enumerate(movies):
+            layout_codes.append(layouts.setdefault(tuple(movie), len(layouts)))
+            for field, value in movie.items():
+                if field in numbers:
+                    if fits(value, NUMERIC_FIELDS[field]):
+                        numbers[field][row] = value
+                        continue
+                elif field in dictionaries:
+                    try:
+                        codes[field][row] = dictionaries[field].setdefault(value, len(dictionaries[field]))
+                        continue
+                    except TypeError:  # lista ou dicionário: não é hashable
+                        pass
+                else:
+                    if type(value) is str and len(value) <= DEDUPLICATE_MAX_LENGTH:
+                        value = pool.setdefault(value, value)
+                    column = objects.get(field)
+                    if column is None:
+                        column = objects[field] = [None] * count
+                    column[row] = value
+                    continue
+                irregular.setdefault(field, {})[row] = value
+
+        if 'id' in irregular:
+            raise ValueError('A representação colunar exige ids inteiros')
+        self.layouts = list(layouts)
+        self.layout_fields = [frozenset(layout) for layout in self.layouts]
+        self.layout_codes = code_array(layout_codes, len(layouts))
+        self.ids = numbers['id']
+        self.numbers = numbers
+        self.dictionaries = {field: list(values) for field, values in dictionaries.items()}
+        self.codes = {field: code_array(codes[field], len(values)) for field, values in dictionaries.items()}
+        self.objects = objects
+        self.irregular = irregular
+        self._readers = {field: self._reader(field) for layout in self.layouts for field in layout}
+        self._cache = {}
+        self._fragments = {}
+        self._cache_lock = threading.Lock()
+
+    def _reader(self, field):
+        """Função ``row -> valor`` do campo"""
+        if field in self.numbers:
+            read = self.numbers[field].__getitem__
+        elif field in self.codes:
+            values, codes = self.dictionaries[field], self.codes[field]
+
+            def read(row):
+                return values[codes[row]]
+        else:
+            read = self.objects[field].__getitem__
+        exceptions = self.irregular.get(field)
+        if not exceptions:
+            return read
+
+        def read_irregular(row):
+            return exceptions[row] if row in exceptions else read(row)
+        return read_irregular
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, pk):
+        """Posição do filme com o id informado ou -1"""
+        row = bisect_left(self.ids, pk)
+        return row if row < len(self.ids) and self.ids[row] == pk else -1
+
+    def value(self, row, field, default=None):
+        """Valor de um campo do filme na posição ``row``, sem montar o dicionário"""
+        if field not in self.layout_fields[self.layout_codes[row]]:
+            return default
+        return self._readers[field](row)
+
+    def number(self, row, field):
+        """Valor do campo numérico ``field`` para ordenação (0 quando ausente; convertido por ``to_number``)"""
+        return self.value(row, field, 0)
+
+    def matches(self, row, movie):
+        """Se ``movie`` é igual ao filme da posição ``row`` (sem guardá-lo no cache)"""
+        return self.movie(row, cache=False) == movie
+
+    def materialize(self, row):
+        """Monta um novo dicionário com o filme da posição ``row``"""
+        readers = self._readers
+        return {field: readers[field](row) for field in self.layouts[self.layout_codes[row]]}
+
+    def movie(self, row, cache=True):
+        """Dicionário do filme na posição ``row``, montado na primeira leitura.
+
+        Com ``cache=False`` o filme não entra no cache (leituras do catálogo inteiro).
+        """
+        movie = self._cache.get(row)
+        if movie is not None or not cache:
+            return movie if movie is not None else self.materialize(row)
+        movie = self.materialize(row)
+        with self._cache_lock:
+            movie = self._cache.setdefault(row, movie)
+            if len(self._cache) > MATERIALIZED_CACHE_SIZE:
+                # Descarta os filmes materializados há mais tempo (ordem de inserção)
+                del self._cache[next(iter(self._cache))]
+        return movie
+
+    def fragment(self, row):
+        """JSON do filme na posição ``row``, guardado junto das colunas (liberado com elas)"""
+        fragment = self._fragments.get(row)
+        if fragment is not None:
+            return fragment
+        fragment = dumps(self.movie(row))
+        with self._cache_lock:
+            self._fragments[row] = fragment
+            if len(self._fragments) > MATERIALIZED_CACHE_SIZE:
+                del self._fragments[next(iter(self._fragments))]
+        return fragment
+
+    def nbytes(self):
+        """Bytes ocupados pelos arrays de números e códigos (sem as listas e strings)"""
+        arrays = [self.layout_codes, *self.numbers.values(), *self.codes.values()]
+        return sum(column.itemsize * len(column) for column in arrays)
+
+
+class MovieSequence:
+    """Filmes de ``ids`` (padrão: o catálogo inteiro, por id), montados só quando acessados por posição"""
+
+    __slots__ = ('catalog', 'ids')
+
+    def __init__(self, catalog, ids=None):
+        self.catalog = catalog
+        self.ids = catalog.ids if ids is None else ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.catalog[pk] for pk in self.ids[position]]
+        return self.catalog[self.ids[position]]
+
+    def __iter__(self):
+        return (self.catalog.peek(pk) for pk in self.ids)
+
+
+class ColumnarCatalog:
+    """Mapeamento somente leitura id -> filme, ordenado por id, sobre colunas compactas.
+
+    Substitui o ``MovieMap`` de ``CatalogIndex.by_id``. Filmes gravados depois da
+    montagem das colunas ficam em ``changed`` como dicionários comuns e os
+    removidos em ``deleted``; quando as alterações passam de
+    ``REBUILD_FRACTION`` do catálogo, ``updated`` refaz as colunas.
+    """
+
+    __slots__ = ('columns', 'changed', 'deleted', 'ids', 'movies')
+
+    def __init__(self, movies=(), columns=None, changed=None, deleted=frozenset(), ids=None):
+        self.columns = MovieColumns(movies) if columns is None else columns
+        self.changed = PersistentMap() if changed is None else changed
+        self.deleted = deleted
+        self.ids = self.columns.ids if ids is None else ids
+        self.movies = MovieSequence(self)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __reversed__(self):
+        return reversed(self.ids)
+
+    def __contains__(self, pk):
+        if pk in self.changed:
+            return True
+        return pk not in self.deleted and type(pk) is int and self.columns.row(pk) >= 0
+
+    def __getitem__(self, pk):
+        movie = self.get(pk)
+        if movie is None:
+            raise KeyError(pk)
+        return movie
+
+    def get(self, pk, default=None, cache=True):
+        movie = self.changed.get(pk)
+        if movie is not None:
+            return movie
+        if pk in self.deleted or type(pk) is not int:
+            return default
+        row = self.columns.row(pk)
+        return default if row < 0 else self.columns.movie(row, cache)
+
+    def value(self, pk, field, default=None):
+        """Como ``self[pk].get(field, default)``, lendo só a coluna do campo"""
+        movie = self.changed.get(pk)
+        if movie is not None:
+            return movie.get(field, default)
+        row = -1 if pk in self.deleted else self.columns.row(pk)
+        if row < 0:
+            raise KeyError(pk)
+        return self.columns.value(row, field, default)
+
+    def number(self, pk, field):
+        """Valor do campo numérico para ordenação, lendo só a coluna (ver ``MovieColumns.number``)"""
+        movie = self.changed.get(pk)
+        if movie is not None:
+            return movie.get(field, 0)
+        row = -1 if pk in self.deleted else self.columns.row(pk)
+        if row < 0:
+            raise KeyError(pk)
+        return self.columns.number(row, field)
+
+    def matches(self, pk, movie):
+        """Se ``movie`` é igual ao filme gravado com esse id, comparando pelas colunas"""
+        current = self.changed.get(pk)
+        if current is not None:
+            return current == movie
+        row = -1 if pk in self.deleted or type(pk) is not int else self.columns.row(pk)
+        return row >= 0 and self.columns.matches(row, movie)
+
+    def fragment(self, pk):
+        """JSON do filme guardado nas colunas, ou None para os gravados depois delas (dicionários comuns)"""
+        if pk in self.changed:
+            return None
+        return self.columns.fragment(self.columns.row(pk))
+
+    def peek(self, pk):
+        """Como ``self[pk]``, sem guardar o filme montado no cache (leituras de passagem)"""
+        movie = self.get(pk, cache=False)
+        if movie is None:
+            raise KeyError(pk)
+        return movie
+
+    def keys(self):
+        return iter(self.ids)
+
+    def values(self):
+        """Gera os filmes em ordem de id sem guardá-los no cache de materializados"""
+        return (self.peek(pk) for pk in self.ids)
+
+    def items(self):
+        return ((pk, self.peek(pk)) for pk in self.ids)
+
+    def updated(self, deleted=(), added=()):
+        """Retorna um novo catálogo sem os ids ``deleted`` e com os filmes ``added`` gravados"""
+        added_ids = {movie['id'] for movie in added}
+        deleted = [pk for pk in deleted if pk not in added_ids]
+        ids = self.ids
+        missing = {pk for pk in deleted if pk in self}
+        changed = self.changed.updated(
+            {movie['id']: movie for movie in added}, [pk for pk in deleted if pk in self.changed],
+        )
+        removed = self.deleted
+        gone = {pk for pk in deleted if pk not in removed and self.columns.row(pk) >= 0}
+        if gone or not removed.isdisjoint(added_ids):
+            removed = (removed - added_ids) | gone
+        new_ids = sorted(pk for pk in added_ids if pk not in self)
+
+        if len(changed) + len(removed) > max(REBUILD_MIN, REBUILD_FRACTION * len(self.columns)):
+            # Muitas alterações acumuladas: refaz as colunas com o estado atual
+            merged = {pk: movie for pk, movie in self.items() if pk not in missing}
+            merged.update((movie['id'], movie) for movie in added)
+            return ColumnarCatalog(movie for _, movie in sorted(merged.items()))
+        if missing or new_ids:
+            ids = copy_array('q', ids)
+            for pk in sorted(missing):
+                del ids[bisect_left(ids, pk)]
+            if new_ids and (not ids or new_ids[0] > ids[-1]):
+                ids.extend(new_ids)  # ids novos normalmente são maiores que os existentes
+            else:
+                for pk in new_ids:
+                    ids.insert(bisect_left(ids, pk), pk)
+        return ColumnarCatalog(columns=self.columns, changed=changed, deleted=removed, ids=ids)
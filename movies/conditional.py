@@ -0,0 +1,90 @@
+"""Validadores HTTP (ETag / Last-Modified) calculados sem serializar a resposta"""
+import hashlib
+from datetime import datetime
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.utils import timezone
+from django.views.decorators.http import condition
+from .async_store import get_async_store
+from .cache import canonical_query
+from .store import get_store, movie_version
+
+
+def movie_etag(movie):
+    """ETag forte do filme, derivado do id e da versão"""
+    return f'"{movie["id"]}.{movie_version(movie)}"'
+
+
+def parse_timestamp(value):
+    """Converte um timestamp ISO 8601 em datetime com fuso (horários sem fuso usam TIME_ZONE)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def query_etag(request, *args, **kwargs):
+    """ETag de uma listagem: versão do catálogo + URL (esquema, host, caminho e query normalizada)"""
+    digest = hashlib.blake2b(
+        repr((request.scheme, request.get_host(), request.path, canonical_query(request))).encode('utf-8'),
+        digest_size=8,
+    ).hexdigest()
+    return f'"c{get_store().snapshot().seq}-{digest}"'
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    """Instante da última gravação no catálogo"""
+    return parse_timestamp(get_store().snapshot().modified_at)
+
+
+def movie_detail_etag(request, pk):
+    movie = get_store().snapshot().index.get(pk)
+    return movie_etag(movie) if movie else None
+
+
+def movie_detail_last_modified(request, pk):
+    movie = get_store().snapshot().index.get(pk)
+    return parse_timestamp(movie.get('updated_at')) if movie else None
+
+
+def conditional_get(etag_func=None, last_modified_func=None):
+    """Como ``django.views.decorators.http.condition``, mas avaliado só em GET/HEAD.
+
+    Requisições com If-None-Match / If-Modified-Since que batem com os
+    validadores recebem 304 sem executar a view. Gravações seguem direto
+    para a view, que trata o If-Match com a versão do filme.
+
+    Em views assíncronas os validadores são calculados pelo store assíncrono
+    (fora do loop quando consultam o banco) antes da comparação.
+    """
+    def decorator(func):
+        if iscoroutinefunction(func):
+            return async_conditional_get(func, etag_func, last_modified_func)
+        conditioned = condition(etag_func=etag_func, last_modified_func=last_modified_func)(func)
+
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            if request.method in ('GET', 'HEAD'):
+                return conditioned(request, *args, **kwargs)
+            return func(request, *args, **kwargs)
+        return inner
+    return decorator
+
+
+def async_conditional_get(func, etag_func, last_modified_func):
+    @wraps(func)
+    async def inner(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await func(request, *args, **kwargs)
+        etag, last_modified = await get_async_store().run(lambda: (
+            etag_func(request, *args, **kwargs) if etag_func else None,
+            last_modified_func(request, *args, **kwargs) if last_modified_func else None,
+        ))
+        conditioned = condition(etag_func=lambda *_, **__: etag, last_modified_func=lambda *_, **__: last_modified)
+        return await conditioned(func)(request, *args, **kwargs)
+    return inner
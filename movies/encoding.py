@@ -0,0 +1,32 @@
+"""Serialização JSON do catálogo: orjson quando instalado, com fallback para a stdlib"""
+import json
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+# 'auto' usa orjson se disponível; 'json' força a biblioteca padrão
+JSON_BACKEND = getattr(settings, 'MOVIES_JSON_BACKEND', 'auto')
+
+_default = JSONEncoder().default
+
+if orjson is not None and JSON_BACKEND != 'json':
+    BACKEND = 'orjson'
+
+    def dumps(value):
+        """Serializa ``value`` em JSON compacto (bytes, UTF-8)"""
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+else:
+    BACKEND = 'json'
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+
+    def dumps(value):
+        """Serializa ``value`` em JSON compacto (bytes, UTF-8)"""
+        return _encoder.encode(value).encode('utf-8')
+
+    loads = json.loads
@@ -0,0 +1,56 @@
+"""Exportação do catálogo em NDJSON ou CSV, gerada linha a linha"""
+import csv
+from itertools import chain
+from .encoding import dumps
+
+# Colunas do CSV, na ordem do JSON gerado pela sincronização OMDB
+CSV_FIELDS = (
+    'id', 'title', 'description', 'genre', 'release_year', 'duration_minutes', 'rating',
+    'thumbnail_url', 'video_url', 'is_featured', 'imdb_id', 'director', 'actors', 'writer',
+    'language', 'country', 'awards', 'metascore', 'imdb_votes', 'created_at', 'updated_at', 'version',
+)
+# Linhas agrupadas por bloco enviado ao cliente
+ROWS_PER_CHUNK = 500
+
+
+class _Echo:
+    """Arquivo falso que devolve o que recebe, para usar o csv.writer sem buffer"""
+
+    def write(self, value):
+        return value
+
+
+def _chunked(lines, separator=''):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield separator.join(chunk)
+            chunk = []
+    if chunk:
+        yield separator.join(chunk)
+
+
+def ndjson_rows(movies, projection=None):
+    """Um objeto JSON por linha.
+
+    Serializa cada filme direto, sem passar pelo cache de fragmentos: a
+    exportação percorre o catálogo inteiro e encheria o LRU (e reteria os
+    filmes) com entradas que as listagens não reaproveitam.
+    """
+    return _chunked((dumps(movie) + b'\n' for movie in movies), b'')
+
+
+def csv_rows(movies, projection=None):
+    """Cabeçalho seguido de uma linha por filme; campos fora das colunas são ignorados"""
+    fields = projection.columns(CSV_FIELDS) if projection else CSV_FIELDS
+    writer = csv.DictWriter(_Echo(), fieldnames=fields, extrasaction='ignore')
+    header = writer.writerow(dict(zip(fields, fields)))
+    return _chunked(chain([header], (writer.writerow(movie) for movie in movies)))
+
+
+# formato -> (gerador de linhas, Content-Type, extensão)
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_rows, 'application/x-ndjson; charset=utf-8', 'ndjson'),
+    'csv': (csv_rows, 'text/csv; charset=utf-8', 'csv'),
+}
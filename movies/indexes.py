@@ -0,0 +1,461 @@
+"""Índices secundários do catálogo construídos a cada carga do JSON"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from heapq import merge
+from itertools import chain
+from math import isqrt
+from .columnar import REBUILD_FRACTION, REBUILD_MIN, ColumnarCatalog, MovieSequence, copy_array
+from .persistent import PersistentMap
+
+# Campos numéricos com coluna ordenada para filtros por faixa e ordenação
+NUMERIC_FIELDS = {
+    'rating': float,
+    'release_year': int,
+    'duration_minutes': int,
+}
+# Acima desta quantidade de alterações, SortedColumn.merged copia por fatias em vez de inserir uma a uma
+MERGE_THRESHOLD = 64
+
+
+def genre_tokens(value):
+    """Divide gêneros no formato OMDB ("Action, Adventure") em tokens minúsculos"""
+    if not value:
+        return []
+    return [token.strip().lower() for token in str(value).split(',') if token.strip()]
+
+
+def intersect(postings):
+    """Intersecta listas de postagem começando pela menor; retorna ids ordenados.
+
+    Aceita ``frozenset`` ou sequências ordenadas de ids (listas mapeadas da
+    imagem compartilhada, ver ``shared``), resolvidas por bisseção quando são
+    bem maiores que o resultado parcial.
+    """
+    postings = sorted(postings, key=len)
+    if not postings[0]:
+        return []
+    if len(postings) == 1 and not isinstance(postings[0], frozenset):
+        return list(postings[0])
+    result = postings[0] if isinstance(postings[0], frozenset) else frozenset(postings[0])
+    for posting in postings[1:]:
+        if isinstance(posting, frozenset) or len(result) * 16 > len(posting):
+            result = result.intersection(posting)
+        else:
+            result = frozenset(pk for pk in result if contains(posting, pk))
+        if not result:
+            return []
+    return sorted(result)
+
+
+def contains(ordered, pk):
+    """Indica se ``pk`` está na sequência ordenada ``ordered``"""
+    position = bisect_left(ordered, pk)
+    return position < len(ordered) and ordered[position] == pk
+
+
+def in_posting(posting, pk):
+    """Indica se ``pk`` está na lista de postagem (``frozenset`` ou sequência ordenada mapeada)"""
+    return pk in posting if isinstance(posting, frozenset) else contains(posting, pk)
+
+
+def numeric_value(movie, field):
+    """Converte o campo numérico do filme, usando 0 quando ausente ou inválido"""
+    return to_number(movie.get(field, 0), field)
+
+
+def to_number(value, field):
+    """Converte o valor do campo numérico ``field``, usando 0 quando vazio ou inválido"""
+    try:
+        return NUMERIC_FIELDS[field](value or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+class SortedColumn:
+    """Coluna ordenada por (valor, id) em arrays, resolvida por bisseção"""
+
+    __slots__ = ('values', 'ids')
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.values = array('d', (value for value, _ in pairs))
+        self.ids = array('q', (pk for _, pk in pairs))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _position(self, value, pk):
+        """Posição de (valor, id) dentro da faixa de valores iguais"""
+        start = bisect_left(self.values, value)
+        end = bisect_right(self.values, value, start)
+        return bisect_left(self.ids, pk, start, end)
+
+    def contains(self, value, pk):
+        """Indica se o par (valor, id) está na coluna"""
+        position = self._position(value, pk)
+        return position < len(self.ids) and self.ids[position] == pk and self.values[position] == value
+
+    def range_ids(self, low=None, high=None):
+        """Ids com ``low <= valor <= high``; limites None são abertos"""
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        return self.ids[start:end]
+
+    def walk(self, after=None, descending=False):
+        """Pares (valor, id) em ordem (decrescente com ``descending``), a partir do seguinte a ``after``"""
+        values, ids = self.values, self.ids
+        if descending:
+            end = len(ids) if after is None else self._position(*after)
+            for position in range(end - 1, -1, -1):
+                yield values[position], ids[position]
+            return
+        start = 0
+        if after is not None:
+            start = self._position(*after)
+            if start < len(ids) and (values[start], ids[start]) == tuple(after):
+                start += 1
+        for position in range(start, len(ids)):
+            yield values[position], ids[position]
+
+    def compacted(self):
+        return self
+
+    def updated(self, removed=(), added=()):
+        """Retorna a coluna sem os pares (valor, id) ``removed`` e com os ``added``.
+
+        A coluna não é copiada: as alterações ficam em uma ``ColumnOverlay``
+        sobre ela, consolidada quando passa de ``overlay_limit``.
+        """
+        return ColumnOverlay(self).updated(removed, added)
+
+    def merged(self, removed=(), added=()):
+        """Cópia da coluna sem os pares (valor, id) ``removed`` e com os ``added``"""
+        removed = [pair for pair in removed if self.contains(*pair)]
+        added = sorted(added)
+        if len(removed) + len(added) <= MERGE_THRESHOLD:
+            column = SortedColumn.__new__(SortedColumn)
+            column.values = copy_array('d', self.values)
+            column.ids = copy_array('q', self.ids)
+            for value, pk in removed:
+                position = column._position(value, pk)
+                del column.values[position]
+                del column.ids[position]
+            for value, pk in added:
+                position = column._position(value, pk)
+                column.values.insert(position, value)
+                column.ids.insert(position, pk)
+            return column
+        # Lotes grandes: copia as fatias entre os pontos de corte (inserções antes das remoções na mesma posição)
+        cuts = sorted(chain(
+            ((self._position(*pair), 1, pair) for pair in removed),
+            ((self._position(*pair), 0, pair) for pair in added),
+        ))
+        values, ids = array('d'), array('q')
+        old_values, old_ids = memoryview(self.values).cast('B'), memoryview(self.ids).cast('B')
+        start = 0
+        for position, skip, (value, pk) in cuts:
+            values.frombytes(old_values[start * 8:position * 8])
+            ids.frombytes(old_ids[start * 8:position * 8])
+            if skip:
+                start = position + 1
+            else:
+                values.append(value)
+                ids.append(pk)
+                start = position
+        values.frombytes(old_values[start * 8:])
+        ids.frombytes(old_ids[start * 8:])
+        column = SortedColumn.__new__(SortedColumn)
+        column.values, column.ids = values, ids
+        return column
+
+
+def overlay_limit(column):
+    """Alterações acumuladas sobre ``column`` até que a ``ColumnOverlay`` seja consolidada.
+
+    Sobre colunas mapeadas da imagem compartilhada o limite é uma fração da
+    coluna, pois consolidar copia a coluna para a memória do processo; sobre
+    colunas em memória é √N, o que mantém a gravação em O(√N) amortizado.
+    """
+    if isinstance(column.values, memoryview):
+        return max(REBUILD_MIN, REBUILD_FRACTION * len(column))
+    return max(MERGE_THRESHOLD, isqrt(len(column)))
+
+
+class ColumnOverlay:
+    """Coluna ordenada com as alterações posteriores por cima, sem copiar a base.
+
+    A base é uma ``SortedColumn`` em memória ou mapeada da imagem
+    compartilhada (páginas comuns a todos os processos); só os pares
+    removidos dela e a coluna dos adicionados são copiados a cada gravação.
+    Quando as alterações passam de ``overlay_limit``, ``updated`` devolve uma
+    ``SortedColumn`` comum.
+    """
+
+    __slots__ = ('base', 'removed', 'added')
+
+    def __init__(self, base, removed=frozenset(), added=None):
+        self.base = base
+        self.removed = removed
+        self.added = SortedColumn() if added is None else added
+
+    def __len__(self):
+        return len(self.base) - len(self.removed) + len(self.added)
+
+    def range_ids(self, low=None, high=None):
+        gone = [
+            pk for value, pk in self.removed if (low is None or value >= low) and (high is None or value <= high)
+        ]
+        ids = frozenset(self.base.range_ids(low, high)).difference(gone)
+        return ids.union(self.added.range_ids(low, high)) if len(self.added) else ids
+
+    def walk(self, after=None, descending=False):
+        pairs = self.base.walk(after, descending)
+        if self.removed:
+            pairs = (pair for pair in pairs if pair not in self.removed)
+        if not len(self.added):
+            return pairs
+        return merge(pairs, self.added.walk(after, descending), reverse=descending)
+
+    def compacted(self):
+        """``SortedColumn`` com os pares atuais, copiada para a memória do processo"""
+        return self.base.merged(self.removed, zip(self.added.values, self.added.ids))
+
+    def updated(self, removed=(), added=()):
+        from_added, from_base = [], set(self.removed)
+        for value, pk in removed:
+            if self.added.contains(value, pk):
+                from_added.append((value, pk))
+            elif self.base.contains(value, pk):
+                from_base.add((value, pk))
+        column = ColumnOverlay(self.base, frozenset(from_base), self.added.merged(from_added, added))
+        if len(column.removed) + len(column.added) > overlay_limit(self.base):
+            return column.compacted()
+        return column
+
+
+class MovieMap:
+    """Mapeamento somente leitura id -> filme do layout 'dict', ordenado por id.
+
+    Os filmes ficam em um ``PersistentMap`` e os ids, em ordem, em ``ids``;
+    ``updated`` compartilha com a versão anterior tudo o que não mudou e só
+    copia a lista de ids quando um filme é criado ou removido.
+    """
+
+    __slots__ = ('by_pk', 'ids', 'movies')
+
+    def __init__(self, movies=(), by_pk=None, ids=None):
+        if by_pk is None:
+            by_pk = PersistentMap((movie['id'], movie) for movie in movies)
+            ids = sorted(by_pk)
+        self.by_pk = by_pk
+        self.ids = ids
+        self.movies = MovieSequence(self)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __reversed__(self):
+        return reversed(self.ids)
+
+    def __contains__(self, pk):
+        return pk in self.by_pk
+
+    def __getitem__(self, pk):
+        return self.by_pk[pk]
+
+    peek = __getitem__
+
+    def get(self, pk, default=None, cache=True):
+        return self.by_pk.get(pk, default)
+
+    def value(self, pk, field, default=None):
+        return self.by_pk[pk].get(field, default)
+
+    def number(self, pk, field):
+        return self.by_pk[pk].get(field, 0)
+
+    def matches(self, pk, movie):
+        return self.by_pk.get(pk) == movie
+
+    def keys(self):
+        return iter(self.ids)
+
+    def values(self):
+        return (self.by_pk[pk] for pk in self.ids)
+
+    def items(self):
+        return ((pk, self.by_pk[pk]) for pk in self.ids)
+
+    def updated(self, deleted=(), added=()):
+        """Retorna um novo mapeamento sem os ids ``deleted`` e com os filmes ``added`` gravados"""
+        changes = {movie['id']: movie for movie in added}
+        gone = sorted({pk for pk in deleted if pk in self.by_pk and pk not in changes})
+        new_ids = sorted(pk for pk in changes if pk not in self.by_pk)
+        ids = self.ids
+        if gone:
+            ids = list(ids)
+            for pk in reversed(gone):
+                del ids[bisect_left(ids, pk)]
+        if new_ids and (not ids or new_ids[0] > ids[-1]):
+            ids = ids + new_ids  # ids novos normalmente são maiores que os existentes
+        elif new_ids:
+            ids = ids if gone else list(ids)
+            for pk in new_ids:
+                ids.insert(bisect_left(ids, pk), pk)
+        return MovieMap(by_pk=self.by_pk.updated(changes, gone), ids=ids)
+
+
+class CatalogIndex:
+    """Índices de busca O(1) por id, imdb_id, gênero, ano e destaque.
+
+    As listas de postagem guardam ids de filmes em ``frozenset`` para que os
+    filtros combinados sejam resolvidos por interseção. Instâncias são
+    imutáveis; ``updated`` devolve uma nova versão que compartilha com esta
+    tudo o que a gravação não alterou. ``by_id`` é um ``MovieMap`` ou, após
+    ``compacted``, um ``ColumnarCatalog``.
+    """
+
+    POSTING_TABLES = ('genres', 'years', 'featured')
+
+    def __init__(self, movies=()):
+        movies = [movie for movie in movies if movie.get('id') is not None]
+        self.by_id = MovieMap(movies)
+        self.by_imdb_id = PersistentMap((movie['imdb_id'], movie['id']) for movie in movies if movie.get('imdb_id'))
+        tables = {name: defaultdict(set) for name in self.POSTING_TABLES}
+        for movie in movies:
+            for name, key in self._posting_keys(movie):
+                tables[name][key].add(movie['id'])
+
+        for name, table in tables.items():
+            setattr(self, name, {key: frozenset(ids) for key, ids in table.items()})
+        self.columns = {
+            field: SortedColumn((numeric_value(movie, field), pk) for pk, movie in self.by_id.items())
+            for field in NUMERIC_FIELDS
+        }
+
+    def compacted(self):
+        """Retorna o mesmo índice com os filmes em colunas compactas (ver ``columnar``).
+
+        Catálogos com ids não inteiros continuam em um ``MovieMap``.
+        """
+        if not isinstance(self.by_id, MovieMap):
+            return self
+        try:
+            by_id = ColumnarCatalog(self.by_id.values())
+        except ValueError:
+            return self
+        index = CatalogIndex.__new__(CatalogIndex)
+        index.__dict__.update(self.__dict__)
+        index.by_id = by_id
+        return index
+
+    @staticmethod
+    def _posting_keys(movie):
+        """Gera (tabela, chave) de cada lista de postagem em que o filme entra"""
+        for token in genre_tokens(movie.get('genre')):
+            yield 'genres', token
+        yield 'years', movie.get('release_year')
+        yield 'featured', bool(movie.get('is_featured', False))
+
+    def updated(self, removed=(), added=()):
+        """Retorna um novo índice sem os filmes ``removed`` e com os ``added``.
+
+        Para atualizar um filme, passe a versão antiga em ``removed`` e a nova
+        em ``added``. Só as estruturas que a gravação altera são copiadas: as
+        fatias de ``by_id``/``by_imdb_id`` com os filmes gravados, as listas de
+        postagem que ganham ou perdem um id e o delta das colunas ordenadas.
+        """
+        index = CatalogIndex.__new__(CatalogIndex)
+        removed = [movie for movie in removed if movie.get('id') is not None]
+        added = [movie for movie in added if movie.get('id') is not None]
+        added_ids = {movie['id'] for movie in added}
+        deleted = [movie['id'] for movie in removed if movie['id'] not in added_ids]
+
+        imdb_ids = {movie['imdb_id']: movie['id'] for movie in added if movie.get('imdb_id')}
+        index.by_imdb_id = self.by_imdb_id.updated(
+            {key: pk for key, pk in imdb_ids.items() if self.by_imdb_id.get(key) != pk},
+            [
+                movie['imdb_id'] for movie in removed
+                if movie.get('imdb_id') and movie['imdb_id'] not in imdb_ids
+                and self.by_imdb_id.get(movie['imdb_id']) == movie['id']
+            ],
+        )
+        index.by_id = self.by_id.updated(deleted, added)
+
+        changes = defaultdict(lambda: (set(), set()))
+        for movie in removed:
+            for name, key in self._posting_keys(movie):
+                changes[name, key][1].add(movie['id'])
+        for movie in added:
+            for name, key in self._posting_keys(movie):
+                changes[name, key][0].add(movie['id'])
+                changes[name, key][1].discard(movie['id'])
+        for name in self.POSTING_TABLES:
+            setattr(index, name, getattr(self, name))
+        for (name, key), (additions, removals) in changes.items():
+            table = getattr(index, name)
+            posting = table.get(key, ())
+            additions = {pk for pk in additions if not in_posting(posting, pk)}
+            removals = {pk for pk in removals if in_posting(posting, pk)}
+            if not additions and not removals:
+                continue  # o filme continua na mesma lista (ex.: só a nota mudou)
+            if table is getattr(self, name):
+                table = dict(table)
+                setattr(index, name, table)
+            ids = (frozenset(posting) - removals) | additions
+            if ids:
+                table[key] = frozenset(ids)
+            else:
+                table.pop(key, None)
+
+        index.columns = {}
+        for field, column in self.columns.items():
+            old = {(numeric_value(movie, field), movie['id']) for movie in removed}
+            new = {(numeric_value(movie, field), movie['id']) for movie in added}
+            unchanged = old & new
+            index.columns[field] = column.updated(old - unchanged, new - unchanged) if old != new else column
+        return index
+
+    def get(self, pk):
+        """Retorna o filme com o id informado ou None"""
+        return self.by_id.get(pk)
+
+    def get_by_imdb_id(self, imdb_id):
+        """Retorna o filme com o imdb_id informado ou None"""
+        pk = self.by_imdb_id.get(imdb_id)
+        return None if pk is None else self.by_id.get(pk)
+
+    def filter_ids(self, genre=None, year=None, featured=None, ranges=None):
+        """Retorna os ids que atendem a todos os filtros, ordenados, ou None sem filtros.
+
+        ``ranges`` mapeia campos numéricos para faixas ``(mínimo, máximo)``.
+        """
+        postings = []
+        if genre is not None:
+            tokens = genre_tokens(genre)
+            if not tokens:
+                return []
+            postings.extend(self.genres.get(token, frozenset()) for token in tokens)
+        if year is not None:
+            postings.append(self.years.get(year, frozenset()))
+        if featured is not None:
+            postings.append(self.featured.get(bool(featured), frozenset()))
+        for field, (low, high) in (ranges or {}).items():
+            postings.append(frozenset(self.columns[field].range_ids(low, high)))
+        if not postings:
+            return None
+        return intersect(postings)
+
+    def filter(self, genre=None, year=None, featured=None, ranges=None):
+        """Retorna os filmes que atendem a todos os filtros, ordenados por id.
+
+        Filtros ``None`` são ignorados; sem nenhum filtro retorna todo o catálogo.
+        """
+        ids = self.filter_ids(genre=genre, year=year, featured=featured, ranges=ranges)
+        if ids is None:
+            return list(self.by_id.values())
+        return [self.by_id[pk] for pk in ids]
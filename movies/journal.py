@@ -0,0 +1,99 @@
+"""Log de mutações append-only e gravação atômica do snapshot do catálogo"""
+import os
+from .encoding import dumps, loads
+
+
+def write_atomic(path, payload):
+    """Grava ``payload`` (bytes) em ``path`` via arquivo temporário, fsync e rename"""
+    directory = os.path.dirname(path) or '.'
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory):
+    """Garante que o rename fique persistido (no-op onde não é suportado)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class MutationLog:
+    """Arquivo JSON Lines onde cada linha é um lote ``{"puts": [...], "deletes": [...], ...}``.
+
+    Cada lote é gravado com uma única escrita seguida de fsync; uma linha
+    incompleta no fim do arquivo (queda durante a escrita) é ignorada na
+    leitura e descartada na próxima gravação.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def read(self, offset=0):
+        """Lê os lotes a partir de ``offset``; retorna (lotes, offset do fim da última linha completa)"""
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], 0
+        end = data.rfind(b'\n') + 1
+        batches = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue
+            batches.append(entry)
+        return batches, offset + end
+
+    def read_bytes(self, offset):
+        """Retorna as linhas completas gravadas a partir de ``offset``"""
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return b''
+        return data[:data.rfind(b'\n') + 1]
+
+    def append(self, batch, end):
+        """Acrescenta um lote após ``end`` e retorna o novo offset final.
+
+        Bytes além de ``end`` são restos de uma escrita interrompida e são descartados.
+        """
+        line = dumps(batch) + b'\n'
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != end:
+                os.ftruncate(fd, end)
+            os.lseek(fd, end, os.SEEK_SET)
+            view = memoryview(line)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return end + len(line)
+
+    def reset(self, tail=b''):
+        """Substitui o log atomicamente por ``tail`` (lotes ainda não compactados)"""
+        write_atomic(self.path, tail)
@@ -0,0 +1,273 @@
+"""Métricas do processo no formato de texto do Prometheus.
+
+Contadores e histogramas ficam em memória (um conjunto por processo) e são
+atualizados pelo ``MetricsMiddleware`` e pelos ganchos do store, da
+paginação e do renderer. Cada série é resolvida uma vez e guardada, então
+registrar uma observação custa uma busca em dicionário e uma bisseção.
+"""
+import hmac
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+
+# True ativa o middleware, os ganchos e a rota /metrics (desativado: funções sem instrumentação)
+METRICS_ENABLED = getattr(settings, 'MOVIES_METRICS_ENABLED', False)
+# Token aceito em ``Authorization: Bearer <token>`` para ler /metrics (além de usuários staff)
+METRICS_TOKEN = getattr(settings, 'MOVIES_METRICS_TOKEN', None)
+# Limites (em segundos) dos histogramas de latência
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_registry = []
+_lock = threading.Lock()
+
+
+class CounterValue:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class HistogramValue:
+    __slots__ = ('bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class NullValue:
+    """Série usada quando as métricas estão desativadas"""
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+NULL_VALUE = NullValue()
+
+
+class Metric:
+    """Família de séries com o mesmo nome, separadas pelos valores dos labels"""
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.series = {}
+        _registry.append(self)
+
+    def labels(self, *values):
+        """Série dos valores de label informados (na ordem de ``labelnames``)"""
+        if not METRICS_ENABLED:
+            return NULL_VALUE
+        series = self.series.get(values)
+        if series is None:
+            with _lock:
+                series = self.series.setdefault(values, self._new_series())
+        return series
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def _label_text(self, values, extra=()):
+        pairs = [*zip(self.labelnames, values), *extra]
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in pairs) + '}'
+
+    def samples(self):
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_series(self):
+        return CounterValue()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, series in list(self.series.items()):
+            yield f'{self.name}{self._label_text(values)} {format_value(series.value)}'
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_series(self):
+        return HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def samples(self):
+        for values, series in list(self.series.items()):
+            with series.lock:
+                counts, total = list(series.counts), series.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                le = bound if bound == '+Inf' else format_value(bound)
+                yield f'{self.name}_bucket{self._label_text(values, [("le", le)])} {cumulative}'
+            yield f'{self.name}_sum{self._label_text(values)} {format_value(total)}'
+            yield f'{self.name}_count{self._label_text(values)} {cumulative}'
+
+
+class Gauge(Metric):
+    """Valor lido no momento da coleta por ``collect()``"""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, collect):
+        super().__init__(name, documentation)
+        self.collect = collect
+
+    def samples(self):
+        yield f'{self.name} {format_value(self.collect())}'
+
+
+def escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def timed(histogram, *labels):
+    """Decorator que registra a duração de cada chamada em ``histogram``"""
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+        series = histogram.labels(*labels)
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                series.observe(perf_counter() - start)
+        return inner
+    return decorator
+
+
+def render():
+    """Texto de exposição do Prometheus com todas as métricas do processo"""
+    lines = []
+    for metric in _registry:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_DURATION = Histogram(
+    'movies_http_request_duration_seconds', 'Latência das requisições por rota', ('method', 'route'),
+)
+RESPONSES = Counter('movies_http_responses_total', 'Respostas por rota e status', ('route', 'status'))
+STORE_LOAD = Histogram(
+    'movies_store_load_seconds',
+    'Tempo para sincronizar o catálogo com o disco (full: snapshot + log, log: só lotes novos, image: imagem + log)',
+    ('kind',),
+)
+STORE_PARSE = Histogram('movies_store_parse_seconds', 'Tempo de leitura e parse do snapshot JSON')
+STORE_READ_BYTES = Counter('movies_store_read_bytes_total', 'Bytes lidos do snapshot JSON')
+STORE_COMMIT = Histogram('movies_store_commit_seconds', 'Tempo de gravação de um lote (índices + log + fsync)')
+STORE_WRITTEN_BYTES = Counter('movies_store_written_bytes_total', 'Bytes gravados em disco pelo store', ('file',))
+QUERY_DURATION = Histogram('movies_query_seconds', 'Tempo de filtragem e ordenação das listagens')
+PAGINATE_DURATION = Histogram('movies_paginate_seconds', 'Tempo de paginação das listagens')
+RENDER_DURATION = Histogram('movies_render_seconds', 'Tempo de serialização JSON das respostas da API')
+RENDERED_BYTES = Counter('movies_rendered_bytes_total', 'Bytes de JSON gerados pelo renderer da API')
+RESPONSE_CACHE = Counter(
+    'movies_response_cache_requests_total', 'Consultas ao cache de respostas das listagens', ('result',),
+)
+
+
+class MetricsMiddleware:
+    """Mede a latência de cada requisição, agrupada pela rota (padrão da URL).
+
+    Funciona nos modos síncrono e assíncrono, para não forçar trocas de
+    thread no caminho das views assíncronas sob ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = perf_counter()
+        response = self.get_response(request)
+        record_request(request, response, perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = perf_counter()
+        response = await self.get_response(request)
+        record_request(request, response, perf_counter() - start)
+        return response
+
+
+def record_request(request, response, elapsed):
+    match = request.resolver_match
+    route = match.route if match is not None else 'unmatched'
+    REQUEST_DURATION.labels(request.method, route).observe(elapsed)
+    RESPONSES.labels(route, response.status_code).inc()
+
+
+def metrics_authorized(request):
+    """Indica se a requisição traz o token de METRICS_TOKEN ou vem de um usuário staff.
+
+    O endereço de origem não é usado: atrás do proxy reverso todas as
+    requisições chegam do mesmo IP.
+    """
+    scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if METRICS_TOKEN and scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+def metrics_view(request):
+    """Exposição das métricas para o Prometheus (ver ``metrics_authorized``); os demais recebem 404"""
+    if not METRICS_ENABLED or not metrics_authorized(request):
+        raise Http404
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
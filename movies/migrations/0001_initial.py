@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_id', models.IntegerField(default=0)),
+                ('seq', models.IntegerField(default=0)),
+                ('modified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Movie',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('genre', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('release_year', models.IntegerField(default=0)),
+                ('duration_minutes', models.IntegerField(default=0)),
+                ('rating', models.FloatField(default=0)),
+                ('thumbnail_url', models.TextField(blank=True)),
+                ('video_url', models.TextField(blank=True)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('imdb_id', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('director', models.TextField(blank=True)),
+                ('actors', models.TextField(blank=True)),
+                ('writer', models.TextField(blank=True)),
+                ('language', models.CharField(blank=True, max_length=255)),
+                ('country', models.CharField(blank=True, max_length=255)),
+                ('awards', models.TextField(blank=True)),
+                ('metascore', models.CharField(blank=True, max_length=20)),
+                ('imdb_votes', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('extra', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['is_featured', 'id'], name='movies_movi_is_feat_9dc13f_idx'), models.Index(fields=['release_year', 'id'], name='movies_movi_release_fc5620_idx'), models.Index(fields=['rating', 'id'], name='movies_movi_rating_345343_idx')],
+            },
+        ),
+    ]
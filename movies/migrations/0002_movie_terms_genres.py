@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from movies.indexes import genre_tokens
+from movies.search import movie_terms
+
+SEARCH_FIELDS = ('title', 'director', 'actors', 'description')
+BATCH_SIZE = 2000
+
+
+def index_existing_movies(apps, schema_editor):
+    """Preenche os tokens de busca e os gêneros dos filmes já gravados no banco"""
+    Movie = apps.get_model('movies', 'Movie')
+    MovieTerm = apps.get_model('movies', 'MovieTerm')
+    MovieGenre = apps.get_model('movies', 'MovieGenre')
+    terms, genres = [], []
+    for movie in Movie.objects.order_by('id').iterator(BATCH_SIZE):
+        data = {field: getattr(movie, field) for field in SEARCH_FIELDS}
+        terms.extend(MovieTerm(movie_id=movie.id, token=token, weight=weight)
+                     for token, weight in movie_terms(data).items())
+        genres.extend(MovieGenre(movie_id=movie.id, genre=genre) for genre in dict.fromkeys(genre_tokens(movie.genre)))
+        if len(terms) >= BATCH_SIZE:
+            MovieTerm.objects.bulk_create(terms, batch_size=BATCH_SIZE)
+            MovieGenre.objects.bulk_create(genres, batch_size=BATCH_SIZE)
+            terms, genres = [], []
+    MovieTerm.objects.bulk_create(terms, batch_size=BATCH_SIZE)
+    MovieGenre.objects.bulk_create(genres, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre', models.CharField(max_length=255)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genres', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['genre', 'movie'], name='movies_movi_genre_091a6d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'genre'), name='movies_genre_movie_genre')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.TextField()),
+                ('weight', models.FloatField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'movie'], name='movies_movi_token_edb040_idx')],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'token'), name='movies_term_movie_token')],
+            },
+        ),
+        migrations.RunPython(index_existing_movies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:02
+
+from django.db import migrations
+
+
+def create_catalog_state(apps, schema_editor):
+    """Cria a linha única de metadados do catálogo, lida por ``OrmMovieStore.snapshot``"""
+    CatalogState = apps.get_model('movies', 'CatalogState')
+    CatalogState.objects.using(schema_editor.connection.alias).get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_movie_terms_genres'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_catalog_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+from django.db import models
+
+
+class Movie(models.Model):
+    """Filme do catálogo quando MOVIES_STORAGE_BACKEND = 'orm'.
+
+    Os campos seguem o formato de ``convert_omdb_to_movie``; chaves extras
+    gravadas pela API ficam em ``extra``. O id é atribuído pelo store (a partir
+    de ``CatalogState.last_id``) para que ids removidos nunca sejam reutilizados.
+    """
+    id = models.IntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    genre = models.CharField(max_length=255, blank=True, db_index=True)
+    release_year = models.IntegerField(default=0)
+    duration_minutes = models.IntegerField(default=0)
+    rating = models.FloatField(default=0)
+    thumbnail_url = models.TextField(blank=True)
+    video_url = models.TextField(blank=True)
+    is_featured = models.BooleanField(default=False)
+    imdb_id = models.CharField(max_length=20, blank=True, db_index=True)
+    director = models.TextField(blank=True)
+    actors = models.TextField(blank=True)
+    writer = models.TextField(blank=True)
+    language = models.CharField(max_length=255, blank=True)
+    country = models.CharField(max_length=255, blank=True)
+    awards = models.TextField(blank=True)
+    metascore = models.CharField(max_length=20, blank=True)
+    imdb_votes = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    extra = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        # (campo, id) atende aos filtros e à ordenação/paginação por cursor pelo campo
+        indexes = [
+            models.Index(fields=['is_featured', 'id']),
+            models.Index(fields=['release_year', 'id']),
+            models.Index(fields=['rating', 'id']),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class CatalogState(models.Model):
+    """Metadados do catálogo no banco (linha única): os mesmos do snapshot JSON"""
+    last_id = models.IntegerField(default=0)
+    seq = models.IntegerField(default=0)
+    modified_at = models.DateTimeField(null=True, blank=True)
+
+
+class MovieTerm(models.Model):
+    """Token de busca de um filme, com a normalização e o peso do índice em memória (``search.movie_terms``).
+
+    O índice (token, filme) resolve a busca por prefixo como uma faixa de
+    tokens, sem percorrer os textos dos filmes.
+    """
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='terms')
+    token = models.TextField()
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['movie', 'token'], name='movies_term_movie_token')]
+        indexes = [models.Index(fields=['token', 'movie'])]
+
+
+class MovieGenre(models.Model):
+    """Gênero de um filme normalizado como em ``indexes.genre_tokens`` ("Action, Drama" -> action, drama)"""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='genres')
+    genre = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['movie', 'genre'], name='movies_genre_movie_genre')]
+        indexes = [models.Index(fields=['genre', 'movie'])]
@@ -0,0 +1,330 @@
+"""Backend do catálogo no banco de dados (MOVIES_STORAGE_BACKEND = 'orm').
+
+Oferece a mesma interface de ``MovieStore`` / ``CatalogSnapshot``, mas os
+filtros, a contagem e a busca viram consultas indexadas no banco em vez de
+percorrer o catálogo em memória. Gêneros e tokens de busca ficam em tabelas
+próprias (``MovieGenre``, ``MovieTerm``), gravadas junto com cada filme e
+normalizadas como nos índices do backend JSON, para que os dois backends
+devolvam os mesmos filmes na mesma ordem.
+
+Os tokens que começam com um termo são lidos como uma faixa do índice
+(token, filme), o que pressupõe comparação binária de strings: é o padrão
+do SQLite; no PostgreSQL, use um banco com collation "C".
+"""
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+from .conditional import parse_timestamp
+from .indexes import NUMERIC_FIELDS, genre_tokens, numeric_value
+from .metrics import STORE_COMMIT, timed
+from .models import CatalogState, Movie, MovieGenre, MovieTerm
+from .search import PREFIX_FACTOR, movie_terms, tokenize
+from .store import VersionConflict, movie_version
+
+MOVIE_FIELDS = tuple(
+    field.name for field in Movie._meta.concrete_fields if field.name not in ('id', 'extra')
+)
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+# Filmes lidos por consulta ao percorrer resultados grandes (exportação, cursor)
+ITERATOR_CHUNK_SIZE = 2000
+# Maior caractere Unicode: term + TOKEN_END é o limite superior dos tokens que começam com term
+TOKEN_END = '\U0010ffff'
+
+
+def _isoformat(value):
+    return timezone.localtime(value).isoformat() if value else None
+
+
+def movie_to_dict(movie):
+    """Converte a linha do banco no dicionário usado pela API"""
+    data = {'id': movie.id}
+    for name in MOVIE_FIELDS:
+        value = getattr(movie, name)
+        data[name] = _isoformat(value) if name in TIMESTAMP_FIELDS else value
+    data.update(movie.extra or {})
+    return data
+
+
+def dict_to_movie(data, version):
+    """Converte o dicionário da API em uma linha do banco; chaves desconhecidas vão para ``extra``"""
+    movie = Movie(id=data['id'], version=version)
+    for name in MOVIE_FIELDS:
+        if name == 'version':
+            continue
+        value = data.get(name)
+        if name in NUMERIC_FIELDS:
+            value = numeric_value(data, name)
+        elif name in TIMESTAMP_FIELDS:
+            value = parse_timestamp(value)
+        elif name == 'is_featured':
+            value = bool(value)
+        else:
+            value = '' if value is None else str(value)
+        setattr(movie, name, value)
+    movie.extra = {key: value for key, value in data.items() if key not in MOVIE_FIELDS and key != 'id'}
+    return movie
+
+
+def index_rows(movies):
+    """Linhas de ``MovieTerm`` e ``MovieGenre`` dos filmes (dicionários da API)"""
+    terms, genres = [], []
+    for movie in movies:
+        pk = movie['id']
+        terms.extend(MovieTerm(movie_id=pk, token=token, weight=weight) for token, weight in movie_terms(movie).items())
+        genres.extend(MovieGenre(movie_id=pk, genre=genre) for genre in dict.fromkeys(genre_tokens(movie.get('genre'))))
+    return terms, genres
+
+
+def write_index(movies, batch_size=500):
+    """Regrava os tokens de busca e os gêneros dos filmes (chamar na transação que os grava)"""
+    MovieTerm.objects.filter(movie_id__in=[movie['id'] for movie in movies]).delete()
+    MovieGenre.objects.filter(movie_id__in=[movie['id'] for movie in movies]).delete()
+    terms, genres = index_rows(movies)
+    MovieTerm.objects.bulk_create(terms, batch_size=batch_size)
+    MovieGenre.objects.bulk_create(genres, batch_size=batch_size)
+
+
+def _term_matches(term):
+    """Tokens que começam com ``term`` (faixa do índice; ``startswith`` garante o prefixo)"""
+    return MovieTerm.objects.filter(token__gte=term, token__lt=term + TOKEN_END, token__startswith=term)
+
+
+def _search_score(terms):
+    """Soma, por termo, do maior peso entre os tokens do filme que começam com ele (como ``SearchIndex.ranked``)"""
+    score = Value(0.0)
+    for term in terms:
+        factor = Case(When(token=term, then=Value(1.0)), default=Value(PREFIX_FACTOR))
+        best = _term_matches(term).filter(movie=OuterRef('pk')).annotate(score=F('weight') * factor)
+        score = score + Subquery(best.order_by('-score').values('score')[:1], output_field=models.FloatField())
+    return score
+
+
+class OrmResults:
+    """Resultado de ``OrmCatalog.query``: contagem e fatias viram consultas no banco.
+
+    Permite que a paginação por página faça ``COUNT`` + ``LIMIT/OFFSET`` em vez
+    de carregar todos os filmes filtrados.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [movie_to_dict(movie) for movie in self.queryset[item]]
+        return movie_to_dict(self.queryset[item])
+
+    def __iter__(self):
+        return (movie_to_dict(movie) for movie in self.queryset.iterator(ITERATOR_CHUNK_SIZE))
+
+
+class OrmIndex:
+    """Buscas por id e imdb_id, com a mesma interface de ``CatalogIndex``"""
+
+    def get(self, pk):
+        movie = Movie.objects.filter(pk=pk).first()
+        return movie_to_dict(movie) if movie else None
+
+    def get_by_imdb_id(self, imdb_id):
+        if not imdb_id:
+            return None
+        movie = Movie.objects.filter(imdb_id=imdb_id).order_by('-id').first()
+        return movie_to_dict(movie) if movie else None
+
+
+class OrmCatalog:
+    """Visão do catálogo no banco com a interface de ``CatalogSnapshot``.
+
+    Os metadados (``last_id``, ``seq``, ``modified_at``) são lidos na criação;
+    as consultas refletem o banco no momento em que são executadas.
+    """
+
+    def __init__(self, state):
+        self.index = OrmIndex()
+        self.last_id = state.last_id
+        self.seq = state.seq
+        self.modified_at = _isoformat(state.modified_at)
+
+    def __len__(self):
+        return Movie.objects.count()
+
+    def __iter__(self):
+        return (movie_to_dict(movie) for movie in Movie.objects.order_by('id').iterator(ITERATOR_CHUNK_SIZE))
+
+    def meta(self):
+        return {'last_id': self.last_id, 'seq': self.seq, 'modified_at': self.modified_at}
+
+    def _filtered(self, search=None, genre=None, year=None, featured=None, ranges=None):
+        queryset = Movie.objects.all()
+        if genre is not None:
+            if not genre_tokens(genre):
+                return queryset.none(), ()
+            for token in genre_tokens(genre):
+                queryset = queryset.filter(pk__in=MovieGenre.objects.filter(genre=token).values('movie_id'))
+        if year is not None:
+            queryset = queryset.filter(release_year=year)
+        if featured is not None:
+            queryset = queryset.filter(is_featured=bool(featured))
+        for field, (low, high) in (ranges or {}).items():
+            if low is not None:
+                queryset = queryset.filter(**{f'{field}__gte': low})
+            if high is not None:
+                queryset = queryset.filter(**{f'{field}__lte': high})
+        terms = tuple(dict.fromkeys(tokenize(search))) if search else ()
+        if search and not terms:
+            return queryset.none(), ()
+        for term in terms:
+            queryset = queryset.filter(pk__in=_term_matches(term).values('movie_id'))
+        return queryset, terms
+
+    def query(self, **filters):
+        """Filmes que atendem aos filtros, na ordem de ``iter_ordered``, avaliados sob demanda"""
+        queryset, _ = self._ordered(**filters)
+        return OrmResults(queryset)
+
+    def with_imdb_id(self):
+        """Filmes com imdb_id (vindos do OMDB) em ordem de id, paginados no banco"""
+        return OrmResults(Movie.objects.filter(imdb_id__isnull=False).exclude(imdb_id='').order_by('id'))
+
+    def count(self, search=None, genre=None, year=None, featured=None, ranges=None, ordering=None):
+        queryset, _ = self._filtered(search, genre, year, featured, ranges)
+        return queryset.count()
+
+    def _ordered(self, search=None, genre=None, year=None, featured=None, ranges=None, ordering=None, after=None):
+        """Retorna (queryset ordenado a partir de ``after``, função que dá a chave de cada linha)"""
+        queryset, terms = self._filtered(search, genre, year, featured, ranges)
+        if terms and not ordering:
+            # Relevância: chave (-pontuação, id)
+            queryset = queryset.annotate(score=_search_score(terms))
+            if after is not None:
+                queryset = queryset.filter(Q(score__lt=-after[0]) | Q(score=-after[0], id__gt=after[1]))
+            return queryset.order_by('-score', 'id'), lambda movie: (-movie.score, movie.id)
+
+        ordering = ordering or 'id'
+        field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+        if after is not None:
+            value, pk = after
+            if descending:
+                queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}))
+            else:
+                queryset = queryset.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk}))
+        order = ('-' if descending else '') + field
+        order_by = (order,) if field == 'id' else (order, '-id' if descending else 'id')
+        return queryset.order_by(*order_by), lambda movie: (getattr(movie, field), movie.id)
+
+    def iter_ordered(self, **filters):
+        """Gera (chave, filme) na mesma ordem e com as mesmas chaves de ``CatalogSnapshot.iter_ordered``"""
+        queryset, key = self._ordered(**filters)
+        for movie in queryset.iterator(ITERATOR_CHUNK_SIZE):
+            yield key(movie), movie_to_dict(movie)
+
+
+class OrmMovieStore:
+    """Store do catálogo no banco, com a interface de ``MovieStore``.
+
+    Cada gravação roda em uma transação que começa incrementando
+    ``CatalogState.seq``: isso trava a linha de metadados (e, no SQLite, o
+    banco) antes de qualquer leitura, serializando as gravações entre
+    processos como o lock de arquivo do backend JSON.
+    """
+
+    def _state(self):
+        """Metadados do catálogo; a linha é criada pela migração (ou pela primeira gravação)"""
+        try:
+            return CatalogState.objects.get(pk=1)
+        except CatalogState.DoesNotExist:
+            return CatalogState(pk=1)
+
+    def snapshot(self):
+        return OrmCatalog(self._state())
+
+    def transact(self, build):
+        """Executa ``build(catálogo) -> (puts, deletes)`` e grava o lote em uma transação"""
+        with transaction.atomic():
+            if not CatalogState.objects.filter(pk=1).update(seq=F('seq') + 1):
+                CatalogState.objects.get_or_create(pk=1)
+                CatalogState.objects.filter(pk=1).update(seq=F('seq') + 1)
+            state = CatalogState.objects.get(pk=1)
+            puts, deletes = build(OrmCatalog(state))
+            if puts or deletes:
+                return self._commit(state, puts, deletes)
+            # Nada a gravar: desfaz o incremento de seq
+            transaction.set_rollback(True)
+        return self.snapshot()
+
+    @timed(STORE_COMMIT)
+    def _commit(self, state, puts, deletes):
+        """Grava o lote e atualiza os metadados (chamar dentro de ``transact``)"""
+        puts = list({movie['id']: movie for movie in puts}.values())
+        versions = dict(Movie.objects.filter(pk__in=[movie['id'] for movie in puts]).values_list('id', 'version'))
+        rows = [
+            dict_to_movie(movie, versions[movie['id']] + 1 if movie['id'] in versions else 1)
+            for movie in puts
+        ]
+        Movie.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True, unique_fields=['id'],
+            update_fields=[*MOVIE_FIELDS, 'extra'],
+        )
+        write_index(puts)
+        if deletes:
+            Movie.objects.filter(pk__in=list(deletes)).delete()
+        state.last_id = max([state.last_id] + [movie['id'] for movie in puts])
+        state.modified_at = timezone.now()
+        state.save(update_fields=['last_id', 'modified_at'])
+        return OrmCatalog(state)
+
+    def _checked(self, current, pk, expected_versions):
+        movie = current.index.get(pk)
+        if movie is None:
+            raise KeyError(pk)
+        if expected_versions is not None and movie_version(movie) not in expected_versions:
+            raise VersionConflict(movie)
+        return movie
+
+    def save(self, movies):
+        """Grava o catálogo completo, escrevendo apenas o que mudou"""
+        def build(current):
+            existing = {movie['id']: movie for movie in current}
+            movies_by_id = {movie['id']: movie for movie in movies if movie.get('id') is not None}
+            puts = [movie for pk, movie in movies_by_id.items() if existing.get(pk) != movie]
+            return puts, [pk for pk in existing if pk not in movies_by_id]
+        return self.transact(build)
+
+    def create(self, movie):
+        """Atribui o próximo id ao filme, grava e retorna o filme criado"""
+        pk = None
+
+        def build(current):
+            nonlocal pk
+            pk = current.last_id + 1
+            return [{**movie, 'id': pk}], []
+        return self.transact(build).index.get(pk)
+
+    def update(self, pk, change, expected_versions=None):
+        """Aplica ``change(filme) -> novo filme`` sobre a versão mais recente e retorna o resultado"""
+        def build(current):
+            movie = self._checked(current, pk, expected_versions)
+            return [{**change(movie), 'id': pk}], []
+        return self.transact(build).index.get(pk)
+
+    def put(self, movie):
+        return self.apply(puts=[movie])
+
+    def delete(self, pk, expected_versions=None):
+        def build(current):
+            self._checked(current, pk, expected_versions)
+            return [], [pk]
+        return self.transact(build)
+
+    def apply(self, puts=(), deletes=()):
+        return self.transact(lambda current: (list(puts), list(deletes)))
@@ -0,0 +1,75 @@
+"""Paginação por cursor (keyset) sobre o catálogo em memória"""
+import base64
+import json
+from itertools import islice
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .metrics import PAGINATE_DURATION, timed
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def wants_count(request):
+    """``?count=false`` dispensa o total de resultados"""
+    return request.query_params.get('count', 'true').lower() not in ('false', '0', 'no')
+
+
+def encode_cursor(ordering, key):
+    """Cursor da chave (valor, id); o valor vai sempre como float, o mesmo cursor qualquer que seja o índice usado"""
+    value, pk = key
+    payload = json.dumps({'o': ordering or '', 'k': [float(value), pk]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    """Retorna a chave (valor, id) do cursor, ou None para a primeira página"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, pk = payload['k']
+        if payload['o'] != (ordering or '') or not isinstance(pk, int):
+            raise ValueError
+        return float(value), pk
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('cursor inválido para esta consulta')
+
+
+def page_size(request):
+    try:
+        size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+@timed(PAGINATE_DURATION)
+def cursor_paginate_response(snapshot, filters, request, project=None):
+    """Página seguinte ao ``?cursor=`` na ordem (chave de ordenação, id).
+
+    Percorre o catálogo só até encontrar ``page_size + 1`` resultados, e os
+    resultados não se deslocam quando filmes são inseridos entre as páginas.
+    """
+    ordering = filters.get('ordering')
+    after = decode_cursor(request.query_params.get('cursor'), ordering)
+    size = page_size(request)
+    page = list(islice(snapshot.iter_ordered(after=after, **filters), size + 1))
+
+    next_url = None
+    if len(page) > size:
+        page = page[:size]
+        next_url = replace_query_param(
+            request.build_absolute_uri(), 'cursor', encode_cursor(ordering, page[-1][0]),
+        )
+    data = {}
+    if wants_count(request):
+        data['count'] = snapshot.count(**filters)
+    data['next'] = next_url
+    data['results'] = [project(movie) if project else movie for _, movie in page]
+    return Response(data)
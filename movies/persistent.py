@@ -0,0 +1,92 @@
+"""Mapeamentos imutáveis que compartilham a estrutura entre versões do catálogo.
+
+Cada gravação publica um novo snapshot; copiar os dicionários do catálogo
+inteiro a cada lote tornaria uma gravação de um filme O(N). Aqui as chaves
+ficam distribuídas por hash entre cerca de √N dicionários (fatias) e
+``updated`` copia só a lista de fatias e as fatias alteradas: O(√N) por
+gravação, e a leitura custa uma indexação a mais que a de um ``dict``.
+"""
+from itertools import chain
+
+# Fatias por chave: o número de fatias acompanha √N e é refeito quando o mapeamento cresce 4x
+MIN_SHARDS = 8
+
+
+def shard_count(size):
+    """Menor potência de 2 que não é menor que √size (e não menor que MIN_SHARDS)"""
+    return max(MIN_SHARDS, 1 << (max(size, 1).bit_length() + 1) // 2)
+
+
+class PersistentMap:
+    """Mapeamento imutável chave -> valor; ``updated`` devolve uma nova versão.
+
+    A ordem de iteração é a das fatias, não a de inserção.
+    """
+
+    __slots__ = ('shards', 'mask', 'size')
+
+    def __init__(self, items=()):
+        items = items if isinstance(items, dict) else dict(items)
+        count = shard_count(len(items))
+        shards = [{} for _ in range(count)]
+        mask = count - 1
+        for key, value in items.items():
+            shards[hash(key) & mask][key] = value
+        self.shards = shards
+        self.mask = mask
+        self.size = len(items)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.shards)
+
+    def __contains__(self, key):
+        return key in self.shards[hash(key) & self.mask]
+
+    def __getitem__(self, key):
+        return self.shards[hash(key) & self.mask][key]
+
+    def get(self, key, default=None):
+        return self.shards[hash(key) & self.mask].get(key, default)
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return chain.from_iterable(shard.values() for shard in self.shards)
+
+    def items(self):
+        return chain.from_iterable(shard.items() for shard in self.shards)
+
+    def updated(self, changes=None, removed=()):
+        """Nova versão sem as chaves ``removed`` e com ``changes`` ({chave: valor}) gravadas"""
+        if not changes and not removed:
+            return self
+        shards = list(self.shards)
+        mask, size = self.mask, self.size
+        copied = set()
+
+        def writable(key):
+            position = hash(key) & mask
+            if position not in copied:
+                shards[position] = dict(shards[position])
+                copied.add(position)
+            return shards[position]
+
+        for key in removed:
+            if key in shards[hash(key) & mask]:
+                del writable(key)[key]
+                size -= 1
+        for key, value in (changes or {}).items():
+            shard = writable(key)
+            if key not in shard:
+                size += 1
+            shard[key] = value
+        result = PersistentMap.__new__(PersistentMap)
+        result.shards, result.mask, result.size = shards, mask, size
+        if shard_count(size) > 2 * len(shards):
+            # Cresceu 4x desde a última divisão: redistribui em mais fatias (custo amortizado)
+            return PersistentMap(dict(result.items()))
+        return result
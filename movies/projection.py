@@ -0,0 +1,82 @@
+"""Projeção de campos (``?fields=`` / ``?exclude=``) e representação compacta dos filmes"""
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from .store import movie_version
+
+# Campos da representação compacta ("card") usada pelas listas dos clientes
+CARD_FIELDS = ('id', 'title', 'thumbnail_url', 'rating', 'release_year', 'genre')
+REPRESENTATIONS = ('full', 'card')
+# Quantidade de cards mantidos em memória (LRU)
+CARD_CACHE_SIZE = getattr(settings, 'MOVIES_CARD_CACHE_SIZE', 100000)
+
+_cards = OrderedDict()
+_cards_lock = threading.Lock()
+
+
+class InvalidProjection(ValueError):
+    pass
+
+
+def movie_card(movie):
+    """Card do filme, calculado uma vez por versão e reaproveitado entre requisições"""
+    key = (movie.get('id'), movie_version(movie), movie.get('updated_at'))
+    with _cards_lock:
+        card = _cards.get(key)
+        if card is not None:
+            _cards.move_to_end(key)
+            return card
+    card = {field: movie[field] for field in CARD_FIELDS if field in movie}
+    with _cards_lock:
+        _cards[key] = card
+        if len(_cards) > CARD_CACHE_SIZE:
+            _cards.popitem(last=False)
+    return card
+
+
+def _field_list(value):
+    if not value:
+        return ()
+    return tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+
+
+class Projection:
+    """Seleciona a representação (``full`` ou ``card``) e os campos de cada filme"""
+
+    def __init__(self, view='full', fields=(), exclude=()):
+        self.card = view == 'card'
+        self.fields = fields
+        self.exclude = frozenset(exclude)
+
+    def __call__(self, movie):
+        if self.card:
+            movie = movie_card(movie)
+        if self.fields:
+            return {field: movie[field] for field in self.fields if field in movie}
+        if self.exclude:
+            return {key: value for key, value in movie.items() if key not in self.exclude}
+        return movie
+
+    def columns(self, default):
+        """Colunas resultantes para formatos tabulares, partindo de ``default``"""
+        if self.fields:
+            return self.fields
+        base = CARD_FIELDS if self.card else default
+        return tuple(field for field in base if field not in self.exclude)
+
+
+def parse_projection(params):
+    """Retorna a ``Projection`` pedida em ``?view=`` / ``?fields=`` / ``?exclude=``, ou None.
+
+    Levanta ``InvalidProjection`` para valores inválidos.
+    """
+    view = params.get('view') or 'full'
+    if view not in REPRESENTATIONS:
+        raise InvalidProjection(f'view deve ser um de: {", ".join(REPRESENTATIONS)}')
+    fields = _field_list(params.get('fields'))
+    exclude = _field_list(params.get('exclude'))
+    if fields and exclude:
+        raise InvalidProjection('Use fields ou exclude, não os dois')
+    if view == 'full' and not fields and not exclude:
+        return None
+    return Projection(view, fields, exclude)
@@ -0,0 +1,87 @@
+"""Renderização das respostas com fragmentos JSON pré-serializados dos filmes.
+
+Os filmes publicados no catálogo são imutáveis, então o JSON de cada um é
+gerado uma vez por versão e guardado como bytes; as respostas de listagem
+apenas concatenam esses fragmentos. Nos layouts colunar e compartilhado os
+fragmentos vêm do próprio catálogo (``by_id.fragment``), pois os dicionários
+dos filmes são montados a cada leitura e não servem de chave.
+"""
+import threading
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from .encoding import dumps
+from .metrics import RENDER_DURATION, RENDERED_BYTES, Gauge, timed
+from .store import get_store
+
+# Quantidade de fragmentos de filmes mantidos em memória (LRU)
+FRAGMENT_CACHE_SIZE = getattr(settings, 'MOVIES_FRAGMENT_CACHE_SIZE', 100000)
+
+# id(filme) -> (filme, fragmento); a referência ao filme impede que o id seja reaproveitado
+_fragments = {}
+_fragments_lock = threading.Lock()
+
+Gauge('movies_fragment_cache_entries', 'Fragmentos JSON de filmes em memória', lambda: len(_fragments))
+
+
+def movie_fragment(movie):
+    """JSON do filme, gerado uma vez por objeto publicado e reaproveitado entre respostas.
+
+    Os filmes do snapshot nunca são alterados (uma gravação publica um novo
+    objeto), então o próprio objeto identifica a versão serializada.
+    """
+    entry = _fragments.get(id(movie))
+    if entry is not None and entry[0] is movie:
+        return entry[1]
+    fragment = dumps(movie)
+    with _fragments_lock:
+        _fragments[id(movie)] = (movie, fragment)
+        if len(_fragments) > FRAGMENT_CACHE_SIZE:
+            # Descarta os fragmentos mais antigos (ordem de inserção)
+            del _fragments[next(iter(_fragments))]
+    return fragment
+
+
+def catalog_fragment(value, by_id):
+    """Fragmento de ``value`` se ele é o próprio filme publicado no catálogo, senão None"""
+    pk = value.get('id')
+    if not isinstance(pk, int) or by_id.get(pk) is not value:
+        return None
+    fragment = getattr(by_id, 'fragment', None)
+    return (fragment and fragment(pk)) or movie_fragment(value)
+
+
+def encode(value, by_id=None):
+    """Serializa ``value`` reaproveitando os fragmentos dos filmes do catálogo.
+
+    Percorre apenas listas e dicionários de envelope (paginação, resultados);
+    um filme que não é o objeto publicado no snapshot (por exemplo, uma
+    projeção) é serializado inteiro de uma vez.
+    """
+    if by_id is None:
+        # O backend ORM não mantém filmes publicados em memória: tudo é serializado
+        by_id = getattr(get_store().snapshot().index, 'by_id', {})
+    if isinstance(value, dict):
+        if 'id' in value:
+            return catalog_fragment(value, by_id) or dumps(value)
+        return b'{' + b','.join(
+            dumps(str(key)) + b':' + encode(item, by_id) for key, item in value.items()
+        ) + b'}'
+    if isinstance(value, (list, tuple)):
+        return b'[' + b','.join(encode(item, by_id) for item in value) + b']'
+    return dumps(value)
+
+
+class CatalogJSONRenderer(JSONRenderer):
+    """JSONRenderer compacto que copia os fragmentos já serializados dos filmes.
+
+    ``renderer_context['catalog_by_id']`` informa os filmes publicados (evita
+    consultar o store, como nas views assíncronas).
+    """
+
+    @timed(RENDER_DURATION)
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        content = encode(data, (renderer_context or {}).get('catalog_by_id'))
+        RENDERED_BYTES.labels().inc(len(content))
+        return content
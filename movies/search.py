@@ -0,0 +1,174 @@
+"""Índice invertido de texto completo para o parâmetro ``search``"""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from heapq import merge
+from math import isqrt
+from .persistent import PersistentMap
+
+# Peso de cada campo no ranking: acertos no título valem mais que na sinopse
+FIELD_WEIGHTS = (
+    ('title', 10.0),
+    ('director', 3.0),
+    ('actors', 2.0),
+    ('description', 1.0),
+)
+# Fator aplicado quando o termo da busca é apenas prefixo do token indexado
+PREFIX_FACTOR = 0.5
+# Tokens novos ou removidos acumulados até o vocabulário ser refeito (ou √ do vocabulário, se maior)
+MERGE_THRESHOLD = 64
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def fold(text):
+    """Remove acentos e converte para minúsculas ("Ação" -> "acao")"""
+    text = str(text)
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """Quebra o texto em tokens normalizados"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(fold(text))
+
+
+def movie_terms(movie):
+    """Retorna {token: peso} de um filme somando o peso dos campos onde aparece"""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS:
+        for token in set(tokenize(movie.get(field))):
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+def term_changes(removed, added):
+    """{token: {id: novo peso, ou None se o filme saiu do token}} apenas com os pesos que mudam"""
+    before, after = {}, {}
+    for terms, movies in ((before, removed), (after, added)):
+        for movie in movies:
+            pk = movie.get('id')
+            if pk is not None:
+                for token, weight in movie_terms(movie).items():
+                    terms[token, pk] = weight
+    changes = {}
+    for token, pk in before.keys() - after.keys():
+        changes.setdefault(token, {})[pk] = None
+    for (token, pk), weight in after.items():
+        if before.get((token, pk)) != weight:
+            changes.setdefault(token, {})[pk] = weight
+    return changes
+
+
+class SearchIndex:
+    """Índice invertido token -> {id do filme: peso} com busca por prefixo.
+
+    Instâncias são imutáveis: ``updated`` devolve um novo índice que
+    compartilha com este as postagens dos tokens não alterados, de modo que
+    requisições em andamento continuam usando a versão anterior.
+
+    O vocabulário ordenado só é refeito de tempos em tempos: os tokens novos
+    ficam em ``fresh`` (também ordenada) e os que perderam todos os filmes
+    continuam em ``vocabulary`` (``stale`` conta quantos) até a próxima vez.
+    """
+
+    def __init__(self, movies=()):
+        postings = {}
+        for movie in movies:
+            pk = movie.get('id')
+            if pk is None:
+                continue
+            for token, weight in movie_terms(movie).items():
+                postings.setdefault(token, {})[pk] = weight
+        self.postings = PersistentMap(postings)
+        self.vocabulary = sorted(postings)
+        self.fresh = []
+        self.stale = 0
+
+    def updated(self, removed=(), added=()):
+        """Retorna um novo índice sem os filmes ``removed`` e com os ``added``"""
+        changed, dropped, new_tokens = {}, [], []
+        for token, delta in term_changes(removed, added).items():
+            current = self.postings.get(token)
+            postings = dict(current or {})
+            for pk, weight in delta.items():
+                if weight is None:
+                    postings.pop(pk, None)
+                else:
+                    postings[pk] = weight
+            if postings:
+                changed[token] = postings
+                if not current:
+                    new_tokens.append(token)
+            elif current:
+                dropped.append(token)
+
+        vocabulary, fresh, stale = self.vocabulary, self.fresh, self.stale
+        if dropped or new_tokens:
+            fresh = list(fresh)
+            for token in dropped:
+                position = bisect_left(vocabulary, token)
+                if position < len(vocabulary) and vocabulary[position] == token:
+                    stale += 1
+                else:
+                    del fresh[bisect_left(fresh, token)]
+            for token in new_tokens:
+                position = bisect_left(vocabulary, token)
+                if position < len(vocabulary) and vocabulary[position] == token:
+                    stale -= 1
+                else:
+                    insort(fresh, token)
+
+        index = SearchIndex.__new__(SearchIndex)
+        index.postings = postings = self.postings.updated(changed, dropped)
+        if len(fresh) + stale > max(MERGE_THRESHOLD, isqrt(len(vocabulary))):
+            # O timsort intercala as duas sequências já ordenadas em tempo linear
+            vocabulary = [token for token in vocabulary if token in postings] if stale else list(vocabulary)
+            vocabulary.extend(fresh)
+            vocabulary.sort()
+            fresh, stale = [], 0
+        index.vocabulary, index.fresh, index.stale = vocabulary, fresh, stale
+        return index
+
+    def terms(self):
+        """Gera (token, {id do filme: peso}) em ordem alfabética dos tokens"""
+        for token in merge(self.vocabulary, self.fresh):
+            postings = self.postings.get(token)
+            if postings:
+                yield token, postings
+
+    def _expand(self, term):
+        """Retorna {id: peso} dos filmes com algum token que começa com ``term``"""
+        scores = {}
+        for vocabulary in (self.vocabulary, self.fresh):
+            for position in range(bisect_left(vocabulary, term), len(vocabulary)):
+                token = vocabulary[position]
+                if not token.startswith(term):
+                    break
+                factor = 1.0 if token == term else PREFIX_FACTOR
+                for pk, weight in self.postings.get(token, {}).items():
+                    score = weight * factor
+                    if score > scores.get(pk, 0.0):
+                        scores[pk] = score
+        return scores
+
+    def ranked(self, query):
+        """Retorna [(id, pontuação)] dos filmes que contêm todos os termos, do mais relevante ao menos"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = sorted((self._expand(term) for term in dict.fromkeys(terms)), key=len)
+        totals = dict(matches[0])
+        for scores in matches[1:]:
+            totals = {pk: total + scores[pk] for pk, total in totals.items() if pk in scores}
+            if not totals:
+                return []
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+    def search(self, query):
+        """Retorna ids dos filmes que contêm todos os termos, do mais relevante ao menos"""
+        return [pk for pk, _ in self.ranked(query)]
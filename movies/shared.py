@@ -0,0 +1,487 @@
+"""Imagem binária do catálogo compartilhada entre os processos do servidor (MOVIES_SHARED_SNAPSHOT).
+
+O catálogo e seus índices são gravados em ``<snapshot JSON>.image``: o JSON
+de cada filme, ids e colunas numéricas em arrays (ordenadas por valor e
+também na ordem dos ids, para ler o valor de um filme sem decodificar o
+JSON), listas de postagem, imdb_ids e o índice de busca. Cada worker mapeia o arquivo com ``mmap``
+(somente leitura) e consulta as seções direto das páginas mapeadas, que o
+sistema operacional compartilha entre os processos. Só as alterações ainda
+não compactadas (os lotes do log de mutações) ficam na memória de cada worker.
+
+A imagem guarda a assinatura (inode, tamanho, mtime) e o checksum do
+snapshot JSON de que foi gerada e é publicada junto com cada compactação: a
+nova geração substitui o arquivo com ``os.replace`` e os workers a mapeiam
+na recarga seguinte, enquanto as requisições em andamento continuam lendo o
+mapeamento anterior. Quando só a assinatura difere (JSON copiado em um
+deploy ou restaurado de backup), o checksum confirma que a imagem ainda vale
+e ela é reaproveitada sem reler o catálogo.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import chain
+from .columnar import ColumnarCatalog, MovieColumns
+from .encoding import dumps, loads
+from .indexes import CatalogIndex, SortedColumn
+from .journal import fsync_directory
+from .persistent import PersistentMap
+from .search import PREFIX_FACTOR, SearchIndex, term_changes
+
+MAGIC = b'MOVIMG01'
+VERSION = 3
+# Rodapé: posição e tamanho do cabeçalho JSON, assinatura do snapshot JSON de origem e MAGIC
+FOOTER = struct.Struct('<5q8s')
+SIGNATURE = struct.Struct('<3q')
+SIGNATURE_OFFSET = 16
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+def checksum(data):
+    """Checksum do conteúdo de um snapshot JSON"""
+    return 'blake2b:' + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_checksum(path):
+    """Checksum do arquivo em ``path`` (lido em blocos) ou None se ele não existe"""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(CHECKSUM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return 'blake2b:' + digest.hexdigest()
+
+
+class ImageWriter:
+    """Grava as seções da imagem em sequência, alinhadas a 8 bytes"""
+
+    def __init__(self, file):
+        self.file = file
+        self.sections = {}
+        self._current = None
+        file.write(MAGIC)
+
+    def begin(self, name, typecode=None):
+        self.file.write(b'\0' * (-self.file.tell() % 8))
+        self._current = (name, self.file.tell(), typecode)
+
+    def write(self, data):
+        self.file.write(data)
+
+    def end(self):
+        name, offset, typecode = self._current
+        self.sections[name] = [offset, self.file.tell() - offset, typecode]
+
+    def section(self, name, data, typecode=None):
+        self.begin(name, typecode)
+        self.write(data)
+        self.end()
+
+    def strings(self, name, values):
+        """Seção com as strings em UTF-8 e ``<name>.offsets`` com o início de cada uma"""
+        offsets = array('q', [0])
+        self.begin(name)
+        for value in values:
+            if not isinstance(value, str):
+                raise TypeError(f'A imagem só guarda strings em {name}: {value!r}')
+            data = value.encode('utf-8')
+            self.write(data)
+            offsets.append(offsets[-1] + len(data))
+        self.end()
+        self.section(f'{name}.offsets', offsets, 'q')
+
+
+def movie_fragments(by_id):
+    """JSON de cada filme em ordem de id; os que vêm de uma imagem são copiados sem reserializar"""
+    columns = getattr(by_id, 'columns', None)
+    if not isinstance(columns, ImageColumns):
+        for movie in by_id.values():
+            yield dumps(movie)
+        return
+    for pk in by_id:
+        movie = by_id.changed.get(pk)
+        yield dumps(movie) if movie is not None else columns.fragment(columns.row(pk))
+
+
+def row_values(ids, column):
+    """Valores de ``column`` na ordem de ``ids`` (a coluna ordenada, reorganizada por filme)"""
+    values = array('d', bytes(8 * len(ids)))
+    for value, pk in zip(column.values, column.ids):
+        values[bisect_left(ids, pk)] = value
+    return values
+
+
+def write_image(path, snapshot, source_checksum=None):
+    """Grava a imagem de ``snapshot`` em ``path``, ainda sem a assinatura de origem (ver ``seal_image``).
+
+    ``source_checksum`` é o checksum do snapshot JSON com o mesmo conteúdo.
+    """
+    index, search_index = snapshot.index, snapshot.search_index
+    header = {
+        'version': VERSION, **snapshot.meta(), 'source_checksum': source_checksum,
+        'postings': {}, 'columns': list(index.columns),
+    }
+    try:
+        with open(path, 'wb') as file:
+            writer = ImageWriter(file)
+            movie_ids = array('q', index.by_id)
+            writer.section('ids', movie_ids, 'q')
+            offsets = array('q', [0])
+            writer.begin('movies')
+            for fragment in movie_fragments(index.by_id):
+                writer.write(fragment)
+                offsets.append(offsets[-1] + len(fragment))
+            writer.end()
+            writer.section('movies.offsets', offsets, 'q')
+
+            for name in CatalogIndex.POSTING_TABLES:
+                entries, ids = [], array('q')
+                for key, posting in getattr(index, name).items():
+                    entries.append([key, len(ids), len(ids) + len(posting)])
+                    ids.extend(sorted(posting))
+                writer.section(f'postings.{name}', ids, 'q')
+                header['postings'][name] = entries
+            for field, column in index.columns.items():
+                column = column.compacted()
+                writer.section(f'columns.{field}.values', column.values, 'd')
+                writer.section(f'columns.{field}.ids', column.ids, 'q')
+                writer.section(f'columns.{field}.rows', row_values(movie_ids, column), 'd')
+
+            imdb = sorted(index.by_imdb_id.items())
+            writer.strings('imdb', (key for key, _ in imdb))
+            writer.section('imdb.ids', array('q', (pk for _, pk in imdb)), 'q')
+
+            # Termos da busca: ids e pesos de cada token em seções paralelas
+            writer.strings('terms', (token for token, _ in search_index.terms()))
+            term_offsets = array('q', [0])
+            writer.begin('terms.ids', 'q')
+            for _, postings in search_index.terms():
+                writer.write(array('q', sorted(postings)))
+                term_offsets.append(term_offsets[-1] + len(postings))
+            writer.end()
+            writer.begin('terms.weights', 'd')
+            for _, postings in search_index.terms():
+                writer.write(array('d', (postings[pk] for pk in sorted(postings))))
+            writer.end()
+            writer.section('terms.positions', term_offsets, 'q')
+
+            header['sections'] = writer.sections
+            encoded = dumps(header)
+            header_offset = file.tell()
+            file.write(encoded)
+            file.write(FOOTER.pack(header_offset, len(encoded), 0, 0, 0, MAGIC))
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return path
+
+
+def sign_image(path, base_signature):
+    """Grava no rodapé da imagem a assinatura do snapshot JSON de origem"""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.lseek(fd, os.fstat(fd).st_size - FOOTER.size + SIGNATURE_OFFSET, os.SEEK_SET)
+        os.write(fd, SIGNATURE.pack(*base_signature))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def seal_image(tmp_path, path, base_signature):
+    """Registra a assinatura do snapshot JSON de origem e publica a imagem atomicamente"""
+    sign_image(tmp_path, base_signature)
+    os.replace(tmp_path, path)
+    fsync_directory(os.path.dirname(path) or '.')
+
+
+def publish_image(path, snapshot, base_signature, source_checksum=None):
+    """Grava e publica a imagem de ``snapshot``, gerado do snapshot JSON com ``base_signature``"""
+    tmp_path = write_image(f'{path}.{os.getpid()}.tmp', snapshot, source_checksum)
+    try:
+        seal_image(tmp_path, path, base_signature)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def open_image(path, base_signature, source_checksum=None):
+    """Mapeia a imagem em ``path`` se ela foi gerada do snapshot JSON com ``base_signature``, senão None.
+
+    Com ``source_checksum``, uma imagem de assinatura diferente também é
+    aceita se foi gerada de um JSON com esse checksum (ver ``sign_image``).
+    """
+    if base_signature is None:
+        return None
+    try:
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < len(MAGIC) + FOOTER.size:
+                return None
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    header_offset, header_length, *signature, magic = FOOTER.unpack_from(buffer, size - FOOTER.size)
+    if magic != MAGIC or buffer[:len(MAGIC)] != MAGIC:
+        buffer.close()
+        return None
+    if tuple(signature) != tuple(base_signature) and source_checksum is None:
+        buffer.close()
+        return None
+    header = read_header(buffer, header_offset, header_length, size - FOOTER.size)
+    if header is None or (
+            tuple(signature) != tuple(base_signature) and header.get('source_checksum') != source_checksum):
+        buffer.close()
+        return None
+    return CatalogImage(buffer, header)
+
+
+def read_header(buffer, offset, length, end):
+    """Cabeçalho da imagem se ele é da versão atual e suas seções cabem no arquivo, senão None.
+
+    Uma imagem truncada ou corrompida é tratada como ausente (o worker segue
+    pelo JSON) em vez de interromper a partida do processo.
+    """
+    if not 0 <= offset <= offset + length <= end:
+        return None
+    try:
+        header = loads(buffer[offset:offset + length])
+    except ValueError:
+        return None
+    if not isinstance(header, dict) or header.get('version') != VERSION:
+        return None
+    try:
+        for start, size, typecode in header['sections'].values():
+            if not 0 <= start <= start + size <= offset or size % array(typecode or 'B').itemsize:
+                return None
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return header
+
+
+class CatalogImage:
+    """Imagem mapeada em memória; as seções são memoryviews sobre o mapeamento (sem cópia)"""
+
+    def __init__(self, buffer, header):
+        self.header = header
+        self.view = memoryview(buffer)
+
+    def section(self, name):
+        offset, length, typecode = self.header['sections'][name]
+        view = self.view[offset:offset + length]
+        return view.cast(typecode) if typecode else view
+
+    def strings(self, name):
+        return StringTable(self.section(name), self.section(f'{name}.offsets'))
+
+    def catalog(self):
+        """Retorna (índice, índice de busca) lendo as seções da imagem"""
+        index = CatalogIndex.__new__(CatalogIndex)
+        index.by_id = ColumnarCatalog(columns=ImageColumns(self, {
+            field: self.section(f'columns.{field}.rows') for field in self.header['columns']
+        }))
+        index.by_imdb_id = ImageLookup(self.strings('imdb'), self.section('imdb.ids'))
+        for name, entries in self.header['postings'].items():
+            ids = self.section(f'postings.{name}')
+            setattr(index, name, {key: ids[start:stop] for key, start, stop in entries})
+        index.columns = {}
+        for field in self.header['columns']:
+            column = index.columns[field] = SortedColumn.__new__(SortedColumn)
+            column.values = self.section(f'columns.{field}.values')
+            column.ids = self.section(f'columns.{field}.ids')
+        search_index = MappedSearchIndex(
+            self.strings('terms'), self.section('terms.positions'),
+            self.section('terms.ids'), self.section('terms.weights'),
+        )
+        return index, search_index
+
+
+class StringTable:
+    """Sequência ordenada de strings guardadas em UTF-8 na imagem"""
+
+    __slots__ = ('blob', 'offsets')
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return str(self.blob[self.offsets[position]:self.offsets[position + 1]], 'utf-8')
+
+    def find(self, value):
+        """Posição de ``value`` ou -1"""
+        position = bisect_left(self, value)
+        return position if position < len(self) and self[position] == value else -1
+
+
+class ImageColumns(MovieColumns):
+    """Filmes de uma imagem: ids mapeados e o JSON de cada filme, decodificado na leitura.
+
+    ``numbers`` traz as colunas numéricas na ordem dos ids, usadas na ordenação
+    sem decodificar o filme.
+    """
+
+    def __init__(self, image, numbers=None):
+        self.ids = image.section('ids')
+        self.numbers = numbers or {}
+        self.offsets = image.section('movies.offsets')
+        self.blob = image.section('movies')
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def fragment(self, row):
+        """JSON do filme na posição ``row``, como gravado na imagem"""
+        return bytes(self.blob[self.offsets[row]:self.offsets[row + 1]])
+
+    def materialize(self, row):
+        return loads(self.fragment(row))
+
+    def matches(self, row, movie):
+        # Compara o JSON gravado, sem decodificá-lo; 8 e 8.0 contam como diferentes (regravação inofensiva)
+        return self.fragment(row) == dumps(movie)
+
+    def value(self, row, field, default=None):
+        movie = self._cache.get(row)
+        return (movie if movie is not None else self.materialize(row)).get(field, default)
+
+    def number(self, row, field):
+        numbers = self.numbers.get(field)
+        return numbers[row] if numbers is not None else self.value(row, field, 0)
+
+
+class ImageLookup:
+    """imdb_id -> id dos filmes da imagem; alterações posteriores ficam em ``changes`` (None: removido).
+
+    ``changes`` é um ``PersistentMap``, compartilhado entre as versões.
+    """
+
+    __slots__ = ('strings', 'ids', 'changes')
+
+    def __init__(self, strings, ids, changes=None):
+        self.strings = strings
+        self.ids = ids
+        self.changes = PersistentMap() if changes is None else changes
+
+    def get(self, key, default=None):
+        if key in self.changes:
+            pk = self.changes[key]
+            return default if pk is None else pk
+        position = self.strings.find(key) if isinstance(key, str) else -1
+        return default if position < 0 else self.ids[position]
+
+    def updated(self, changes=None, removed=()):
+        """Nova versão com os imdb_id de ``changes`` ({imdb_id: id}) gravados e os de ``removed`` removidos"""
+        return ImageLookup(self.strings, self.ids, self.changes.updated(
+            {**dict.fromkeys(removed), **(changes or {})},
+        ))
+
+    def keys(self):
+        return (key for key, _ in self.items())
+
+    def items(self):
+        """Gera (imdb_id, id) em ordem de imdb_id"""
+        def base():
+            for position in range(len(self.strings)):
+                key = self.strings[position]
+                if key not in self.changes:
+                    yield key, self.ids[position]
+        changed = sorted((key, pk) for key, pk in self.changes.items() if pk is not None)
+        return merge(base(), changed)
+
+
+def add_scores(scores, postings, factor):
+    """Mantém em ``scores`` a maior pontuação de cada filme de ``postings`` ((id, peso))"""
+    for pk, weight in postings:
+        score = weight * factor
+        if score > scores.get(pk, 0.0):
+            scores[pk] = score
+
+
+class MappedSearchIndex(SearchIndex):
+    """Índice de busca lido da imagem.
+
+    Alterações posteriores à imagem ficam em ``overrides``: para os tokens
+    da imagem, só o delta (token -> {id: peso, ou None se o filme saiu}),
+    sem copiar as postagens mapeadas; para os tokens novos, as postagens
+    completas, com os tokens em ordem em ``extra``.
+    """
+
+    def __init__(self, vocabulary, positions, ids, weights, overrides=None, extra=()):
+        self.base = vocabulary
+        self.positions = positions
+        self.ids = ids
+        self.weights = weights
+        self.overrides = PersistentMap() if overrides is None else overrides
+        self.extra = list(extra)
+
+    def _base_postings(self, position, delta=None):
+        """Pares (id, peso) do token da imagem na posição ``position``, com o ``delta`` aplicado"""
+        start, stop = self.positions[position], self.positions[position + 1]
+        postings = zip(self.ids[start:stop], self.weights[start:stop])
+        if not delta:
+            return postings
+        changed = ((pk, weight) for pk, weight in delta.items() if weight is not None)
+        return chain(((pk, weight) for pk, weight in postings if pk not in delta), changed)
+
+    def terms(self):
+        def base():
+            for position in range(len(self.base)):
+                postings = dict(self._base_postings(position, self.overrides.get(self.base[position])))
+                if postings:
+                    yield self.base[position], postings
+        extra = ((token, self.overrides[token]) for token in self.extra)
+        return merge(base(), extra, key=lambda term: term[0])
+
+    def updated(self, removed=(), added=()):
+        changed, dropped = {}, []
+        extra = self.extra
+        for token, delta in term_changes(removed, added).items():
+            in_base = self.base.find(token) >= 0
+            overrides = dict(self.overrides.get(token) or {})
+            for pk, weight in delta.items():
+                if weight is None and not in_base:
+                    overrides.pop(pk, None)
+                else:
+                    overrides[pk] = weight
+            if in_base or overrides:
+                changed[token] = overrides
+            else:
+                dropped.append(token)
+            if not in_base and bool(overrides) != (token in self.overrides):
+                extra = list(extra) if extra is self.extra else extra
+                if overrides:
+                    insort(extra, token)
+                else:
+                    del extra[bisect_left(extra, token)]
+        index = MappedSearchIndex.__new__(MappedSearchIndex)
+        index.base, index.positions, index.ids, index.weights = self.base, self.positions, self.ids, self.weights
+        index.overrides = self.overrides.updated(changed, dropped)
+        index.extra = extra
+        return index
+
+    def _expand(self, term):
+        scores = {}
+        position = bisect_left(self.base, term)
+        while position < len(self.base):
+            token = self.base[position]
+            if not token.startswith(term):
+                break
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            add_scores(scores, self._base_postings(position, self.overrides.get(token)), factor)
+            position += 1
+        for token in self.extra[bisect_left(self.extra, term):]:
+            if not token.startswith(term):
+                break
+            add_scores(scores, self.overrides[token].items(), 1.0 if token == term else PREFIX_FACTOR)
+        return scores
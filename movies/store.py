@@ -0,0 +1,591 @@
+"""Armazenamento em memória do catálogo de filmes, compartilhado pelos apps"""
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from django.conf import settings
+from django.utils import timezone
+from .columnar import MovieSequence
+from .encoding import dumps, loads
+from .indexes import CatalogIndex, MovieMap, to_number
+from .journal import MutationLog, write_atomic
+from .locks import FileLock
+from .metrics import (
+    QUERY_DURATION, STORE_COMMIT, STORE_LOAD, STORE_PARSE, STORE_READ_BYTES, STORE_WRITTEN_BYTES, Gauge, timed,
+)
+from .search import SearchIndex
+from .shared import checksum, open_image, publish_image, seal_image, sign_image, write_image
+
+JSON_FILE_PATH = getattr(
+    settings, 'MOVIES_JSON_FILE', os.path.join(settings.BASE_DIR, 'movies', 'data', 'movies.json')
+)
+os.makedirs(os.path.dirname(JSON_FILE_PATH), exist_ok=True)
+# 'json' (arquivo + log de mutações, padrão) ou 'orm' (modelo Movie no banco)
+STORAGE_BACKEND = getattr(settings, 'MOVIES_STORAGE_BACKEND', 'json')
+# Tamanho do log de mutações a partir do qual o snapshot é compactado
+COMPACT_BYTES = getattr(settings, 'MOVIES_LOG_COMPACT_BYTES', 4 * 1024 * 1024)
+# 'dict' (um dicionário por filme, padrão) ou 'columnar' (colunas compactas para catálogos grandes)
+CATALOG_LAYOUT = getattr(settings, 'MOVIES_CATALOG_LAYOUT', 'dict')
+# True mapeia o catálogo de uma imagem binária compartilhada entre os processos (ver shared.py)
+SHARED_SNAPSHOT = getattr(settings, 'MOVIES_SHARED_SNAPSHOT', False)
+
+
+def file_signature(path):
+    """Retorna (inode, tamanho, mtime) do arquivo ou None se ele não existir"""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class VersionConflict(Exception):
+    """A versão do filme no catálogo não é a esperada pelo cliente (If-Match)"""
+
+    def __init__(self, movie):
+        super().__init__(f"Filme {movie.get('id')} está na versão {movie_version(movie)}")
+        self.movie = movie
+
+
+def movie_version(movie):
+    """Versão do filme; registros anteriores ao versionamento contam como 1"""
+    return movie.get('version', 1)
+
+
+class CatalogSnapshot:
+    """Visão somente leitura do catálogo em um dado momento, ordenada por id.
+
+    Os dicionários dos filmes são compartilhados entre as requisições e não
+    devem ser alterados: copie o filme (``movie.copy()``) antes de modificá-lo.
+    Com ``layout='columnar'`` os filmes ficam em colunas compactas e cada
+    dicionário é montado apenas quando o filme é lido.
+
+    Metadados persistidos junto com o catálogo:
+    ``last_id`` é o maior id já atribuído, mesmo que o filme tenha sido removido;
+    ``seq`` é a versão do catálogo, incrementada a cada lote gravado;
+    ``modified_at`` é o instante (ISO 8601) da última gravação.
+    """
+
+    __slots__ = ('movies', 'signature', 'index', 'search_index', 'last_id', 'seq', 'modified_at')
+
+    def __init__(self, movies=(), signature=None, last_id=0, seq=0, modified_at=None, layout=None):
+        index = CatalogIndex(sorted(movies, key=lambda movie: movie.get('id') or 0))
+        if modified_at is None:
+            modified_at = max((movie.get('updated_at') or '' for movie in index.by_id.values()), default='') or None
+        search_index = SearchIndex(index.by_id.values())
+        if (layout or CATALOG_LAYOUT) == 'columnar':
+            index = index.compacted()
+        self._assign(index, search_index, signature, last_id, seq, modified_at)
+
+    def _assign(self, index, search_index, signature, last_id, seq, modified_at):
+        by_id = index.by_id
+        self.movies = by_id.movies
+        self.index = index
+        self.search_index = search_index
+        self.signature = signature
+        self.last_id = max(last_id, next(reversed(index.by_id), 0) if index.by_id else 0)
+        self.seq = seq
+        self.modified_at = modified_at
+
+    @classmethod
+    def _derive(cls, index, search_index, signature, last_id, seq, modified_at):
+        snapshot = cls.__new__(cls)
+        snapshot._assign(index, search_index, signature, last_id, seq, modified_at)
+        return snapshot
+
+    def __len__(self):
+        return len(self.movies)
+
+    def __iter__(self):
+        return iter(self.movies)
+
+    def meta(self):
+        """Metadados persistidos no snapshot JSON e em cada lote do log"""
+        return {'last_id': self.last_id, 'seq': self.seq, 'modified_at': self.modified_at}
+
+    def evolve(self, puts=(), deletes=(), signature=None, last_id=0, seq=None, modified_at=None):
+        """Retorna um novo snapshot com os filmes ``puts`` gravados e os ids ``deletes`` removidos.
+
+        Os índices são atualizados de forma incremental, sem reconstruir o catálogo.
+        """
+        by_id = self.index.by_id
+        removed = [by_id[pk] for pk in deletes if pk in by_id]
+        removed.extend(by_id[movie['id']] for movie in puts if movie.get('id') in by_id)
+        last_id = max([self.last_id, last_id] + [movie['id'] for movie in puts if movie.get('id') is not None])
+        return self._derive(
+            self.index.updated(removed, puts),
+            self.search_index.updated(removed, puts),
+            signature,
+            last_id,
+            self.seq + 1 if seq is None else seq,
+            modified_at or self.modified_at,
+        )
+
+    def with_signature(self, signature):
+        """Retorna o mesmo catálogo associado a outra assinatura de arquivos"""
+        return self._derive(
+            self.index, self.search_index, signature, self.last_id, self.seq, self.modified_at,
+        )
+
+    @timed(QUERY_DURATION)
+    def query(self, **filters):
+        """Retorna os filmes que atendem aos filtros (ver ``iter_ordered``).
+
+        No layout colunar é uma sequência de ids que só monta os filmes lidos
+        (por exemplo, os da página).
+        """
+        by_id = self.index.by_id
+        if isinstance(by_id, MovieMap):
+            return [movie for _, movie in self.iter_ordered(**filters)]
+        ids = array('q', (pk for _, pk in self.iter_ordered(resolve=lambda pk: pk, **filters)))
+        return MovieSequence(by_id, ids)
+
+    def count(self, search=None, genre=None, year=None, featured=None, ranges=None, ordering=None):
+        """Quantidade de filmes que atendem aos filtros, sem materializar a lista"""
+        ids = self.index.filter_ids(genre=genre, year=year, featured=featured, ranges=ranges)
+        if search:
+            ranked = self.search_index.search(search)
+            if ids is None:
+                return len(ranked)
+            allowed = set(ids)
+            return sum(1 for pk in ranked if pk in allowed)
+        return len(self.movies) if ids is None else len(ids)
+
+    def iter_ordered(self, search=None, genre=None, year=None, featured=None, ranges=None, ordering=None, after=None,
+                     resolve=None):
+        """Gera (chave, filme) dos filmes que atendem aos filtros, em ordem.
+
+        A ordem segue ``ordering`` (ex.: ``-rating``); sem ela, é por relevância
+        quando há ``search`` e por id nos demais casos. A chave é o par
+        (valor de ordenação, id); com ``after`` a iteração começa logo depois
+        dessa chave, o que permite paginação por cursor sem percorrer o início.
+        ``resolve`` converte o id no valor gerado no lugar do filme.
+        """
+        by_id = self.index.by_id
+        resolve = resolve or by_id.__getitem__
+        ids = self.index.filter_ids(genre=genre, year=year, featured=featured, ranges=ranges)
+        if search:
+            ranked = self.search_index.ranked(search)
+            if ids is not None:
+                allowed = set(ids)
+                ranked = [(pk, score) for pk, score in ranked if pk in allowed]
+            if not ordering:
+                keys = [(-score, pk) for pk, score in ranked]
+                for key in _walk(keys, lambda key: key, after, False):
+                    yield key, resolve(key[1])
+                return
+            ids = sorted(pk for pk, _ in ranked)
+
+        ordering = ordering or 'id'
+        field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+
+        if field == 'id':
+            for pk in _walk(by_id.ids if ids is None else ids, lambda pk: (pk, pk), after, descending):
+                yield (pk, pk), resolve(pk)
+            return
+
+        column = self.index.columns[field]
+        if ids is not None and len(ids) * 8 < len(column):
+            # Poucos filmes filtrados: ordenar o subconjunto sai mais barato que varrer a coluna
+            # Lê só o campo do filme (no layout colunar, só a coluna), sem montá-lo
+            def key(pk):
+                return to_number(by_id.number(pk, field), field), pk
+            for pk in _walk(sorted(ids, key=key), key, after, descending):
+                yield key(pk), resolve(pk)
+            return
+        members = None if ids is None else set(ids)
+        for value, pk in column.walk(after, descending):
+            if members is None or pk in members:
+                yield (value, pk), resolve(pk)
+
+
+def fold_batches(batches, seq):
+    """Junta lotes do log em um só, com o estado final de cada filme; ``seq`` é a versão anterior a eles.
+
+    Retorna os argumentos de ``CatalogSnapshot.evolve``: aplicar o lote
+    combinado atualiza os índices uma única vez, em vez de uma por lote.
+    """
+    puts, deletes = {}, set()
+    last_id, modified_at = 0, None
+    for batch in batches:
+        for pk in batch.get('deletes', ()):
+            puts.pop(pk, None)
+            deletes.add(pk)
+        for movie in batch.get('puts', ()):
+            puts[movie.get('id')] = movie
+            deletes.discard(movie.get('id'))
+        last_id = max(last_id, batch.get('last_id', 0))
+        seq = batch.get('seq', seq + 1)
+        modified_at = batch.get('modified_at') or modified_at
+    return list(puts.values()), deletes, None, last_id, seq, modified_at
+
+
+def _walk(items, key, after, descending):
+    """Percorre ``items`` (ordenados por ``key``) a partir da posição seguinte a ``after``"""
+    if descending:
+        end = len(items) if after is None else bisect_left(items, tuple(after), key=key)
+        for position in range(end - 1, -1, -1):
+            yield items[position]
+    else:
+        start = 0 if after is None else bisect_right(items, tuple(after), key=key)
+        for position in range(start, len(items)):
+            yield items[position]
+
+
+class MovieStore:
+    """Mantém o catálogo carregado e o recarrega apenas quando os arquivos mudam.
+
+    O catálogo fica em dois arquivos: o snapshot JSON (``path``) e um log
+    append-only de mutações (``path + '.log'``). Cada gravação acrescenta
+    apenas o lote alterado ao log; a compactação em segundo plano regrava o
+    snapshot de forma atômica e descarta os lotes já incorporados.
+
+    Gravações são serializadas entre threads e entre processos (lock em
+    ``path + '.lock'``), e sempre partem do estado mais recente em disco.
+
+    Com ``shared`` (MOVIES_SHARED_SNAPSHOT), cada compactação publica também
+    a imagem binária ``path + '.image'`` e os processos mapeiam essa imagem
+    em vez de ler o JSON; apenas os lotes do log ficam em memória própria.
+    Uma gravação sobre um snapshot JSON ainda sem imagem antecipa a
+    compactação, para que o próximo processo a iniciar já a encontre.
+    """
+
+    def __init__(self, path, compact_bytes=None, shared=None):
+        self.path = path
+        self.log = MutationLog(f'{path}.log')
+        self.file_lock = FileLock(f'{path}.lock')
+        self.compact_bytes = COMPACT_BYTES if compact_bytes is None else compact_bytes
+        self.shared = SHARED_SNAPSHOT if shared is None else shared
+        self.image_path = f'{path}.image'
+        self.image_lock = FileLock(f'{path}.image.lock')
+        self._lock = threading.RLock()
+        self._compacting = threading.Lock()
+        self._snapshot = CatalogSnapshot()
+        self._log_offset = 0
+        # Assinatura do snapshot JSON cuja imagem já foi publicada (ou tentada) por este processo
+        self._image_base = None
+
+    def _signature(self):
+        return (file_signature(self.path), file_signature(self.log.path))
+
+    @contextmanager
+    def _writing(self):
+        """Serializa gravações entre threads e entre processos"""
+        with self._lock, self.file_lock:
+            yield
+
+    def snapshot(self):
+        """Retorna o snapshot atual, recarregando os arquivos se mudaram em disco"""
+        current = self.cached_snapshot()
+        if current is not None:
+            return current
+        with self._lock:
+            return self._refresh()
+
+    def cached_snapshot(self):
+        """Snapshot já carregado se ainda corresponde aos arquivos em disco, senão None (nunca relê)"""
+        current = self._snapshot
+        return current if current.signature == self._signature() else None
+
+    def _refresh(self):
+        """Sincroniza o snapshot com o disco (chamar com o lock adquirido)"""
+        current = self._snapshot
+        signature = self._signature()
+        if current.signature == signature:
+            return current
+        start = perf_counter()
+        base_signature, log_signature = signature
+        previous_base, previous_log = current.signature or (None, None)
+
+        if base_signature == previous_base and log_signature and (
+                (previous_log and log_signature[0] == previous_log[0] and log_signature[1] >= self._log_offset)
+                or (previous_log is None and self._log_offset == 0)):
+            # Só o log cresceu (ou foi criado): aplica apenas os lotes novos
+            batches, self._log_offset = self.log.read(self._log_offset)
+            if batches:
+                current = current.evolve(*fold_batches(batches, current.seq))
+            self._snapshot = current.with_signature(signature)
+            STORE_LOAD.labels('log').observe(perf_counter() - start)
+        elif self.shared:
+            self._snapshot, kind = self._load_shared(signature)
+            STORE_LOAD.labels(kind).observe(perf_counter() - start)
+        else:
+            self._snapshot = self._load(signature)
+            STORE_LOAD.labels('full').observe(perf_counter() - start)
+        return self._snapshot
+
+    def _load(self, signature):
+        """Lê o snapshot JSON e aplica todos os lotes do log"""
+        data = self._read()
+        movies = {movie.get('id'): movie for movie in data.get('movies', [])}
+        last_id, seq, modified_at = data.get('last_id', 0), data.get('seq', 0), data.get('modified_at')
+        batches, self._log_offset = self.log.read()
+        for batch in batches:
+            for pk in batch.get('deletes', ()):
+                movies.pop(pk, None)
+            for movie in batch.get('puts', ()):
+                movies[movie.get('id')] = movie
+            last_id = max(last_id, batch.get('last_id', 0))
+            seq = batch.get('seq', seq + 1)
+            modified_at = batch.get('modified_at') or modified_at
+        return CatalogSnapshot(movies.values(), signature, last_id, seq, modified_at)
+
+    def _load_shared(self, signature):
+        """Mapeia a imagem do snapshot JSON atual e aplica os lotes do log; retorna (snapshot, tipo de carga)"""
+        image, status = open_image(self.image_path, signature[0]), 'valid'
+        if image is None:
+            image, status = self._image()
+        self._image_base = signature[0]
+        kind = 'full' if status == 'built' else 'image'
+        if image is None:
+            return self._load(signature), 'full'
+
+        index, search_index = image.catalog()
+        header = image.header
+        snapshot = CatalogSnapshot._derive(
+            index, search_index, None, header['last_id'], header['seq'], header['modified_at'],
+        )
+        batches, self._log_offset = self.log.read()
+        if batches:
+            snapshot = snapshot.evolve(*fold_batches(batches, snapshot.seq))
+        return snapshot.with_signature(signature), kind
+
+    def _image(self, force=False):
+        """Mapeia a imagem do snapshot JSON atual, publicando-a se preciso; retorna (imagem ou None, situação).
+
+        Um único processo por vez (lock da imagem) valida ou gera a imagem;
+        os demais aguardam e mapeiam o resultado. A situação é 'valid'
+        (assinatura confere), 'signed' (só o checksum confere: o JSON foi
+        copiado, e a assinatura da imagem é atualizada), 'built' (gerada do
+        JSON) ou 'failed' (catálogo que não cabe na imagem, ex.: imdb_id não
+        textual; segue-se sem ela).
+        """
+        with self.image_lock:
+            base_signature = self._signature()[0]
+            if base_signature is None:
+                return None, 'failed'
+            self._image_base = base_signature
+            image = None if force else open_image(self.image_path, base_signature)
+            if image is not None:
+                return image, 'valid'
+            data = self._read_bytes()
+            source_checksum = checksum(data)
+            image = None if force else open_image(self.image_path, base_signature, source_checksum)
+            if image is not None:
+                sign_image(self.image_path, base_signature)
+                return image, 'signed'
+            data = self._read(data)
+            base = CatalogSnapshot(
+                data.get('movies', []), None, data.get('last_id', 0), data.get('seq', 0),
+                data.get('modified_at'), layout='dict',
+            )
+            try:
+                publish_image(self.image_path, base, base_signature, source_checksum)
+            except (OSError, TypeError, ValueError):
+                return None, 'failed'
+            image = open_image(self.image_path, base_signature)
+            return image, 'built' if image is not None else 'failed'
+
+    def publish_image(self, force=False):
+        """Garante a imagem do snapshot JSON atual (ver ``_image``) e retorna a situação"""
+        return self._image(force)[1]
+
+    def save(self, movies):
+        """Grava o catálogo completo, registrando no log apenas o que mudou"""
+        with self._writing():
+            current = self._refresh()
+            by_id = current.index.by_id
+            movies = [movie for movie in movies if movie.get('id') is not None]
+            puts = [movie for movie in movies if not by_id.matches(movie['id'], movie)]
+            kept = {movie['id'] for movie in movies}
+            deletes = [pk for pk in by_id if pk not in kept]
+            return self._commit(current, puts, deletes)
+
+    def create(self, movie):
+        """Atribui o próximo id ao filme, grava e retorna o filme criado.
+
+        Ids são monotônicos: um id removido nunca é reutilizado.
+        """
+        with self._writing():
+            current = self._refresh()
+            created = {**movie, 'id': current.last_id + 1}
+            return self._commit(current, [created], []).index.get(created['id'])
+
+    def update(self, pk, change, expected_versions=None):
+        """Aplica ``change(filme) -> novo filme`` sobre a versão mais recente e retorna o resultado.
+
+        Levanta ``KeyError`` se o filme não existe e ``VersionConflict`` se
+        ``expected_versions`` foi informado e não contém a versão atual.
+        """
+        with self._writing():
+            current = self._refresh()
+            movie = self._checked(current, pk, expected_versions)
+            return self._commit(current, [{**change(movie), 'id': pk}], []).index.get(pk)
+
+    def put(self, movie):
+        """Cria ou substitui um filme (pelo id) e retorna o novo snapshot"""
+        return self.apply(puts=[movie])
+
+    def delete(self, pk, expected_versions=None):
+        """Remove o filme com o id informado e retorna o novo snapshot"""
+        with self._writing():
+            current = self._refresh()
+            self._checked(current, pk, expected_versions)
+            return self._commit(current, [], [pk])
+
+    def transact(self, build):
+        """Executa ``build(snapshot) -> (puts, deletes)`` com o lock de escrita e grava o lote.
+
+        ``build`` recebe o estado mais recente em disco, o que permite decidir
+        entre criar e atualizar (e atribuir ids a partir de ``last_id``) sem
+        corridas com outros processos.
+        """
+        with self._writing():
+            current = self._refresh()
+            puts, deletes = build(current)
+            return self._commit(current, puts, deletes)
+
+    def apply(self, puts=(), deletes=()):
+        """Registra gravações e remoções no log e atualiza os índices incrementalmente"""
+        with self._writing():
+            return self._commit(self._refresh(), puts, deletes)
+
+    def _checked(self, snapshot, pk, expected_versions):
+        movie = snapshot.index.get(pk)
+        if movie is None:
+            raise KeyError(pk)
+        if expected_versions is not None and movie_version(movie) not in expected_versions:
+            raise VersionConflict(movie)
+        return movie
+
+    @timed(STORE_COMMIT)
+    def _commit(self, current, puts, deletes):
+        """Grava um lote no log e publica o snapshot resultante (chamar com o lock de escrita)"""
+        by_id = current.index.by_id
+        puts = [
+            {**movie, 'version': movie_version(by_id[movie['id']]) + 1 if movie['id'] in by_id else 1}
+            for movie in puts
+        ]
+        deletes = list(deletes)
+        if not puts and not deletes:
+            return current
+        updated = current.evolve(puts=puts, deletes=deletes, modified_at=timezone.now().isoformat())
+        previous_offset = self._log_offset
+        self._log_offset = self.log.append(
+            {'puts': puts, 'deletes': deletes, **updated.meta()}, self._log_offset,
+        )
+        STORE_WRITTEN_BYTES.labels('log').inc(self._log_offset - previous_offset)
+        self._snapshot = updated = updated.with_signature(self._signature())
+        # Sem imagem para o snapshot JSON atual, a compactação a publica já (partida rápida dos workers)
+        missing_image = self.shared and self._image_base != updated.signature[0]
+        if (self._log_offset > self.compact_bytes or missing_image) and not self._compacting.locked():
+            threading.Thread(target=self.compact, name='movies-compaction', daemon=True).start()
+        return updated
+
+    def compact(self):
+        """Regrava o snapshot JSON com o estado atual e esvazia o log.
+
+        A serialização acontece fora do lock de escrita; lotes gravados nesse
+        meio-tempo são preservados no novo log.
+        """
+        if not self._compacting.acquire(blocking=False):
+            return
+        image = None
+        try:
+            with self._lock:
+                snapshot = self._refresh()
+                offset = self._log_offset
+                log_signature = snapshot.signature[1]
+            if not offset:
+                return
+            # Serializa filme a filme: no layout colunar nenhum momento tem o catálogo inteiro em dicionários
+            payload = b'{"movies":[' + b','.join(map(dumps, snapshot)) + b'],' + dumps(snapshot.meta())[1:]
+            if self.shared:
+                try:
+                    image = write_image(f'{self.image_path}.{os.getpid()}.tmp', snapshot, checksum(payload))
+                except (OSError, TypeError, ValueError):
+                    image = None
+            with self._writing():
+                current = self._refresh()
+                if current.signature[1] is None or current.signature[1][0] != log_signature[0]:
+                    return  # outro processo já compactou este log
+                tail = self.log.read_bytes(offset)
+                # A imagem é publicada logo após o JSON, antes que outro processo precise relê-lo
+                with self.image_lock if image else nullcontext():
+                    write_atomic(self.path, payload)
+                    if image:
+                        seal_image(image, self.image_path, file_signature(self.path))
+                self.log.reset(tail)
+                STORE_WRITTEN_BYTES.labels('snapshot').inc(len(payload) + len(tail))
+                self._log_offset = len(tail)
+                if self.shared:
+                    # Mesmo sem imagem (catálogo que não cabe nela), não tenta de novo a cada gravação
+                    self._image_base = file_signature(self.path)
+                if image:
+                    # Troca o catálogo em memória própria pela imagem na próxima leitura
+                    self._snapshot = CatalogSnapshot()
+                else:
+                    self._snapshot = current.with_signature(self._signature())
+        finally:
+            if image and os.path.exists(image):
+                os.remove(image)
+            self._compacting.release()
+
+    def _read_bytes(self):
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return b''
+        STORE_READ_BYTES.labels().inc(len(data))
+        return data
+
+    @timed(STORE_PARSE)
+    def _read(self, data=None):
+        """Snapshot JSON decodificado (``data``: conteúdo já lido do arquivo)"""
+        data = self._read_bytes() if data is None else data
+        if not data:
+            return {}
+        try:
+            return loads(data)
+        except ValueError:
+            return {}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Retorna o store do processo (conforme MOVIES_STORAGE_BACKEND), criando-o na primeira chamada"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if STORAGE_BACKEND == 'orm':
+                    from .orm_store import OrmMovieStore
+                    _store = OrmMovieStore()
+                else:
+                    _store = MovieStore(JSON_FILE_PATH)
+    return _store
+
+
+Gauge('movies_catalog_movies', 'Filmes no snapshot atual do catálogo', lambda: len(get_store().snapshot()))
+
+
+def load_movies():
+    """Retorna uma lista com os filmes do snapshot atual (sem reler o JSON)"""
+    return list(get_store().snapshot())
+
+
+def save_movies(movies):
+    """Salva filmes no arquivo JSON"""
+    try:
+        get_store().save(movies)
+        return True
+    except Exception:
+        return False
+
@@ -0,0 +1,11 @@
+"""URLconf de teste com as views assíncronas da API e do catálogo (como sob ASGI com MOVIES_ASYNC_VIEWS)"""
+from django.urls import include, path
+from catalog import async_views as catalog_async_views
+from catalog.urls import page_urlpatterns
+from movies import async_views
+from movies.urls import api_urlpatterns
+
+urlpatterns = [
+    path('api/', include(api_urlpatterns(async_views))),
+    path('', include(page_urlpatterns(catalog_async_views))),
+]
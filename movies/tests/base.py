@@ -0,0 +1,84 @@
+"""Catálogo de teste e fixtures compartilhadas pelos testes do app"""
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.cache import caches
+from movies.encoding import dumps, loads
+from movies.journal import write_atomic
+from movies.store import MovieStore
+
+GENRES = ('Action, Drama', 'Drama', 'Comedy', 'Sci-Fi, Action', 'Romance, Drama')
+TITLES = ('Ação na Noite', 'Coração Valente', 'A Noite do Amor', 'Amores Perdidos', 'Acaso')
+
+
+def make_movies(count=30):
+    """Filmes de teste com valores repetidos (empates na ordenação), acentos e gêneros compostos"""
+    return [
+        {
+            'id': pk,
+            'title': f'{TITLES[pk % len(TITLES)]} {pk}',
+            'description': 'Uma história de amor e ação' if pk % 3 else 'Um drama',
+            'genre': GENRES[pk % len(GENRES)],
+            'release_year': 1990 + pk % 7,
+            'duration_minutes': 90 + pk % 4 * 10,
+            'rating': round(5 + pk % 5 * 0.8, 1),
+            'thumbnail_url': f'https://example.com/{pk}.jpg',
+            'video_url': f'https://example.com/{pk}.mp4',
+            'is_featured': pk % 4 == 0,
+            'imdb_id': f'tt{pk:07d}',
+            'director': 'José Diretor' if pk % 2 else 'Ana',
+            'actors': 'Atriz Um, Ator Dois',
+        }
+        for pk in range(1, count + 1)
+    ]
+
+
+def new_movie(**fields):
+    """Corpo válido para criar um filme pela API"""
+    return {
+        'title': 'Filme Novo', 'description': 'Sinopse', 'genre': 'Drama', 'release_year': 2001,
+        'duration_minutes': 100, 'rating': 7.5, 'thumbnail_url': 'https://example.com/novo.jpg',
+        'video_url': 'https://example.com/novo.mp4', **fields,
+    }
+
+
+def write_catalog(path, movies, **meta):
+    """Grava ``movies`` como snapshot JSON do catálogo em ``path``"""
+    last_id = max((movie['id'] for movie in movies), default=0)
+    write_atomic(path, dumps({'movies': movies, 'last_id': last_id, 'seq': 0, **meta}))
+
+
+def read_json(path):
+    with open(path, 'rb') as file:
+        return loads(file.read())
+
+
+def catalog_state(store):
+    """Filmes e metadados do snapshot atual, para comparar cargas"""
+    snapshot = store.snapshot()
+    return list(snapshot), snapshot.meta()
+
+
+class CatalogFileMixin:
+    """Catálogo JSON em um diretório temporário, servido pelo store do processo (``get_store()``)"""
+
+    shared = False
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp(prefix='movies-test-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'movies.json')
+        self.movies = make_movies()
+        write_catalog(self.path, self.movies)
+        self.store = self.open_store()
+        patcher = mock.patch('movies.store._store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for alias in ('movies', 'catalog'):
+            caches[alias].clear()
+
+    def open_store(self):
+        """Store novo sobre os arquivos do teste (como um processo que acabou de iniciar)"""
+        return MovieStore(self.path, compact_bytes=10 ** 9, shared=self.shared)
@@ -0,0 +1,160 @@
+import threading
+from unittest import mock
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APITestCase
+from catalog import async_views as catalog_async_views
+from catalog.tests import test_import_movies_to_db, test_views
+from movies import async_views
+from movies.async_store import get_async_store
+from movies.orm_store import OrmMovieStore
+from . import (
+    test_bulk, test_cache, test_conditional, test_indexes, test_multi_get, test_pagination, test_projection,
+    test_renderers, test_search, test_store, test_writes,
+)
+from .base import CatalogFileMixin
+
+# As mesmas classes de teste da API e do catálogo, servidas pelas views assíncronas
+async_urls = override_settings(ROOT_URLCONF='movies.tests.async_urls')
+
+
+@async_urls
+class AsyncBulkTests(test_bulk.BulkTests):
+    pass
+
+
+@async_urls
+class AsyncWriteTimestampTests(test_bulk.WriteTimestampTests):
+    pass
+
+
+@async_urls
+class AsyncResponseCacheTests(test_cache.ResponseCacheTests):
+    pass
+
+
+@async_urls
+class AsyncConditionalRequestTests(test_conditional.ConditionalRequestTests):
+    pass
+
+
+@async_urls
+class AsyncCatalogPageConditionalTests(test_conditional.CatalogPageConditionalTests):
+    pass
+
+
+@async_urls
+class AsyncIndexedFiltersApiTests(test_indexes.IndexedFiltersApiTests):
+    pass
+
+
+@async_urls
+class AsyncMultiGetTests(test_multi_get.MultiGetTests):
+    pass
+
+
+@async_urls
+class AsyncCursorPaginationTests(test_pagination.CursorPaginationTests):
+    pass
+
+
+@async_urls
+class AsyncProjectionApiTests(test_projection.ProjectionApiTests):
+    pass
+
+
+@async_urls
+class AsyncCatalogJSONRendererTests(test_renderers.CatalogJSONRendererTests):
+    pass
+
+
+@async_urls
+class AsyncSearchApiTests(test_search.SearchApiTests):
+    pass
+
+
+@async_urls
+class AsyncStoreBackedViewsTests(test_store.StoreBackedViewsTests):
+    pass
+
+
+@async_urls
+class AsyncIfMatchApiTests(test_writes.IfMatchApiTests):
+    pass
+
+
+@async_urls
+class AsyncImportMoviesToDbTests(test_import_movies_to_db.ImportMoviesToDbTests):
+    pass
+
+
+@async_urls
+class AsyncCatalogPagesTests(test_views.CatalogPagesTests):
+    pass
+
+
+class AsyncViewsTests(SimpleTestCase):
+    def test_views_are_coroutines(self):
+        views = (
+            async_views.get_all_movies, async_views.get_movies_by_genre, async_views.get_featured_movies,
+            async_views.movie_detail, async_views.bulk_movies, catalog_async_views.home,
+            catalog_async_views.detalhes_filme,
+        )
+        for view in views:
+            with self.subTest(view=view):
+                self.assertTrue(iscoroutinefunction(view))
+
+
+class AsyncStoreTests(CatalogFileMixin, TestCase):
+    def test_follows_the_current_store(self):
+        async_store = get_async_store()
+        self.assertIs(async_store.store, self.store)
+        self.assertIs(get_async_store(), async_store)
+        self.assertTrue(async_store.in_memory)
+        orm = OrmMovieStore()
+        with mock.patch('movies.store._store', orm):
+            self.assertIs(get_async_store().store, orm)
+            self.assertFalse(get_async_store().in_memory)
+        self.assertIs(get_async_store(), async_store)
+
+    def test_listings_run_off_the_event_loop_and_lookups_on_it(self):
+        threads = {}
+
+        def record(name):
+            def inner(snapshot):
+                threads[name] = threading.current_thread().name
+                return len(snapshot)
+            return inner
+
+        async def run():
+            store = get_async_store()
+            threads['loop'] = threading.current_thread().name
+            self.assertEqual(await store.query(record('query')), 30)
+            self.assertEqual(await store.read(record('read')), 30)
+
+        async_to_sync(run)()
+        self.assertTrue(threads['query'].startswith('movies-query'))
+        self.assertEqual(threads['read'], threads['loop'])
+
+    def test_writes_go_through_the_async_store(self):
+        async def run():
+            created = await get_async_store().create({'title': 'Assíncrono'})
+            return created, (await get_async_store().snapshot()).index.get(created['id'])
+
+        created, stored = async_to_sync(run)()
+        self.assertEqual(created['id'], 31)
+        self.assertEqual(stored['title'], 'Assíncrono')
+
+
+@async_urls
+class AsgiClientTests(CatalogFileMixin, APITestCase):
+    async def test_list_and_detail_through_the_asgi_handler(self):
+        response = await self.async_client.get('/api/movies/', {'ordering': '-rating', 'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results']['results'][0]['id'], 29)
+        response = await self.async_client.get('/api/movies/7/')
+        self.assertEqual(response.json()['id'], 7)
+        revalidated = await self.async_client.get('/api/movies/7/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual((await self.async_client.delete('/api/movies/7/')).status_code, 204)
+        self.assertEqual((await self.async_client.get('/api/movies/7/')).status_code, 404)
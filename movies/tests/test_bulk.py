@@ -0,0 +1,60 @@
+from datetime import datetime
+from rest_framework.test import APITestCase
+from .base import CatalogFileMixin, catalog_state, new_movie
+
+
+class BulkTests(CatalogFileMixin, APITestCase):
+    def operations(self):
+        return [
+            {'op': 'patch', 'id': 1, 'data': {'rating': 2.5}},
+            {'op': 'delete', 'id': 2},
+            {'op': 'patch', 'id': 999, 'data': {'rating': 3.0}},
+        ]
+
+    def test_atomic_batch_is_rolled_back_on_any_failure(self):
+        before = catalog_state(self.store)
+        response = self.client.post('/api/movies/bulk/', {'operations': self.operations()}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['applied'])
+        self.assertEqual([result['status'] for result in response.data['results']], [424, 424, 404])
+        self.assertEqual(catalog_state(self.store), before)
+
+    def test_non_atomic_batch_applies_valid_operations(self):
+        response = self.client.post(
+            '/api/movies/bulk/', {'operations': self.operations(), 'atomic': False}, format='json',
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 204, 404])
+        snapshot = self.store.snapshot()
+        self.assertEqual(snapshot.index.get(1)['rating'], 2.5)
+        self.assertIsNone(snapshot.index.get(2))
+        self.assertEqual(snapshot.seq, 1)
+
+    def test_version_mismatch_fails_atomic_batch(self):
+        operations = [{'op': 'patch', 'id': 1, 'data': {'rating': 2.5}, 'version': 7}]
+        response = self.client.post('/api/movies/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['results'][0]['status'], 412)
+        self.assertEqual(self.store.snapshot().index.get(1)['rating'], self.movies[0]['rating'])
+
+
+class WriteTimestampTests(CatalogFileMixin, APITestCase):
+    def assert_aware(self, value):
+        self.assertIsNotNone(datetime.fromisoformat(value).tzinfo, value)
+
+    def test_api_writes_record_timezone_aware_timestamps(self):
+        created = self.client.post('/api/movies/', new_movie(), format='json').data
+        self.assert_aware(created['created_at'])
+        self.assert_aware(created['updated_at'])
+        updated = self.client.put(f'/api/movies/{created["id"]}/', new_movie(title='Outro'), format='json').data
+        self.assertEqual(updated['created_at'], created['created_at'])
+        self.assert_aware(updated['updated_at'])
+        self.assert_aware(self.client.patch('/api/movies/1/', {'rating': 1.0}, format='json').data['updated_at'])
+
+    def test_bulk_writes_record_timezone_aware_timestamps(self):
+        operations = [{'op': 'create', 'data': new_movie()}, {'op': 'patch', 'id': 1, 'data': {'rating': 2.5}}]
+        response = self.client.post('/api/movies/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        snapshot = self.store.snapshot()
+        self.assert_aware(snapshot.index.get(31)['created_at'])
+        self.assert_aware(snapshot.index.get(1)['updated_at'])
@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.cache import ByteBudgetLocMemCache
+from .base import CatalogFileMixin
+
+
+class ResponseCacheTests(CatalogFileMixin, APITestCase):
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get('/api/movies/', {'genre': 'drama'})
+        second = self.client.get('/api/movies/', {'genre': 'drama'})
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second.content, first.content)
+        # page=1 e a ordem dos parâmetros não mudam a chave
+        self.assertEqual(self.client.get('/api/movies/', {'page': 1, 'genre': 'drama'})['X-Cache'], 'HIT')
+
+    def test_cached_list_keeps_view_headers(self):
+        first = self.client.get('/api/movies/')
+        second = self.client.get('/api/movies/')
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second['Allow'], first['Allow'])
+        self.assertEqual(second.content, first.content)
+
+    def test_write_invalidates_cached_lists(self):
+        self.client.get('/api/movies/featured/')
+        self.store.update(4, lambda movie: {**movie, 'title': 'Título Novo'})
+        response = self.client.get('/api/movies/featured/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Título Novo', response.content.decode())
+
+    def test_scheme_is_part_of_the_key(self):
+        plain = self.client.get('/api/movies/')
+        secure = self.client.get('/api/movies/', secure=True)
+        self.assertEqual(secure['X-Cache'], 'MISS')
+        self.assertTrue(plain.data['next'].startswith('http://'))
+        self.assertTrue(secure.data['next'].startswith('https://'))
+        self.assertNotEqual(plain['ETag'], secure['ETag'])
+        self.assertEqual(self.client.get('/api/movies/', secure=True)['X-Cache'], 'HIT')
+
+    def test_errors_are_not_cached(self):
+        self.client.get('/api/movies/', {'year': 'x'})
+        self.assertNotIn('X-Cache', self.client.get('/api/movies/', {'year': 'x'}))
+
+
+class ByteBudgetLocMemCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = ByteBudgetLocMemCache('test-byte-budget', {'OPTIONS': {'MAX_BYTES': 100}})
+        self.addCleanup(self.cache.clear)
+
+    def test_least_recently_used_entries_leave_past_the_byte_budget(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, b'x' * 40)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('c'), b'x' * 40)
+        self.assertLessEqual(self.cache.total_bytes, 100)
+
+    def test_overwrite_and_delete_release_bytes(self):
+        self.cache.set('a', b'x' * 40)
+        larger = self.cache.total_bytes
+        self.cache.set('a', b'x' * 10)
+        self.assertEqual(self.cache.total_bytes, larger - 30)
+        self.cache.delete('a')
+        self.assertEqual(self.cache.total_bytes, 0)
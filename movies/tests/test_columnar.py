@@ -0,0 +1,173 @@
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.columnar import ColumnarCatalog, MovieColumns
+from movies.encoding import dumps, loads
+from movies.store import CatalogSnapshot
+from .base import CatalogFileMixin, make_movies, new_movie
+
+QUERIES = (
+    {},
+    {'ordering': '-rating'},
+    {'ordering': '-id'},
+    {'genre': 'Drama', 'ordering': '-release_year'},
+    {'featured': True},
+    {'year': 1993},
+    {'search': 'amor'},
+    {'search': 'noite', 'ordering': 'duration_minutes'},
+)
+
+
+def irregular_movies():
+    """Filmes com tipos fora das colunas, campos ausentes e chaves em outra ordem"""
+    movies = make_movies(6)
+    movies[0]['rating'] = '8.1'
+    movies[1]['genre'] = ['Drama', 'Comedy']
+    movies[2]['release_year'] = 2 ** 40
+    movies[3]['is_featured'] = None
+    del movies[4]['director']
+    movies[5] = dict(reversed(list(movies[5].items())))
+    return movies
+
+
+class MovieColumnsTests(SimpleTestCase):
+    def test_materialized_movies_serialize_like_the_originals(self):
+        movies = irregular_movies()
+        columns = MovieColumns(movies)
+        for row, movie in enumerate(movies):
+            with self.subTest(id=movie['id']):
+                self.assertEqual(dumps(columns.materialize(row)), dumps(movie))
+                self.assertEqual(loads(columns.fragment(row)), movie)
+
+    def test_reads_return_the_cached_movie(self):
+        columns = MovieColumns(make_movies(3))
+        movie = columns.movie(1)
+        self.assertIs(columns.movie(1), movie)
+        self.assertIsNot(columns.movie(2, cache=False), columns.movie(2))
+
+    def test_materialized_cache_is_bounded(self):
+        columns = MovieColumns(make_movies(8))
+        with mock.patch('movies.columnar.MATERIALIZED_CACHE_SIZE', 3):
+            first = columns.movie(0)
+            for row in range(1, 8):
+                columns.movie(row)
+        self.assertEqual(len(columns._cache), 3)
+        self.assertIsNot(columns.movie(0), first)
+
+    def test_single_field_reads(self):
+        movies = irregular_movies()
+        columns = MovieColumns(movies)
+        self.assertEqual(columns.value(0, 'rating'), '8.1')
+        self.assertEqual(columns.value(4, 'director', 'nenhum'), 'nenhum')
+        self.assertEqual(columns.number(4, 'director'), 0)
+        self.assertTrue(columns.matches(1, movies[1]))
+        self.assertFalse(columns.matches(1, movies[2]))
+
+    def test_non_integer_ids_are_rejected(self):
+        with self.assertRaises(ValueError):
+            MovieColumns([{'id': 'a1', 'title': 'Filme'}])
+
+    def test_numbers_take_less_memory_than_objects(self):
+        columns = MovieColumns(make_movies(100))
+        self.assertLess(columns.nbytes(), 100 * 8 * (len(columns.numbers) + len(columns.codes)))
+
+
+class ColumnarCatalogTests(SimpleTestCase):
+    def setUp(self):
+        self.movies = make_movies(10)
+        self.catalog = ColumnarCatalog(self.movies)
+
+    def test_mapping_interface(self):
+        self.assertEqual(list(self.catalog), list(range(1, 11)))
+        self.assertEqual(list(self.catalog.values()), self.movies)
+        self.assertEqual(self.catalog[3], self.movies[2])
+        self.assertIn(3, self.catalog)
+        self.assertNotIn(11, self.catalog)
+        self.assertNotIn('3', self.catalog)
+        self.assertIsNone(self.catalog.get(11))
+        with self.assertRaises(KeyError):
+            self.catalog.value(11, 'title')
+
+    def test_updated_keeps_changes_over_the_columns(self):
+        changed = {**self.movies[1], 'title': 'Novo'}
+        added = {**self.movies[0], 'id': 20}
+        catalog = self.catalog.updated(deleted=[3, 11], added=[changed, added])
+        self.assertEqual(list(catalog), [1, 2, 4, 5, 6, 7, 8, 9, 10, 20])
+        self.assertIs(catalog[2], changed)
+        self.assertIsNone(catalog.fragment(2))
+        self.assertEqual(catalog.value(2, 'title'), 'Novo')
+        self.assertNotIn(3, catalog)
+        # O catálogo original não muda
+        self.assertEqual(self.catalog[2], self.movies[1])
+        self.assertIn(3, self.catalog)
+
+    def test_many_changes_rebuild_the_columns(self):
+        with mock.patch('movies.columnar.REBUILD_MIN', 2):
+            catalog = self.catalog.updated(deleted=[1, 2], added=[{**self.movies[2], 'title': 'Novo'}])
+        self.assertEqual(len(catalog.changed), 0)
+        self.assertEqual(catalog.deleted, frozenset())
+        self.assertEqual(catalog[3]['title'], 'Novo')
+        self.assertEqual(list(catalog), list(range(3, 11)))
+
+
+class ColumnarSnapshotTests(SimpleTestCase):
+    def assert_same_catalog(self, columnar, plain):
+        self.assertIsInstance(columnar.index.by_id, ColumnarCatalog)
+        self.assertEqual(list(columnar), list(plain))
+        self.assertEqual(columnar.meta(), plain.meta())
+        for filters in QUERIES:
+            with self.subTest(**filters):
+                self.assertEqual(list(columnar.query(**filters)), plain.query(**filters))
+                self.assertEqual(columnar.count(**filters), plain.count(**filters))
+
+    def test_queries_match_the_dict_layout(self):
+        movies = make_movies()
+        self.assert_same_catalog(
+            CatalogSnapshot(movies, layout='columnar'), CatalogSnapshot(movies, layout='dict'),
+        )
+
+    def test_query_pages_only_build_the_movies_read(self):
+        snapshot = CatalogSnapshot(make_movies(), layout='columnar')
+        page = snapshot.query(ordering='-rating')[:5]
+        self.assertEqual(len(page), 5)
+        self.assertEqual(len(snapshot.index.by_id.columns._cache), 5)
+
+    def test_evolve_matches_the_dict_layout(self):
+        movies = make_movies()
+        columnar = CatalogSnapshot(movies, layout='columnar')
+        plain = CatalogSnapshot(movies, layout='dict')
+        puts = [{**movies[4], 'rating': 9.9, 'genre': 'Comedy'}, {**movies[0], 'id': 40, 'title': 'Amor Novo'}]
+        for _ in range(2):
+            columnar = columnar.evolve(puts, [7, 8])
+            plain = plain.evolve(puts, [7, 8])
+            puts = [{**movies[9], 'release_year': 1993}]
+        self.assertEqual(columnar.last_id, 40)
+        self.assert_same_catalog(columnar, plain)
+
+
+class ColumnarApiTests(CatalogFileMixin, APITestCase):
+    def setUp(self):
+        patcher = mock.patch('movies.store.CATALOG_LAYOUT', 'columnar')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_store_serves_the_columnar_catalog(self):
+        self.assertIsInstance(self.store.snapshot().index.by_id, ColumnarCatalog)
+        self.assertEqual(loads(self.client.get('/api/movies/5/').content), self.movies[4])
+        results = loads(self.client.get('/api/movies/?ordering=-rating&page=2').content)['results']['results']
+        expected = sorted(self.movies, key=lambda movie: (movie['rating'], movie['id']), reverse=True)
+        self.assertEqual(results, expected[10:20])
+
+    def test_writes_and_reload(self):
+        created = self.client.post('/api/movies/', new_movie(title='Amor Colunar'), format='json')
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(self.client.delete('/api/movies/2/').status_code, 204)
+        self.assertEqual(self.client.patch('/api/movies/3/', {'rating': 9.5}, format='json').status_code, 200)
+        for store in (self.store, self.open_store()):
+            with self.subTest(store=store):
+                snapshot = store.snapshot()
+                self.assertIsInstance(snapshot.index.by_id, ColumnarCatalog)
+                self.assertNotIn(2, snapshot.index.by_id)
+                self.assertEqual(snapshot.index.by_id[3]['rating'], 9.5)
+                self.assertEqual([movie['id'] for movie in snapshot.query(search='colunar')], [created.data['id']])
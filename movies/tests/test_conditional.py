@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from .base import CatalogFileMixin
+
+UPDATED_AT = '2024-01-02T03:04:05+00:00'
+HTTP_DATE = 'Tue, 02 Jan 2024 03:04:05 GMT'
+
+
+class ConditionalRequestTests(CatalogFileMixin, APITestCase):
+    def test_detail_etag_304_and_412(self):
+        response = self.client.get('/api/movies/1/')
+        etag = response['ETag']
+        self.assertEqual(etag, '"1.1"')
+        self.assertEqual(self.client.get('/api/movies/1/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = self.client.patch('/api/movies/1/', {'rating': 7.0}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"1.2"')
+
+        response = self.client.patch('/api/movies/1/', {'rating': 8.0}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], '"1.2"')
+        self.assertEqual(self.store.snapshot().index.get(1)['rating'], 7.0)
+        self.assertEqual(self.client.delete('/api/movies/1/', HTTP_IF_MATCH=etag).status_code, 412)
+        self.assertEqual(self.client.get('/api/movies/1/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_changes_with_catalog(self):
+        response = self.client.get('/api/movies/', {'genre': 'drama'})
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/movies/', {'genre': 'drama'}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/api/movies/', {'genre': 'action'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.store.update(1, lambda movie: {**movie, 'rating': 1.0})
+        response = self.client.get('/api/movies/', {'genre': 'drama'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_last_modified_comes_from_updated_at(self):
+        self.store.update(1, lambda movie: {**movie, 'updated_at': UPDATED_AT})
+        response = self.client.get('/api/movies/1/')
+        self.assertEqual(response['Last-Modified'], HTTP_DATE)
+        self.assertEqual(self.client.get('/api/movies/1/', HTTP_IF_MODIFIED_SINCE=HTTP_DATE).status_code, 304)
+        self.assertEqual(
+            self.client.get('/api/movies/1/', HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2024 00:00:00 GMT').status_code, 200,
+        )
+
+    def test_list_last_modified_follows_the_last_write(self):
+        self.store.update(1, lambda movie: {**movie, 'rating': 1.0})
+        last_modified = self.client.get('/api/movies/')['Last-Modified']
+        self.assertEqual(self.client.get('/api/movies/', HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        response = self.client.get('/api/movies/featured/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_response_skips_the_view(self):
+        etag = self.client.get('/api/movies/')['ETag']
+        response = self.client.get('/api/movies/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+
+class CatalogPageConditionalTests(CatalogFileMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user('espectador', password='senha'))
+
+    def test_movie_page_etag_follows_movie_version(self):
+        response = self.client.get('/filme/tt0000001/')
+        self.assertEqual(response['ETag'], '"1.1"')
+        self.assertEqual(self.client.get('/filme/tt0000001/', HTTP_IF_NONE_MATCH='"1.1"').status_code, 304)
+        self.store.update(1, lambda movie: {**movie, 'rating': 2.0})
+        self.assertEqual(self.client.get('/filme/tt0000001/', HTTP_IF_NONE_MATCH='"1.1"').status_code, 200)
+
+    def test_home_is_not_modified_until_the_catalog_changes(self):
+        etag = self.client.get('/')['ETag']
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.store.delete(2)
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
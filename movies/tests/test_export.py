@@ -0,0 +1,66 @@
+import csv
+import io
+from unittest import mock
+from django.test import SimpleTestCase
+from movies import renderers
+from movies.encoding import loads
+from .base import CatalogFileMixin
+
+
+class ExportTests(CatalogFileMixin, SimpleTestCase):
+    def export(self, **params):
+        response = self.client.get('/api/movies/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_has_one_movie_per_line(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="movies-0.ndjson"')
+        self.assertEqual([loads(line) for line in body.splitlines()], self.movies)
+
+    def test_csv_has_header_and_one_row_per_movie(self):
+        response, body = self.export(format='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 30)
+        self.assertEqual((rows[0]['id'], rows[0]['title'], rows[0]['imdb_id']), ('1', 'Coração Valente 1', 'tt0000001'))
+
+    def test_list_filters_and_ordering_apply(self):
+        _, body = self.export(genre='drama', min_rating=6, ordering='-rating')
+        movies = [loads(line) for line in body.splitlines()]
+        expected = sorted(
+            (movie for movie in self.movies if 'Drama' in movie['genre'] and movie['rating'] >= 6),
+            key=lambda movie: (movie['rating'], movie['id']), reverse=True,
+        )
+        self.assertEqual([movie['id'] for movie in movies], [movie['id'] for movie in expected])
+
+    def test_projection_selects_fields_and_columns(self):
+        _, body = self.export(fields='id,title')
+        self.assertEqual(loads(body.splitlines()[0]), {'id': 1, 'title': 'Coração Valente 1'})
+        _, body = self.export(format='csv', view='card')
+        self.assertEqual(body.splitlines()[0], 'id,title,thumbnail_url,rating,release_year,genre')
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'format': 'xml'}, {'year': 'x'}, {'view': 'mini'}, {'fields': 'id', 'exclude': 'title'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get('/api/movies/export/', params).status_code, 400)
+
+    def test_large_export_is_streamed_in_chunks(self):
+        with mock.patch('movies.export.ROWS_PER_CHUNK', 7):
+            response = self.client.get('/api/movies/export/')
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 30)
+
+    def test_export_does_not_fill_the_fragment_cache(self):
+        renderers._fragments.clear()
+        self.export()
+        self.assertEqual(len(renderers._fragments), 0)
+
+    def test_conditional_get(self):
+        response, _ = self.export()
+        self.assertEqual(self.client.get('/api/movies/export/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.store.create({'title': 'Novo'})
+        self.assertEqual(self.client.get('/api/movies/export/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
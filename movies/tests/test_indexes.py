@@ -0,0 +1,153 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.indexes import CatalogIndex, SortedColumn, genre_tokens, intersect
+from movies.persistent import PersistentMap
+from movies.store import CatalogSnapshot
+from .base import CatalogFileMixin, make_movies
+
+
+class CatalogIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.movies = make_movies()
+        self.index = CatalogIndex(self.movies)
+
+    def expected(self, predicate):
+        return [movie['id'] for movie in self.movies if predicate(movie)]
+
+    def test_lookups_by_id_and_imdb_id(self):
+        self.assertIs(self.index.get(7), self.movies[6])
+        self.assertIs(self.index.get_by_imdb_id('tt0000007'), self.movies[6])
+        self.assertIsNone(self.index.get(999))
+        self.assertIsNone(self.index.get_by_imdb_id('tt9999999'))
+
+    def test_genre_tokens(self):
+        self.assertEqual(genre_tokens('Action, Adventure,  Sci-Fi'), ['action', 'adventure', 'sci-fi'])
+        self.assertEqual(genre_tokens(None), [])
+
+    def test_filters_intersect_postings(self):
+        self.assertEqual(self.index.filter_ids(genre='ACTION'), self.expected(lambda m: 'Action' in m['genre']))
+        self.assertEqual(
+            self.index.filter_ids(genre='drama', year=1993, featured=False),
+            self.expected(lambda m: 'Drama' in m['genre'] and m['release_year'] == 1993 and not m['is_featured']),
+        )
+        self.assertEqual(self.index.filter_ids(genre='action, drama'),
+                         self.expected(lambda m: m['genre'] == 'Action, Drama'))
+        self.assertEqual(self.index.filter_ids(genre='western'), [])
+        self.assertIsNone(self.index.filter_ids())
+
+    def test_intersect_accepts_sorted_sequences(self):
+        self.assertEqual(intersect([frozenset({1, 3, 5, 7}), [3, 4, 5], (5, 3)]), [3, 5])
+        self.assertEqual(intersect([frozenset(), frozenset({1})]), [])
+
+    def test_updated_keeps_previous_index(self):
+        changed = {**self.movies[0], 'genre': 'Western', 'imdb_id': 'tt7654321'}
+        index = self.index.updated([self.movies[0], self.movies[1]], [changed])
+        self.assertEqual(index.filter_ids(genre='western'), [1])
+        self.assertIsNone(index.get(2))
+        self.assertIsNone(index.get_by_imdb_id('tt0000001'))
+        self.assertIs(index.get_by_imdb_id('tt7654321'), changed)
+        self.assertEqual(self.index.filter_ids(genre='western'), [])
+        self.assertIs(self.index.get_by_imdb_id('tt0000001'), self.movies[0])
+
+
+class SortedColumnTests(SimpleTestCase):
+    def setUp(self):
+        self.pairs = [(7.5, 3), (5.0, 1), (7.5, 2), (9.0, 4), (6.0, 5)]
+        self.column = SortedColumn(self.pairs)
+
+    def test_range_ids_by_bisection(self):
+        self.assertEqual(list(self.column.range_ids(6.0, 7.5)), [5, 2, 3])
+        self.assertEqual(list(self.column.range_ids(low=8)), [4])
+        self.assertEqual(list(self.column.range_ids(high=4.9)), [])
+
+    def test_walk_in_both_directions_after_a_key(self):
+        ordered = sorted(self.pairs)
+        self.assertEqual(list(self.column.walk()), ordered)
+        self.assertEqual(list(self.column.walk(descending=True)), ordered[::-1])
+        self.assertEqual(list(self.column.walk((7.5, 2))), ordered[3:])
+        self.assertEqual(list(self.column.walk((7.5, 2), descending=True)), ordered[:2][::-1])
+
+    def test_updated_returns_a_new_column(self):
+        column = self.column.updated([(7.5, 3)], [(1.0, 3), (8.0, 6)])
+        self.assertEqual(list(column.walk()), sorted([(1.0, 3), (5.0, 1), (7.5, 2), (9.0, 4), (6.0, 5), (8.0, 6)]))
+        self.assertEqual(list(self.column.walk()), sorted(self.pairs))
+
+
+class StructuralSharingTests(SimpleTestCase):
+    def setUp(self):
+        self.snapshot = CatalogSnapshot(make_movies())
+
+    def test_write_shares_untouched_structures_with_previous_snapshot(self):
+        before, movie = self.snapshot, self.snapshot.index.get(1)
+        after = before.evolve(puts=[{**movie, 'rating': 9.5}])
+        self.assertIs(after.index.genres, before.index.genres)
+        self.assertIs(after.index.featured, before.index.featured)
+        self.assertIs(after.index.by_imdb_id, before.index.by_imdb_id)
+        self.assertIs(after.search_index.postings, before.search_index.postings)
+        self.assertIs(after.index.columns['release_year'], before.index.columns['release_year'])
+        shared = sum(a is b for a, b in zip(after.index.by_id.by_pk.shards, before.index.by_id.by_pk.shards))
+        self.assertEqual(shared, len(before.index.by_id.by_pk.shards) - 1)
+
+        self.assertEqual(before.index.get(1)['rating'], movie['rating'])
+        self.assertEqual(after.index.get(1)['rating'], 9.5)
+        self.assertEqual([pk for _, pk in after.index.columns['rating'].walk(descending=True)][:1], [1])
+
+    def test_created_and_deleted_movies_only_reach_the_new_snapshot(self):
+        before = self.snapshot
+        created = {'id': 31, 'title': 'Faroeste Novo', 'genre': 'Western', 'rating': 6.0}
+        after = before.evolve(puts=[created], deletes=[2])
+        self.assertEqual([movie['id'] for movie in after.query(genre='western')], [31])
+        self.assertEqual(after.search_index.search('faroeste'), [31])
+        self.assertNotIn(2, after.index.by_id)
+        self.assertEqual(len(after), 30)
+        self.assertEqual(before.query(genre='western'), [])
+        self.assertEqual(before.search_index.search('faroeste'), [])
+        self.assertIn(2, before.index.by_id)
+        self.assertEqual(list(after.index.by_id)[-2:], [30, 31])
+
+
+class PersistentMapTests(SimpleTestCase):
+    def test_updated_returns_a_new_version(self):
+        original = PersistentMap({pk: str(pk) for pk in range(100)})
+        updated = original.updated({5: 'cinco', 200: 'novo'}, [7, 300])
+        self.assertEqual((len(original), len(updated)), (100, 100))
+        self.assertEqual((original[5], updated[5], updated[200]), ('5', 'cinco', 'novo'))
+        self.assertIn(7, original)
+        self.assertNotIn(7, updated)
+        self.assertIs(original.updated(), original)
+
+    def test_grows_shards_as_it_grows(self):
+        items = PersistentMap()
+        for pk in range(5000):
+            items = items.updated({pk: pk})
+        self.assertEqual(len(items), 5000)
+        self.assertEqual(dict(items.items()), {pk: pk for pk in range(5000)})
+        self.assertGreater(len(items.shards), 32)
+
+
+class IndexedFiltersApiTests(CatalogFileMixin, APITestCase):
+    def ids(self, url, params=None):
+        response = self.client.get(url, {'cursor': '', 'page_size': 100, **(params or {})})
+        self.assertEqual(response.status_code, 200)
+        return [movie['id'] for movie in response.data['results']]
+
+    def test_genre_year_and_featured_filters(self):
+        self.assertEqual(self.ids('/api/movies/', {'genre': 'sci-fi'}), [3, 8, 13, 18, 23, 28])
+        self.assertEqual(self.ids('/api/movies/genre/Sci-Fi/'), [3, 8, 13, 18, 23, 28])
+        self.assertEqual(self.ids('/api/movies/', {'year': 1993, 'featured': 'true'}), [24])
+        self.assertEqual(self.client.get('/api/movies/', {'year': 'x'}).status_code, 400)
+
+    def test_range_filters_and_ordering(self):
+        self.assertEqual(
+            self.ids('/api/movies/', {'min_rating': 7, 'max_rating': 8}),
+            [movie['id'] for movie in self.movies if 7 <= movie['rating'] <= 8],
+        )
+        self.assertEqual(
+            self.ids('/api/movies/', {'year_from': 1994, 'year_to': 1995, 'max_duration': 100}),
+            [movie['id'] for movie in self.movies
+             if 1994 <= movie['release_year'] <= 1995 and movie['duration_minutes'] <= 100],
+        )
+        by_rating = sorted(self.movies, key=lambda movie: (-movie['rating'], -movie['id']))
+        self.assertEqual(self.ids('/api/movies/', {'ordering': '-rating'}), [movie['id'] for movie in by_rating])
+        self.assertEqual(self.client.get('/api/movies/', {'min_rating': 'alto'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/movies/', {'ordering': 'title'}).status_code, 400)
@@ -0,0 +1,67 @@
+import os
+from unittest import mock
+from django.test import SimpleTestCase
+from movies.encoding import loads
+from movies.journal import MutationLog
+from movies.store import CatalogSnapshot
+from .base import CatalogFileMixin, catalog_state, read_json
+
+
+class MutationLogReplayTests(CatalogFileMixin, SimpleTestCase):
+    def write_some(self):
+        self.store.update(1, lambda movie: {**movie, 'rating': 9.9})
+        self.store.delete(2)
+        self.store.create({'title': 'Novo', 'genre': 'Drama'})
+
+    def test_torn_tail_is_ignored_and_discarded_on_next_write(self):
+        self.write_some()
+        expected = catalog_state(self.store)
+        with open(self.store.log.path, 'ab') as file:
+            file.write(b'{"puts":[{"id":1,"title":"incomp')
+
+        store = self.open_store()
+        self.assertEqual(catalog_state(store), expected)
+        store.update(3, lambda movie: {**movie, 'rating': 1.0})
+        with open(store.log.path, 'rb') as file:
+            for line in file.read().splitlines():
+                loads(line)
+        self.assertEqual(catalog_state(self.open_store()), catalog_state(store))
+
+    def test_crash_after_snapshot_replace_replays_log_idempotently(self):
+        self.write_some()
+        expected = catalog_state(self.store)
+        with mock.patch.object(MutationLog, 'reset', side_effect=OSError('queda')):
+            with self.assertRaises(OSError):
+                self.store.compact()
+        # O snapshot JSON já contém os lotes que continuam no log
+        self.assertEqual(len(read_json(self.path)['movies']), len(expected[0]))
+        self.assertEqual(catalog_state(self.open_store()), expected)
+
+        store = self.open_store()
+        store.compact()
+        self.assertEqual(os.path.getsize(store.log.path), 0)
+        self.assertEqual(catalog_state(self.open_store()), expected)
+
+    def test_crash_before_snapshot_replace_keeps_previous_files(self):
+        self.write_some()
+        expected = catalog_state(self.store)
+        with mock.patch('movies.store.write_atomic', side_effect=OSError('queda')):
+            with self.assertRaises(OSError):
+                self.store.compact()
+        self.assertEqual(read_json(self.path)['seq'], 0)
+        self.assertEqual(catalog_state(self.open_store()), expected)
+
+    def test_pending_batches_are_applied_as_one_update(self):
+        self.store.snapshot()
+        writer = self.open_store()
+        writer.update(1, lambda movie: {**movie, 'rating': 9.9})
+        writer.update(1, lambda movie: {**movie, 'title': 'Outro título'})
+        writer.delete(2)
+        writer.create({'title': 'Novo', 'genre': 'Drama'})
+
+        with mock.patch.object(CatalogSnapshot, 'evolve', autospec=True, side_effect=CatalogSnapshot.evolve) as evolve:
+            state = catalog_state(self.store)
+        self.assertEqual(evolve.call_count, 1)
+        self.assertEqual(state, catalog_state(writer))
+        self.assertEqual(state[1]['seq'], 4)
+        self.assertEqual(self.store.snapshot().search_index.search('outro'), [1])
@@ -0,0 +1,110 @@
+from unittest import mock
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from movies import metrics
+from movies.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, MetricsMiddleware, metrics_view, timed
+
+
+def enabled(value=True):
+    return mock.patch('movies.metrics.METRICS_ENABLED', value)
+
+
+class MetricTypesTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch('movies.metrics._registry', [])
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counter_and_gauge_exposition(self):
+        counter = Counter('test_total', 'Teste', ('route',))
+        Gauge('test_entries', 'Entradas', lambda: 3)
+        with enabled():
+            counter.labels('/a"b').inc()
+            counter.labels('/a"b').inc(2)
+        self.assertEqual(metrics.render(), (
+            '# HELP test_total Teste\n# TYPE test_total counter\ntest_total{route="/a\\"b"} 3\n'
+            '# HELP test_entries Entradas\n# TYPE test_entries gauge\ntest_entries 3\n'
+        ))
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Teste', buckets=(0.1, 1.0))
+        with enabled():
+            for value in (0.05, 0.5, 0.5, 5.0):
+                histogram.observe(value)
+        self.assertEqual(list(histogram.samples()), [
+            'test_seconds_bucket{le="0.1"} 1', 'test_seconds_bucket{le="1.0"} 3', 'test_seconds_bucket{le="+Inf"} 4',
+            'test_seconds_sum 6.05', 'test_seconds_count 4',
+        ])
+
+    def test_disabled_metrics_record_nothing(self):
+        histogram = Histogram('test_seconds', 'Teste')
+        with enabled(False):
+            histogram.observe(1.0)
+            self.assertIs(timed(histogram)(len), len)
+        self.assertEqual(histogram.series, {})
+
+    def test_timed_observes_each_call(self):
+        histogram = Histogram('test_seconds', 'Teste')
+        with enabled():
+            measured = timed(histogram)(sum)
+            self.assertEqual(measured([1, 2]), 3)
+            with self.assertRaises(TypeError):
+                measured(None)
+        self.assertEqual(histogram.series[()].counts[0], 2)
+
+
+class MetricsMiddlewareTests(SimpleTestCase):
+    def test_requests_are_grouped_by_route(self):
+        with enabled():
+            middleware = MetricsMiddleware(lambda request: HttpResponse(status=201))
+            for _ in range(2):
+                request = RequestFactory().get('/api/movies/7/')
+                request.resolver_match = mock.Mock(route='api/movies/<int:pk>/')
+                middleware(request)
+        series = metrics.RESPONSES.series[('api/movies/<int:pk>/', 201)]
+        self.assertGreaterEqual(series.value, 2)
+        self.assertIn(('GET', 'api/movies/<int:pk>/'), metrics.REQUEST_DURATION.series)
+
+    def test_middleware_is_unused_when_disabled(self):
+        with enabled(False), self.assertRaises(MiddlewareNotUsed):
+            MetricsMiddleware(lambda request: HttpResponse())
+
+
+class MetricsViewTests(TestCase):
+    def request(self, user=None, **headers):
+        request = RequestFactory().get('/metrics', **headers)
+        request.user = user or AnonymousUser()
+        return request
+
+    def assert_hidden(self, request):
+        with self.assertRaises(Http404):
+            metrics_view(request)
+
+    def test_token_or_staff_user_can_read(self):
+        staff = User.objects.create_user('ops', is_staff=True)
+        with enabled(), mock.patch('movies.metrics.METRICS_TOKEN', 'segredo'):
+            response = metrics_view(self.request(HTTP_AUTHORIZATION='Bearer segredo'))
+            self.assertEqual(response['Content-Type'], CONTENT_TYPE)
+            self.assertIn(b'# TYPE movies_http_responses_total counter', response.content)
+            self.assertEqual(metrics_view(self.request(staff)).status_code, 200)
+
+    def test_everyone_else_gets_404(self):
+        user = User.objects.create_user('ana')
+        inactive = User.objects.create_user('ex', is_staff=True, is_active=False)
+        with enabled(), mock.patch('movies.metrics.METRICS_TOKEN', 'segredo'):
+            self.assert_hidden(self.request())
+            self.assert_hidden(self.request(user))
+            self.assert_hidden(self.request(inactive))
+            self.assert_hidden(self.request(HTTP_AUTHORIZATION='Bearer errado'))
+            self.assert_hidden(self.request(HTTP_AUTHORIZATION='Basic segredo'))
+            # O endereço de origem não autoriza
+            self.assert_hidden(self.request(REMOTE_ADDR='127.0.0.1'))
+        with enabled(), mock.patch('movies.metrics.METRICS_TOKEN', None):
+            self.assert_hidden(self.request(HTTP_AUTHORIZATION='Bearer '))
+
+    def test_disabled_metrics_are_hidden_even_from_staff(self):
+        staff = User.objects.create_user('ops', is_staff=True)
+        with enabled(False):
+            self.assert_hidden(self.request(staff))
@@ -0,0 +1,55 @@
+from unittest import mock
+from rest_framework.test import APITestCase
+from .base import CatalogFileMixin
+
+
+class MultiGetTests(CatalogFileMixin, APITestCase):
+    def get(self, **params):
+        return self.client.get('/api/movies/', params)
+
+    def test_ids_keep_requested_order_without_repeats(self):
+        response = self.get(ids='9,1,999,9,5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([movie['id'] for movie in response.data['results']], [9, 1, 5])
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['missing'], [999])
+        self.assertEqual(response.data['results'][1], self.movies[0])
+
+    def test_imdb_ids(self):
+        response = self.get(imdb_ids='tt0000003, tt9999999,tt0000002')
+        self.assertEqual([movie['id'] for movie in response.data['results']], [3, 2])
+        self.assertEqual(response.data['missing'], ['tt9999999'])
+
+    def test_empty_list_returns_no_movies(self):
+        response = self.get(ids='')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['count'], response.data['results'], response.data['missing']), (0, [], []))
+
+    def test_invalid_requests_are_rejected(self):
+        for params in ({'ids': '1,x'}, {'ids': '1', 'imdb_ids': 'tt0000001'}, {'ids': '1', 'view': 'mini'}):
+            with self.subTest(**params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.data)
+
+    def test_too_many_ids_are_rejected(self):
+        with mock.patch('movies.views.MULTI_GET_MAX_IDS', 3):
+            self.assertEqual(self.get(ids='1,2,3').status_code, 200)
+            self.assertEqual(self.get(ids='1,2,3,4').status_code, 400)
+            # Repetições não contam para o limite
+            self.assertEqual(self.get(ids='1,2,3,3,2').status_code, 200)
+
+    def test_projection_applies_to_each_movie(self):
+        response = self.get(ids='2,1', fields='id,title')
+        self.assertEqual(response.data['results'], [
+            {'id': 2, 'title': 'A Noite do Amor 2'}, {'id': 1, 'title': 'Coração Valente 1'},
+        ])
+
+    def test_reflects_writes(self):
+        response = self.get(ids='4,5')
+        revalidated = self.client.get('/api/movies/', {'ids': '4,5'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.store.delete(4)
+        response = self.get(ids='4,5')
+        self.assertEqual([movie['id'] for movie in response.data['results']], [5])
+        self.assertEqual(response.data['missing'], [4])
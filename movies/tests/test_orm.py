@@ -0,0 +1,68 @@
+from django.test import TestCase
+from movies.models import CatalogState
+from movies.orm_store import OrmMovieStore
+from .base import CatalogFileMixin, make_movies
+
+
+# Consultas comparadas entre os backends: acentos, prefixos, gêneros compostos, ordenações e cursores
+PARITY_QUERIES = (
+    {'search': 'acao'}, {'search': 'Ação'}, {'search': 'cora'}, {'search': 'noite amor'}, {'search': 'jose'},
+    {'search': 'xyz'}, {'genre': 'drama'}, {'genre': 'SCI-FI'}, {'genre': 'action, drama'}, {'genre': 'dra'},
+    {'search': 'amor', 'ordering': '-rating'}, {'genre': 'drama', 'ordering': 'release_year'},
+    {'featured': True, 'ordering': '-duration_minutes'}, {'ranges': {'rating': (6.0, 8.0)}, 'ordering': 'rating'},
+)
+
+
+class BackendParityTests(CatalogFileMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.orm = OrmMovieStore()
+        self.orm.apply(puts=self.movies)
+
+    def assert_same_results(self):
+        json_snapshot, orm_snapshot = self.store.snapshot(), self.orm.snapshot()
+        for filters in PARITY_QUERIES:
+            with self.subTest(**filters):
+                expected = [key for key, _ in json_snapshot.iter_ordered(**filters)]
+                keys = [key for key, _ in orm_snapshot.iter_ordered(**filters)]
+                self.assertEqual([tuple(map(float, key)) for key in keys], [tuple(map(float, key)) for key in expected])
+                self.assertEqual(orm_snapshot.count(**filters), json_snapshot.count(**filters))
+                if len(expected) > 2:
+                    after = expected[len(expected) // 2]
+                    self.assertEqual(
+                        [movie['id'] for _, movie in orm_snapshot.iter_ordered(after=after, **filters)],
+                        [movie['id'] for _, movie in json_snapshot.iter_ordered(after=after, **filters)],
+                    )
+
+    def test_same_results_for_same_query(self):
+        self.assert_same_results()
+
+    def test_same_results_after_writes(self):
+        puts = [{**self.movies[0], 'title': 'Noite Nova', 'genre': 'Western, Drama'}]
+        for store in (self.store, self.orm):
+            store.apply(puts=puts, deletes=[5, 6])
+        self.assert_same_results()
+        self.assertEqual(self.orm.snapshot().index.get(1)['genre'], 'Western, Drama')
+
+
+class OrmCatalogStateTests(TestCase):
+    def setUp(self):
+        self.orm = OrmMovieStore()
+
+    def test_migration_creates_the_state_row(self):
+        self.assertTrue(CatalogState.objects.filter(pk=1).exists())
+
+    def test_snapshot_only_reads_the_state(self):
+        with self.assertNumQueries(1):
+            snapshot = self.orm.snapshot()
+        self.assertEqual((snapshot.seq, snapshot.last_id), (0, 0))
+
+    def test_missing_state_row_is_created_by_the_first_write(self):
+        CatalogState.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.orm.snapshot().seq, 0)
+        self.assertFalse(CatalogState.objects.exists())
+        self.orm.create(make_movies(1)[0])
+        state = CatalogState.objects.get(pk=1)
+        self.assertEqual((state.seq, state.last_id), (1, 1))
+        self.assertEqual(self.orm.snapshot().index.get(1)['title'], make_movies(1)[0]['title'])
@@ -0,0 +1,66 @@
+from rest_framework.test import APITestCase
+from movies.views import ORDERING_FIELDS
+from .base import CatalogFileMixin
+
+
+class CursorPaginationTests(CatalogFileMixin, APITestCase):
+    def first_page(self, **params):
+        return self.client.get('/api/movies/', {'cursor': '', 'page_size': 4, **params})
+
+    def walk(self, **params):
+        """Ids de todas as páginas seguindo ``next`` a partir da primeira"""
+        return self.follow(self.first_page(**params))
+
+    def follow(self, response):
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            ids.extend(movie['id'] for movie in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_round_trip_under_every_ordering(self):
+        for field in ORDERING_FIELDS:
+            with self.subTest(ordering=field):
+                forward = self.walk(ordering=field)
+                expected = [movie['id'] for movie in self.store.snapshot().query(ordering=field)]
+                self.assertEqual(forward, expected)
+                self.assertEqual(len(set(forward)), len(self.movies))
+                # A ordem decrescente percorre exatamente o caminho inverso (desempate por id)
+                self.assertEqual(self.walk(ordering=f'-{field}'), forward[::-1])
+
+    def test_round_trip_by_relevance(self):
+        ids = self.walk(search='noite')
+        self.assertEqual(ids, [movie['id'] for movie in self.store.snapshot().query(search='noite')])
+        self.assertTrue(ids)
+
+    def test_inserted_movie_does_not_shift_pages(self):
+        response = self.first_page(ordering='rating')
+        first = [movie['id'] for movie in response.data['results']]
+        self.store.create({'title': 'Pior', 'rating': 0.0})
+        response = self.client.get(response.data['next'])
+        expected = sorted(self.movies, key=lambda movie: (movie['rating'], movie['id']))
+        self.assertEqual(first + self.follow(response), [movie['id'] for movie in expected])
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        next_url = self.first_page(ordering='rating').data['next']
+        response = self.client.get(next_url.replace('ordering=rating', 'ordering=-rating'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_tampered_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/movies/', {'cursor': 'não-é-um-cursor'}).status_code, 400)
+
+    def test_count_is_optional(self):
+        response = self.first_page(genre='drama')
+        self.assertEqual(response.data['count'], self.store.snapshot().count(genre='drama'))
+        self.assertNotIn('count', self.first_page(genre='drama', count='false').data)
+        response = self.client.get('/api/movies/', {'count': 'false'})
+        self.assertNotIn('count', response.data)
+        self.assertNotIn('count', response.data['results'])
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(len(self.first_page(page_size=0).data['results']), 1)
+        response = self.client.get('/api/movies/', {'cursor': '', 'page_size': 1000})
+        self.assertEqual(len(response.data['results']), len(self.movies))
+        self.assertIsNone(response.data['next'])
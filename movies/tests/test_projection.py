@@ -0,0 +1,71 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies import projection
+from movies.projection import CARD_FIELDS, InvalidProjection, movie_card, parse_projection
+from .base import CatalogFileMixin, make_movies
+
+
+class ParseProjectionTests(SimpleTestCase):
+    def setUp(self):
+        projection._cards.clear()
+
+    def test_full_view_without_fields_needs_no_projection(self):
+        self.assertIsNone(parse_projection({}))
+        self.assertIsNone(parse_projection({'view': 'full', 'fields': ' , '}))
+
+    def test_invalid_values(self):
+        for params in ({'view': 'mini'}, {'fields': 'id', 'exclude': 'title'}):
+            with self.subTest(**params), self.assertRaises(InvalidProjection):
+                parse_projection(params)
+
+    def test_fields_exclude_and_card(self):
+        movie = make_movies(1)[0]
+        self.assertEqual(parse_projection({'fields': 'title,id,title,nada'})(movie), {'title': movie['title'], 'id': 1})
+        self.assertNotIn('description', parse_projection({'exclude': 'description'})(movie))
+        self.assertEqual(tuple(parse_projection({'view': 'card'})(movie)), CARD_FIELDS)
+        self.assertEqual(parse_projection({'view': 'card', 'fields': 'id,description'})(movie), {'id': 1})
+
+    def test_card_is_reused_until_the_movie_changes(self):
+        movie = make_movies(1)[0]
+        card = movie_card(movie)
+        self.assertIs(movie_card(dict(movie)), card)
+        self.assertIsNot(movie_card({**movie, 'version': 2, 'title': 'Outro'}), card)
+        self.assertEqual(movie_card({**movie, 'version': 2, 'title': 'Outro'})['title'], 'Outro')
+
+    def test_columns(self):
+        self.assertEqual(parse_projection({'fields': 'title,id'}).columns(('id',)), ('title', 'id'))
+        self.assertEqual(parse_projection({'exclude': 'b'}).columns(('a', 'b', 'c')), ('a', 'c'))
+        self.assertEqual(parse_projection({'view': 'card', 'exclude': 'genre'}).columns(()), CARD_FIELDS[:-1])
+
+
+class ProjectionApiTests(CatalogFileMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        projection._cards.clear()
+
+    def test_list_pages_are_projected(self):
+        page = self.client.get('/api/movies/', {'view': 'card'}).data['results']['results']
+        self.assertEqual([tuple(movie) for movie in page], [CARD_FIELDS] * len(page))
+        data = self.client.get('/api/movies/', {'fields': 'id,rating', 'ordering': '-rating'}).data
+        self.assertEqual(data['results']['results'][0], {'id': 29, 'rating': 8.2})
+
+    def test_cursor_pages_are_projected(self):
+        data = self.client.get('/api/movies/', {'cursor': '', 'page_size': 2, 'fields': 'id'}).data
+        self.assertEqual(data['results'], [{'id': 1}, {'id': 2}])
+        data = self.client.get(data['next']).data
+        self.assertEqual(data['results'], [{'id': 3}, {'id': 4}])
+
+    def test_detail_is_projected(self):
+        self.assertEqual(self.client.get('/api/movies/3/', {'fields': 'title'}).data, {'title': 'Amores Perdidos 3'})
+        self.assertNotIn('actors', self.client.get('/api/movies/3/', {'exclude': 'actors'}).data)
+
+    def test_card_reflects_updates(self):
+        self.client.get('/api/movies/', {'view': 'card'})
+        self.store.update(1, lambda movie: {**movie, 'title': 'Título Novo'})
+        page = self.client.get('/api/movies/', {'view': 'card'}).data['results']['results']
+        self.assertEqual(page[0]['title'], 'Título Novo')
+
+    def test_invalid_projection_is_rejected(self):
+        for url in ('/api/movies/', '/api/movies/1/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, {'view': 'mini'}).status_code, 400)
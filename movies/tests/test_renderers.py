@@ -0,0 +1,67 @@
+import json
+from decimal import Decimal
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies import renderers
+from movies.encoding import dumps, loads
+from movies.renderers import CatalogJSONRenderer, encode, movie_fragment
+from .base import CatalogFileMixin, make_movies
+
+
+class EncodingTests(SimpleTestCase):
+    def test_compact_utf8_output(self):
+        value = {'title': 'Coração', 'rating': 7.5, 'genres': ['Ação'], 'ok': True, 'nada': None}
+        self.assertEqual(dumps(value), json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        self.assertEqual(loads(dumps(value)), value)
+
+    def test_drf_types_are_encoded(self):
+        self.assertEqual(loads(dumps({'preco': Decimal('1.5')})), {'preco': 1.5})
+
+
+class FragmentTests(SimpleTestCase):
+    def setUp(self):
+        renderers._fragments.clear()
+        self.addCleanup(renderers._fragments.clear)
+
+    def test_fragment_is_built_once_per_movie_object(self):
+        movie = make_movies(1)[0]
+        fragment = movie_fragment(movie)
+        self.assertEqual(loads(fragment), movie)
+        self.assertIs(movie_fragment(movie), fragment)
+        self.assertIsNot(movie_fragment(dict(movie)), fragment)
+
+    def test_fragment_cache_is_bounded(self):
+        with mock.patch('movies.renderers.FRAGMENT_CACHE_SIZE', 5):
+            movies = make_movies(8)
+            for movie in movies:
+                movie_fragment(movie)
+        self.assertEqual(len(renderers._fragments), 5)
+        self.assertNotIn(id(movies[0]), renderers._fragments)
+
+    def test_encode_splices_only_catalog_movies(self):
+        movies = make_movies(3)
+        by_id = {movie['id']: movie for movie in movies}
+        projected = {'id': 2, 'title': movies[1]['title']}
+        envelope = {'count': 3, 'next': None, 'results': [movies[0], projected, movies[2]]}
+        self.assertEqual(loads(encode(envelope, by_id)), envelope)
+        self.assertEqual(set(renderers._fragments), {id(movies[0]), id(movies[2])})
+
+
+class CatalogJSONRendererTests(CatalogFileMixin, APITestCase):
+    def test_responses_match_plain_json(self):
+        for url in ('/api/movies/', '/api/movies/?ordering=-rating&page=2', '/api/movies/5/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(loads(response.content), json.loads(response.content.decode('utf-8')))
+        self.assertEqual(loads(self.client.get('/api/movies/5/').content), self.movies[4])
+
+    def test_renders_empty_body_for_none(self):
+        self.assertEqual(CatalogJSONRenderer().render(None), b'')
+
+    def test_updated_movie_is_not_served_from_a_stale_fragment(self):
+        self.client.get('/api/movies/')
+        self.store.update(1, lambda movie: {**movie, 'title': 'Título Novo'})
+        page = loads(self.client.get('/api/movies/').content)['results']['results']
+        self.assertEqual(page[0]['title'], 'Título Novo')
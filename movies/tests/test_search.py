@@ -0,0 +1,58 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.search import SearchIndex, fold, tokenize
+from .base import CatalogFileMixin, new_movie
+
+MOVIES = [
+    {'id': 1, 'title': 'O Poderoso Chefão', 'description': 'Uma família da máfia'},
+    {'id': 2, 'title': 'Família Addams', 'description': 'Comédia sombria', 'director': 'Barry Sonnenfeld'},
+    {'id': 3, 'title': 'Cidade de Deus', 'description': 'Chefão do tráfico na cidade', 'actors': 'Alexandre Rodrigues'},
+]
+
+
+class SearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SearchIndex(MOVIES)
+
+    def test_fold_and_tokenize(self):
+        self.assertEqual(fold('Ação CORAÇÃO'), 'acao coracao')
+        self.assertEqual(tokenize('Chefão, do-tráfico!'), ['chefao', 'do', 'trafico'])
+
+    def test_title_hits_rank_above_plot_hits(self):
+        self.assertEqual(self.index.search('chefao'), [1, 3])
+        self.assertEqual(self.index.search('familia'), [2, 1])
+
+    def test_prefix_and_all_terms(self):
+        self.assertEqual(self.index.search('cid'), [3])
+        self.assertEqual(self.index.search('chef cidade'), [3])
+        self.assertEqual(self.index.search('sonnen'), [2])
+        self.assertEqual(self.index.search('rodrigues familia'), [])
+        self.assertEqual(self.index.search('  '), [])
+
+    def test_exact_token_outranks_prefix(self):
+        index = SearchIndex([{'id': 1, 'title': 'Amores'}, {'id': 2, 'title': 'Amor'}])
+        self.assertEqual(index.ranked('amor'), [(2, 10.0), (1, 5.0)])
+
+    def test_updated_is_incremental_and_leaves_old_index(self):
+        changed = {**MOVIES[0], 'title': 'Poderoso'}
+        index = self.index.updated([MOVIES[0], MOVIES[2]], [changed])
+        self.assertEqual(index.search('chefao'), [])
+        self.assertEqual(index.search('poderoso'), [1])
+        self.assertEqual(self.index.search('chefao'), [1, 3])
+        self.assertEqual(list(index.terms()), list(SearchIndex([changed, MOVIES[1]]).terms()))
+
+
+class SearchApiTests(CatalogFileMixin, APITestCase):
+    def search(self, term):
+        response = self.client.get('/api/movies/', {'search': term, 'cursor': '', 'page_size': 100})
+        return [movie['id'] for movie in response.data['results']]
+
+    def test_search_follows_writes(self):
+        self.assertEqual(self.search('valente'), [1, 6, 11, 16, 21, 26])
+        created = self.client.post('/api/movies/', new_movie(title='Valentia Pura'), format='json')
+        self.assertEqual(created.status_code, 201)
+        self.assertIn(created.data['id'], self.search('valent'))
+        self.client.patch('/api/movies/1/', {'title': 'Sem Nome'}, format='json')
+        self.client.delete('/api/movies/6/')
+        self.assertEqual(self.search('valente'), [11, 16, 21, 26])
+        self.assertEqual(self.search('sem nome'), [1])
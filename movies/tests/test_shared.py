@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+from movies.encoding import dumps
+from movies.shared import FOOTER, open_image
+from movies.store import MovieStore, file_signature
+from .base import CatalogFileMixin
+
+
+class SharedImageFallbackTests(CatalogFileMixin, SimpleTestCase):
+    shared = True
+
+    def corrupt(self, transform):
+        """Publica a imagem, aplica ``transform(bytes) -> bytes`` e retorna a assinatura do JSON"""
+        self.assertEqual(self.store.publish_image(), 'built')
+        with open(self.store.image_path, 'rb') as file:
+            data = file.read()
+        with open(self.store.image_path, 'wb') as file:
+            file.write(transform(data))
+        return file_signature(self.path)
+
+    def assert_falls_back_to_json(self, transform):
+        signature = self.corrupt(transform)
+        self.assertIsNone(open_image(self.store.image_path, signature))
+        store = self.open_store()
+        self.assertEqual([movie['id'] for movie in store.snapshot()], [movie['id'] for movie in self.movies])
+        self.assertEqual(store.snapshot().query(search='coracao')[0]['title'], 'Coração Valente 1')
+        # A imagem é refeita a partir do JSON
+        self.assertIsNotNone(open_image(self.store.image_path, signature))
+
+    def test_garbage_file(self):
+        self.assert_falls_back_to_json(lambda data: b'\0' * len(data))
+
+    def test_truncated_file(self):
+        self.assert_falls_back_to_json(lambda data: data[:len(data) // 2])
+
+    def test_garbled_header(self):
+        def garble(data):
+            offset, length = FOOTER.unpack_from(data, len(data) - FOOTER.size)[:2]
+            return data[:offset] + b'{' * length + data[offset + length:]
+        self.assert_falls_back_to_json(garble)
+
+    def test_header_pointing_outside_file(self):
+        def stretch(data):
+            offset, length, *rest = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+            return data[:-FOOTER.size] + FOOTER.pack(offset, length * 100, *rest)
+        self.assert_falls_back_to_json(stretch)
+
+    def test_writes_over_mapped_image_match_json_layout(self):
+        self.store.publish_image()
+        self.store.update(3, lambda movie: {**movie, 'rating': 0.5, 'title': 'Reescrito'})
+        self.store.delete(4)
+        shared = self.store.snapshot()
+        private = MovieStore(self.path, shared=False).snapshot()
+        queries = ({'ordering': '-rating'}, {'search': 'reescrito'}, {'genre': 'drama', 'ordering': 'duration_minutes'})
+        for filters in queries:
+            with self.subTest(**filters):
+                self.assertEqual(dumps(list(shared.query(**filters))), dumps(list(private.query(**filters))))
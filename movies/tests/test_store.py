@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.store import load_movies
+from .base import CatalogFileMixin, make_movies, write_catalog
+
+
+class MovieStoreReloadTests(CatalogFileMixin, SimpleTestCase):
+    def test_snapshot_is_reused_while_files_are_unchanged(self):
+        snapshot = self.store.snapshot()
+        self.assertIs(self.store.snapshot(), snapshot)
+        self.assertEqual([movie['id'] for movie in snapshot], [movie['id'] for movie in self.movies])
+
+    def test_replaced_file_is_reloaded(self):
+        snapshot = self.store.snapshot()
+        write_catalog(self.path, make_movies(5))
+        self.assertEqual(len(self.store.snapshot()), 5)
+        # Quem já tinha o snapshot anterior continua com o catálogo inteiro
+        self.assertEqual(len(snapshot), len(self.movies))
+
+    def test_snapshot_is_isolated_from_later_writes(self):
+        snapshot = self.store.snapshot()
+        self.store.update(1, lambda movie: {**movie, 'title': 'Outro'})
+        self.store.delete(2)
+        self.assertEqual(snapshot.index.get(1)['title'], self.movies[0]['title'])
+        self.assertIsNotNone(snapshot.index.get(2))
+        self.assertEqual(self.store.snapshot().index.get(1)['title'], 'Outro')
+
+    def test_load_movies_reads_the_process_store(self):
+        self.assertEqual(load_movies(), list(self.store.snapshot()))
+
+
+class StoreBackedViewsTests(CatalogFileMixin, APITestCase):
+    def test_views_follow_the_file(self):
+        self.assertEqual(self.client.get('/api/movies/3/').data['title'], self.movies[2]['title'])
+        write_catalog(self.path, [{**self.movies[2], 'title': 'Trocado'}])
+        self.assertEqual(self.client.get('/api/movies/3/').data['title'], 'Trocado')
+        self.assertEqual(self.client.get('/api/movies/1/').status_code, 404)
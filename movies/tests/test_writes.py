@@ -0,0 +1,87 @@
+import threading
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from movies.store import VersionConflict
+from .base import CatalogFileMixin, catalog_state, new_movie
+
+
+class ConcurrentWriterTests(CatalogFileMixin, SimpleTestCase):
+    def test_ids_are_unique_across_stores_and_never_reused(self):
+        other = self.open_store()
+        first = self.store.create({'title': 'Primeiro'})
+        second = other.create({'title': 'Segundo'})
+        self.assertEqual((first['id'], second['id']), (31, 32))
+        other.delete(32)
+        self.assertEqual(self.store.create({'title': 'Terceiro'})['id'], 33)
+        self.assertEqual(catalog_state(self.open_store()), catalog_state(other))
+
+    def test_concurrent_creates_from_several_stores_keep_every_movie(self):
+        stores = [self.open_store() for _ in range(4)]
+        created, errors = [], []
+
+        def create(store, worker):
+            try:
+                for number in range(10):
+                    created.append(store.create({'title': f'Filme {worker}.{number}'})['id'])
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=create, args=(store, worker)) for worker, store in enumerate(stores)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(created), list(range(31, 71)))
+        movies, meta = catalog_state(self.open_store())
+        self.assertEqual(len(movies), 70)
+        self.assertEqual(meta['last_id'], 70)
+
+    def test_updates_from_another_store_are_not_lost(self):
+        other = self.open_store()
+        self.store.update(1, lambda movie: {**movie, 'rating': 9.1})
+        other.update(1, lambda movie: {**movie, 'title': 'Novo título'})
+        movie = self.open_store().snapshot().index.get(1)
+        self.assertEqual((movie['rating'], movie['title'], movie['version']), (9.1, 'Novo título', 3))
+
+
+class MovieVersionTests(CatalogFileMixin, SimpleTestCase):
+    def test_each_write_bumps_the_version(self):
+        self.assertEqual(self.store.create({'title': 'Novo'})['version'], 1)
+        self.assertEqual(self.store.update(1, lambda movie: {**movie, 'rating': 1.0})['version'], 2)
+        self.assertEqual(self.store.update(1, lambda movie: movie, expected_versions={2})['version'], 3)
+
+    def test_unexpected_version_raises_conflict(self):
+        self.store.update(1, lambda movie: {**movie, 'rating': 1.0})
+        with self.assertRaises(VersionConflict) as raised:
+            self.store.update(1, lambda movie: {**movie, 'rating': 2.0}, expected_versions={1})
+        self.assertEqual(raised.exception.movie['version'], 2)
+        with self.assertRaises(VersionConflict):
+            self.store.delete(1, expected_versions={1})
+        self.assertEqual(self.store.snapshot().index.get(1)['rating'], 1.0)
+
+
+class IfMatchApiTests(CatalogFileMixin, APITestCase):
+    def test_writes_return_the_movie_etag(self):
+        response = self.client.post('/api/movies/', new_movie(), format='json')
+        self.assertEqual(response['ETag'], '"31.1"')
+        response = self.client.put('/api/movies/31/', new_movie(title='Outro'), format='json', HTTP_IF_MATCH='"31.1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"31.2"')
+
+    def test_stale_if_match_gets_412_with_current_etag(self):
+        self.client.patch('/api/movies/2/', {'rating': 6.0}, format='json')
+        for method in ('put', 'patch', 'delete'):
+            response = getattr(self.client, method)(
+                '/api/movies/2/', new_movie(), format='json', HTTP_IF_MATCH='"2.1"',
+            )
+            self.assertEqual(response.status_code, 412, method)
+            self.assertEqual(response['ETag'], '"2.2"')
+            self.assertEqual(response.data['current_version'], 2)
+        self.assertEqual(self.store.snapshot().index.get(2)['rating'], 6.0)
+
+    def test_matching_or_wildcard_if_match_is_accepted(self):
+        response = self.client.patch('/api/movies/3/', {'rating': 6.0}, format='json', HTTP_IF_MATCH='"9.1", "3.1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.delete('/api/movies/3/', HTTP_IF_MATCH='*').status_code, 204)
+        self.assertEqual(self.client.delete('/api/movies/4/', HTTP_IF_MATCH='"4.1"').status_code, 204)
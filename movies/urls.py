@@ -1,9 +1,19 @@
+from django.conf import settings
 from django.urls import path
-from . import views
-
-urlpatterns = [
-    path('movies/', views.get_all_movies, name='all-movies'),
-    path('movies/<int:pk>/', views.movie_detail, name='movie-detail'),
-    path('movies/genre/<str:genre>/', views.get_movies_by_genre, name='movies-by-genre'),
-    path('movies/featured/', views.get_featured_movies, name='featured-movies'),
-]
\ No newline at end of file
+from . import async_views, views
+
+
+def api_urlpatterns(api):
+    """Rotas da API servidas pelas views de ``api`` (``views`` ou ``async_views``); a exportação é sempre síncrona"""
+    return [
+        path('movies/', api.get_all_movies, name='all-movies'),
+        path('movies/bulk/', api.bulk_movies, name='bulk-movies'),
+        path('movies/export/', views.export_movies, name='export-movies'),
+        path('movies/<int:pk>/', api.movie_detail, name='movie-detail'),
+        path('movies/genre/<str:genre>/', api.get_movies_by_genre, name='movies-by-genre'),
+        path('movies/featured/', api.get_featured_movies, name='featured-movies'),
+    ]
+
+
+# Views assíncronas no deploy ASGI (ver MOVIES_ASYNC_VIEWS)
+urlpatterns = api_urlpatterns(async_views if getattr(settings, 'MOVIES_ASYNC_VIEWS', False) else views)
@@ -1,37 +1,41 @@
-import json
-import os
-from datetime import datetime
-from django.conf import settings
 from django.core.validators import URLValidator
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from .cache import cache_list_response
+from .conditional import (
+    catalog_last_modified,
+    conditional_get,
+    movie_detail_etag,
+    movie_detail_last_modified,
+    movie_etag,
+    query_etag,
+)
+from .export import EXPORT_FORMATS
+from .metrics import PAGINATE_DURATION, timed
+from .pagination import InvalidCursor, cursor_paginate_response, wants_count
+from .projection import InvalidProjection, parse_projection
+from .store import VersionConflict, get_store, movie_version
 
-JSON_FILE_PATH = os.path.join(settings.BASE_DIR, 'movies', 'data', 'movies.json')
-os.makedirs(os.path.dirname(JSON_FILE_PATH), exist_ok=True)
-
-
-def load_movies():
-    """Carrega filmes do arquivo JSON"""
-    try:
-        if os.path.exists(JSON_FILE_PATH):
-            with open(JSON_FILE_PATH, 'r', encoding='utf-8') as file:
-                return json.load(file).get('movies', [])
-        return []
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-
-def save_movies(movies):
-    """Salva filmes no arquivo JSON"""
-    try:
-        with open(JSON_FILE_PATH, 'w', encoding='utf-8') as file:
-            json.dump({'movies': movies}, file, ensure_ascii=False, indent=2)
-        return True
-    except Exception:
-        return False
+# (campo, parâmetro mínimo, parâmetro máximo, conversão) dos filtros por faixa
+RANGE_PARAMS = (
+    ('rating', 'min_rating', 'max_rating', float),
+    ('release_year', 'year_from', 'year_to', int),
+    ('duration_minutes', 'min_duration', 'max_duration', int),
+)
+ORDERING_FIELDS = ('id', 'rating', 'release_year', 'duration_minutes')
+BULK_OPERATIONS = ('create', 'update', 'patch', 'delete')
+# Máximo de ids aceitos por consulta em ?ids= / ?imdb_ids=
+MULTI_GET_MAX_IDS = getattr(settings, 'MOVIES_MULTI_GET_MAX_IDS', 200)
+# Limite de operações aceitas por requisição em /api/movies/bulk/
+BULK_MAX_OPERATIONS = getattr(settings, 'MOVIES_BULK_MAX_OPERATIONS', 10000)
 
 
 def validate_movie(data, is_update=False):
@@ -83,75 +87,230 @@ def validate_movie(data, is_update=False):
     return errors
 
 
-def paginate_response(movies, request):
-    """Aplica paginação e retorna resposta"""
+@timed(PAGINATE_DURATION)
+def paginate_response(movies, request, project=None):
+    """Aplica paginação e retorna resposta; ``project`` é aplicado só aos filmes da página"""
     paginator = PageNumberPagination()
     paginator.page_size = 10
     paginator.max_page_size = 100
     page = paginator.paginate_queryset(movies, request)
     
     if page is not None:
-        return paginator.get_paginated_response({
+        if project:
+            page = [project(movie) for movie in page]
+        response = paginator.get_paginated_response({
             'count': len(movies),
             'results': page
         })
-    return Response({'count': len(movies), 'results': movies})
+    else:
+        results = [project(movie) for movie in movies] if project else movies
+        response = Response({'count': len(movies), 'results': results})
+    if not wants_count(request):
+        response.data.pop('count', None)
+        if isinstance(response.data.get('results'), dict):
+            response.data['results'].pop('count', None)
+    return response
 
 
-def find_movie(movies, pk):
-    """Encontra filme por ID e retorna (movie, index)"""
-    for i, m in enumerate(movies):
-        if m.get('id') == pk:
-            return m, i
-    return None, None
+def list_response(snapshot, filters, request):
+    """Responde a listagem paginada por página (padrão) ou por cursor (``?cursor=``)"""
+    try:
+        project = parse_projection(request.query_params)
+    except InvalidProjection as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    if 'cursor' in request.query_params:
+        try:
+            return cursor_paginate_response(snapshot, filters, request, project)
+        except InvalidCursor as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    return paginate_response(snapshot.query(**filters), request, project)
 
 
-@api_view(['GET', 'POST'])
-def get_all_movies(request):
-    """GET: Lista filmes com filtros | POST: Cria novo filme"""
-    if request.method == 'GET':
-        movies = load_movies()
-        params = request.query_params
-        
-        if params.get('search'):
-            search = params['search'].lower()
-            movies = [m for m in movies if search in m.get('title', '').lower() or search in m.get('description', '').lower()]
-        
-        if params.get('genre'):
-            movies = [m for m in movies if m.get('genre', '').lower() == params['genre'].lower()]
-        
-        if params.get('min_rating'):
-            try:
-                min_rating = float(params['min_rating'])
-                movies = [m for m in movies if float(m.get('rating', 0)) >= min_rating]
-            except ValueError:
-                return Response({'error': 'min_rating deve ser um número válido'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        if params.get('year'):
+def multi_get_response(snapshot, params):
+    """Busca vários filmes por ``?ids=1,5,9`` ou ``?imdb_ids=tt...`` em uma requisição.
+
+    Os filmes vêm na ordem pedida (sem repetições) e os ids inexistentes são
+    listados em ``missing``.
+    """
+    if params.get('ids') is not None and params.get('imdb_ids') is not None:
+        return Response({'error': 'Use ids ou imdb_ids, não os dois'}, status=status.HTTP_400_BAD_REQUEST)
+    if params.get('ids') is not None:
+        try:
+            keys = [int(value) for value in params['ids'].split(',') if value.strip()]
+        except ValueError:
+            return Response({'error': 'ids deve ser uma lista de números inteiros separados por vírgula'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        lookup = snapshot.index.get
+    else:
+        keys = [value.strip() for value in params['imdb_ids'].split(',') if value.strip()]
+        lookup = snapshot.index.get_by_imdb_id
+    try:
+        project = parse_projection(params)
+    except InvalidProjection as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    keys = list(dict.fromkeys(keys))
+    if len(keys) > MULTI_GET_MAX_IDS:
+        return Response({'error': f'No máximo {MULTI_GET_MAX_IDS} ids por requisição'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    results, missing = [], []
+    for key in keys:
+        movie = lookup(key)
+        if movie is None:
+            missing.append(key)
+        else:
+            results.append(project(movie) if project else movie)
+    return Response({'count': len(results), 'results': results, 'missing': missing})
+
+
+def parse_list_filters(params):
+    """Converte os parâmetros de query em filtros do catálogo.
+
+    Retorna (filtros, erro); ``erro`` é a mensagem do primeiro parâmetro inválido.
+    """
+    filters = {
+        'search': params.get('search') or None,
+        'genre': params.get('genre') or None,
+        'ranges': {},
+    }
+    
+    if params.get('year'):
+        try:
+            filters['year'] = int(params['year'])
+        except ValueError:
+            return None, 'year deve ser um número inteiro válido'
+    
+    if params.get('featured') is not None:
+        filters['featured'] = params['featured'].lower() in ('true', '1', 'yes')
+    
+    for field, low_param, high_param, cast in RANGE_PARAMS:
+        bounds = []
+        for name in (low_param, high_param):
             try:
-                year = int(params['year'])
-                movies = [m for m in movies if m.get('release_year') == year]
+                bounds.append(cast(params[name]) if params.get(name) else None)
             except ValueError:
-                return Response({'error': 'year deve ser um número inteiro válido'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        if params.get('featured') is not None:
-            featured = params['featured'].lower() in ('true', '1', 'yes')
-            movies = [m for m in movies if m.get('is_featured', False) == featured]
-        
-        return paginate_response(movies, request)
+                kind = 'um número válido' if cast is float else 'um número inteiro válido'
+                return None, f'{name} deve ser {kind}'
+        if bounds != [None, None]:
+            filters['ranges'][field] = tuple(bounds)
+    
+    ordering = params.get('ordering')
+    if ordering:
+        if ordering.lstrip('-') not in ORDERING_FIELDS:
+            return None, f'ordering deve ser um de: {", ".join(ORDERING_FIELDS)} (use "-" para ordem decrescente)'
+        filters['ordering'] = ordering
     
-    # POST
-    data = request.data
+    return filters, None
+
+
+def list_movies(snapshot, request):
+    """Listagem com filtros ou busca de vários filmes por ``?ids=`` (GET de /movies/)"""
+    if 'ids' in request.query_params or 'imdb_ids' in request.query_params:
+        return multi_get_response(snapshot, request.query_params)
+    filters, error = parse_list_filters(request.query_params)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    return list_response(snapshot, filters, request)
+
+
+def list_movies_by_genre(snapshot, request, genre):
+    if not snapshot.count(genre=genre):
+        return Response({'error': f'Nenhum filme encontrado para o gênero: {genre}'}, status=status.HTTP_404_NOT_FOUND)
+    
+    response = list_response(snapshot, {'genre': genre}, request)
+    if hasattr(response, 'data'):
+        response.data['genre'] = genre
+    return response
+
+
+def create_movie(store, data):
+    """Valida e grava um filme novo (POST de /movies/)"""
     errors = validate_movie(data, is_update=False)
     if errors:
         return Response(errors, status=status.HTTP_400_BAD_REQUEST)
     
-    movies = load_movies()
-    new_id = max((m.get('id', 0) for m in movies), default=0) + 1
-    now = datetime.now().isoformat()
+    try:
+        created = store.create(build_new_movie(data))
+    except Exception:
+        return Response({'error': 'Erro ao salvar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(created, status=status.HTTP_201_CREATED, headers={'ETag': movie_etag(created)})
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@api_view(['GET', 'POST'])
+def get_all_movies(request):
+    """GET: Lista filmes com filtros (ou busca vários por ``?ids=``) | POST: Cria novo filme"""
+    if request.method == 'GET':
+        return list_movies(get_store().snapshot(), request)
+    return create_movie(get_store(), request.data)
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@api_view(['GET'])
+def get_movies_by_genre(request, genre):
+    """GET: Lista filmes por gênero"""
+    return list_movies_by_genre(get_store().snapshot(), request, genre)
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@cache_list_response
+@api_view(['GET'])
+def get_featured_movies(request):
+    """GET: Lista filmes em destaque"""
+    return list_response(get_store().snapshot(), {'featured': True}, request)
+
+
+@conditional_get(etag_func=query_etag, last_modified_func=catalog_last_modified)
+@require_GET
+def export_movies(request):
+    """GET: Exporta o catálogo inteiro (``?format=ndjson|csv``) com os filtros da listagem.
+
+    As linhas são geradas sob demanda a partir de um único snapshot, sem
+    paginação e sem montar a resposta inteira em memória. View Django pura:
+    no DRF o parâmetro ``format`` seleciona o renderer.
+    """
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            {'error': f'format deve ser um de: {", ".join(EXPORT_FORMATS)}'}, status=status.HTTP_400_BAD_REQUEST,
+        )
+    filters, error = parse_list_filters(request.GET)
+    if error:
+        return JsonResponse({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        project = parse_projection(request.GET)
+    except InvalidProjection as error:
+        return JsonResponse({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
     
-    new_movie = {
-        'id': new_id,
+    rows, content_type, extension = EXPORT_FORMATS[export_format]
+    snapshot = get_store().snapshot()
+    movies = (movie for _, movie in snapshot.iter_ordered(**filters))
+    response = StreamingHttpResponse(
+        rows(map(project, movies) if project else movies, project), content_type=content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="movies-{snapshot.seq}.{extension}"'
+    return response
+
+
+def if_match_versions(request, pk):
+    """Versões aceitas pelo cabeçalho If-Match, ou None se qualquer versão serve"""
+    header = request.META.get('HTTP_IF_MATCH')
+    if not header or header.strip() == '*':
+        return None
+    versions = set()
+    for etag in parse_etags(header):
+        movie_id, _, version = etag.strip('"').partition('.')
+        if movie_id == str(pk) and version.isdigit():
+            versions.add(int(version))
+    return versions
+
+
+def build_new_movie(data):
+    """Monta um filme novo (ainda sem id) a partir dos dados validados do POST"""
+    now = timezone.now().isoformat()
+    return {
         'title': data['title'],
         'description': data['description'],
         'genre': data['genre'],
@@ -164,89 +323,240 @@ def get_all_movies(request):
         'created_at': now,
         'updated_at': now
     }
-    
-    movies.append(new_movie)
-    if save_movies(movies):
-        return Response(new_movie, status=status.HTTP_201_CREATED)
-    return Response({'error': 'Erro ao salvar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['GET'])
-def get_movies_by_genre(request, genre):
-    """GET: Lista filmes por gênero"""
-    movies = [m for m in load_movies() if m.get('genre', '').lower() == genre.lower()]
-    
-    if not movies:
-        return Response({'error': f'Nenhum filme encontrado para o gênero: {genre}'}, status=status.HTTP_404_NOT_FOUND)
+def build_updated_movie(movie, data, partial):
+    """Retorna uma cópia do filme com os dados do PUT (completo) ou PATCH (parcial)"""
+    if not partial:
+        return {
+            'id': movie['id'],
+            'title': data['title'],
+            'description': data['description'],
+            'genre': data['genre'],
+            'release_year': int(data['release_year']),
+            'duration_minutes': int(data['duration_minutes']),
+            'rating': float(data['rating']),
+            'thumbnail_url': data['thumbnail_url'],
+            'video_url': data['video_url'],
+            'is_featured': data.get('is_featured', False),
+            'created_at': movie.get('created_at', timezone.now().isoformat()),
+            'updated_at': timezone.now().isoformat(),
+        }
     
-    response = paginate_response(movies, request)
-    if hasattr(response, 'data'):
-        response.data['genre'] = genre
-    return response
+    updated = movie.copy()
+    for key, value in data.items():
+        if key in ['title', 'description', 'genre', 'thumbnail_url', 'video_url']:
+            updated[key] = value
+        elif key == 'release_year':
+            updated[key] = int(value)
+        elif key == 'duration_minutes':
+            updated[key] = int(value)
+        elif key == 'rating':
+            updated[key] = float(value)
+        elif key == 'is_featured':
+            updated[key] = bool(value)
+    updated['updated_at'] = timezone.now().isoformat()
+    return updated
 
 
-@api_view(['GET'])
-def get_featured_movies(request):
-    """GET: Lista filmes em destaque"""
-    movies = [m for m in load_movies() if m.get('is_featured', False)]
-    return paginate_response(movies, request)
+def version_conflict_response(conflict):
+    """Resposta 412 com o ETag atual do filme"""
+    return Response(
+        {'error': 'O filme foi modificado por outra requisição', 'current_version': movie_version(conflict.movie)},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+        headers={'ETag': movie_etag(conflict.movie)},
+    )
 
 
-@api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
-def movie_detail(request, pk):
-    """GET: Busca filme | PUT: Atualiza completo | PATCH: Atualiza parcial | DELETE: Remove"""
-    movies = load_movies()
-    movie, index = find_movie(movies, pk)
-    
+def retrieve_movie(snapshot, request, pk):
+    """GET de /movies/<pk>/, com a projeção de ``?fields=``"""
+    movie = snapshot.index.get(pk)
     if movie is None:
         return Response({'error': 'Filme não encontrado'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        project = parse_projection(request.query_params)
+    except InvalidProjection as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(project(movie) if project else movie)
+
+
+def change_movie(store, pk, method, data, expected_versions):
+    """Aplica PUT, PATCH ou DELETE ao filme ``pk`` (``expected_versions`` vem do If-Match)"""
+    if store.snapshot().index.get(pk) is None:
+        return Response({'error': 'Filme não encontrado'}, status=status.HTTP_404_NOT_FOUND)
     
-    if request.method == 'GET':
-        return Response(movie)
-    
-    if request.method == 'DELETE':
-        movies.pop(index)
-        if save_movies(movies):
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        return Response({'error': 'Erro ao deletar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    if method == 'DELETE':
+        try:
+            store.delete(pk, expected_versions=expected_versions)
+        except KeyError:
+            return Response({'error': 'Filme não encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        except VersionConflict as conflict:
+            return version_conflict_response(conflict)
+        except Exception:
+            return Response({'error': 'Erro ao deletar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(status=status.HTTP_204_NO_CONTENT)
     
     # PUT ou PATCH
-    data = request.data
-    errors = validate_movie(data, is_update=(request.method == 'PATCH'))
+    partial = method == 'PATCH'
+    errors = validate_movie(data, is_update=partial)
     if errors:
         return Response(errors, status=status.HTTP_400_BAD_REQUEST)
     
-    if request.method == 'PUT':
-        updated = {
-            'id': pk,
-            'title': data['title'],
-            'description': data['description'],
-            'genre': data['genre'],
-            'release_year': int(data['release_year']),
-            'duration_minutes': int(data['duration_minutes']),
-            'rating': float(data['rating']),
-            'thumbnail_url': data['thumbnail_url'],
-            'video_url': data['video_url'],
-            'is_featured': data.get('is_featured', False),
-            'created_at': movie.get('created_at', datetime.now().isoformat()),
-            'updated_at': datetime.now().isoformat()
-        }
-    else:  # PATCH
-        updated = movie.copy()
-        for key, value in data.items():
-            if key in ['title', 'description', 'genre', 'thumbnail_url', 'video_url']:
-                updated[key] = value
-            elif key == 'release_year':
-                updated[key] = int(value)
-            elif key == 'duration_minutes':
-                updated[key] = int(value)
-            elif key == 'rating':
-                updated[key] = float(value)
-            elif key == 'is_featured':
-                updated[key] = bool(value)
-        updated['updated_at'] = datetime.now().isoformat()
-    
-    movies[index] = updated
-    if save_movies(movies):
-        return Response(updated)
-    return Response({'error': 'Erro ao salvar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    try:
+        updated = store.update(
+            pk, lambda current: build_updated_movie(current, data, partial), expected_versions=expected_versions,
+        )
+    except KeyError:
+        return Response({'error': 'Filme não encontrado'}, status=status.HTTP_404_NOT_FOUND)
+    except VersionConflict as conflict:
+        return version_conflict_response(conflict)
+    except Exception:
+        return Response({'error': 'Erro ao salvar o filme'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(updated, headers={'ETag': movie_etag(updated)})
+
+
+@conditional_get(etag_func=movie_detail_etag, last_modified_func=movie_detail_last_modified)
+@api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
+def movie_detail(request, pk):
+    """GET: Busca filme | PUT: Atualiza completo | PATCH: Atualiza parcial | DELETE: Remove
+
+    GET responde 304 para If-None-Match / If-Modified-Since atendidos; gravações
+    aceitam If-Match com o ETag do filme e respondem 412 se ele mudou.
+    """
+    if request.method == 'GET':
+        return retrieve_movie(get_store().snapshot(), request, pk)
+    data = request.data if request.method != 'DELETE' else None
+    return change_movie(get_store(), pk, request.method, data, if_match_versions(request, pk))
+
+
+def validate_bulk_operation(operation):
+    """Valida uma operação do lote sem consultar o catálogo; retorna um dict de erros"""
+    if not isinstance(operation, dict):
+        return {'operation': ['Cada operação deve ser um objeto']}
+    op = operation.get('op')
+    if op not in BULK_OPERATIONS:
+        return {'op': [f'op deve ser um de: {", ".join(BULK_OPERATIONS)}']}
+    errors = {}
+    if op != 'create' and (not isinstance(operation.get('id'), int) or isinstance(operation.get('id'), bool)):
+        errors['id'] = ['id deve ser um número inteiro']
+    version = operation.get('version')
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        errors['version'] = ['version deve ser um número inteiro']
+    if op != 'delete':
+        data = operation.get('data')
+        if not isinstance(data, dict):
+            errors['data'] = ['data deve ser um objeto com os campos do filme']
+        else:
+            errors.update(validate_movie(data, is_update=op == 'patch'))
+    return errors
+
+
+def apply_bulk_operations(snapshot, operations, results, atomic):
+    """Aplica as operações válidas sobre ``snapshot``; retorna (puts, deletes) para o store.
+
+    Roda dentro de ``MovieStore.transact``, com o lock de escrita. ``version``
+    é comparada com a versão do filme antes do lote. No modo atômico, qualquer
+    falha descarta o lote inteiro.
+    """
+    working = {}
+    next_id = snapshot.last_id
+    for position, operation in enumerate(operations):
+        result = results[position]
+        if result['status'] != status.HTTP_200_OK:
+            continue
+        op = operation['op']
+        if op == 'create':
+            next_id += 1
+            working[next_id] = {**build_new_movie(operation['data']), 'id': next_id}
+            result.update(id=next_id, status=status.HTTP_201_CREATED)
+            continue
+        
+        pk = operation['id']
+        movie = working[pk] if pk in working else snapshot.index.get(pk)
+        if movie is None:
+            result.update(status=status.HTTP_404_NOT_FOUND, error='Filme não encontrado')
+            continue
+        original = snapshot.index.get(pk)
+        expected = operation.get('version')
+        if expected is not None and (original is None or movie_version(original) != expected):
+            result.update(
+                status=status.HTTP_412_PRECONDITION_FAILED,
+                error='O filme foi modificado por outra requisição',
+                current_version=movie_version(original) if original else None,
+            )
+            continue
+        if op == 'delete':
+            working[pk] = None
+            result['status'] = status.HTTP_204_NO_CONTENT
+        else:
+            working[pk] = {**build_updated_movie(movie, operation['data'], op == 'patch'), 'id': pk}
+    
+    if atomic and any(result['status'] >= 400 for result in results):
+        return [], []
+    puts = [movie for movie in working.values() if movie is not None]
+    deletes = [pk for pk, movie in working.items() if movie is None and snapshot.index.get(pk) is not None]
+    return puts, deletes
+
+
+def apply_bulk(store, data):
+    """Valida e grava o lote de ``bulk_movies`` em uma transação do store"""
+    operations = data.get('operations') if isinstance(data, dict) else data
+    if not isinstance(operations, list) or not operations:
+        return Response({'error': 'operations deve ser uma lista não vazia'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(operations) > BULK_MAX_OPERATIONS:
+        return Response(
+            {'error': f'No máximo {BULK_MAX_OPERATIONS} operações por requisição'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    atomic = data.get('atomic', True) if isinstance(data, dict) else True
+    if not isinstance(atomic, bool):
+        return Response({'error': 'atomic deve ser true ou false'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = []
+    for position, operation in enumerate(operations):
+        errors = validate_bulk_operation(operation)
+        result = {'index': position, 'op': operation.get('op') if isinstance(operation, dict) else None}
+        if isinstance(operation, dict) and 'id' in operation:
+            result['id'] = operation['id']
+        if errors:
+            result.update(status=status.HTTP_400_BAD_REQUEST, errors=errors)
+        else:
+            result['status'] = status.HTTP_200_OK
+        results.append(result)
+    
+    failed = any(result['status'] >= 400 for result in results)
+    if not (atomic and failed):
+        try:
+            committed = store.transact(
+                lambda snapshot: apply_bulk_operations(snapshot, operations, results, atomic)
+            )
+        except Exception:
+            return Response({'error': 'Erro ao salvar os filmes'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        failed = any(result['status'] >= 400 for result in results)
+        if not (atomic and failed):
+            for result in results:
+                if result['status'] in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+                    result['movie'] = committed.index.get(result['id'])
+    
+    if atomic and failed:
+        for result in results:
+            if result['status'] < 400:
+                result['status'] = status.HTTP_424_FAILED_DEPENDENCY
+        return Response({'atomic': True, 'applied': False, 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(
+        {'atomic': atomic, 'applied': True, 'results': results},
+        status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK,
+    )
+
+
+@api_view(['POST'])
+def bulk_movies(request):
+    """POST: Aplica um lote de operações (create, update, patch, delete) em uma única gravação.
+
+    Corpo: ``{"operations": [{"op": "update", "id": 1, "data": {...}, "version": 2}, ...],
+    "atomic": true}``. No modo atômico (padrão) nada é gravado se alguma
+    operação falhar; com ``"atomic": false`` as operações válidas são gravadas
+    e as inválidas reportadas. A resposta traz o resultado de cada operação,
+    na ordem recebida.
+    """
+    return apply_bulk(get_store(), request.data)
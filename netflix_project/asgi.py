@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netflix_project.settings')
+# Sob ASGI a API e o catálogo usam as views assíncronas (MOVIES_ASYNC_VIEWS=0 desativa)
+os.environ.setdefault('MOVIES_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -85,6 +86,74 @@ DATABASES = {
 }
 
 
+# Cache
+# O alias 'movies' guarda as respostas das listagens da API, versionadas pela
+# versão do catálogo (MOVIES_RESPONSE_CACHE = None desativa); 'catalog' guarda
+# os fragmentos HTML renderizados das páginas do catálogo web
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'movies': {
+        'BACKEND': 'movies.cache.ByteBudgetLocMemCache',
+        'LOCATION': 'movies-responses',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'MAX_BYTES': 32 * 1024 * 1024,
+        },
+    },
+    'catalog': {
+        'BACKEND': 'movies.cache.ByteBudgetLocMemCache',
+        'LOCATION': 'catalog-fragments',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+            'MAX_BYTES': 16 * 1024 * 1024,
+        },
+    },
+}
+MOVIES_RESPONSE_CACHE = 'movies'
+# Fragmentos HTML do catálogo web (grade da home por versão do catálogo e cards/detalhes por filme)
+CATALOG_FRAGMENT_CACHE = 'catalog'
+CATALOG_HOME_PAGE_SIZE = 24
+
+# Onde o catálogo é guardado: 'json' (movies/data/movies.json + log de mutações)
+# ou 'orm' (modelo movies.Movie; importe o JSON com manage.py import_movies_to_db).
+# No 'orm', gênero e busca usam as tabelas indexadas MovieGenre/MovieTerm, com a
+# mesma normalização (acentos, prefixos, pesos) do JSON; o índice de tokens
+# pressupõe comparação binária de strings (SQLite; no PostgreSQL, collation "C").
+MOVIES_STORAGE_BACKEND = 'json'
+# Representação do catálogo em memória no backend JSON: 'dict' (um dicionário por filme)
+# ou 'columnar' (colunas compactas, para catálogos grandes; ver movies/columnar.py)
+MOVIES_CATALOG_LAYOUT = 'dict'
+# Imagem binária do catálogo e dos índices (movies.json.image), publicada a cada
+# compactação e mapeada com mmap por todos os workers: a memória do catálogo é
+# compartilhada entre os processos em vez de replicada (ver movies/shared.py).
+# Também encurta a partida dos workers; gere a imagem no deploy com
+# ``manage.py build_catalog_image`` (validada pelo checksum do JSON)
+MOVIES_SHARED_SNAPSHOT = False
+
+# Métricas (latência por rota, carga do catálogo, cache, bytes gravados) em /metrics,
+# no formato do Prometheus. Opcionais: o middleware e a rota só existem com
+# MOVIES_METRICS_ENABLED, e a leitura exige o token (Authorization: Bearer) ou
+# um usuário staff
+MOVIES_METRICS_ENABLED = os.environ.get('MOVIES_METRICS_ENABLED', '0') == '1'
+MOVIES_METRICS_TOKEN = os.environ.get('MOVIES_METRICS_TOKEN')
+if MOVIES_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'movies.metrics.MetricsMiddleware')
+
+# Views assíncronas (API e catálogo web) com o store assíncrono: ativadas pelo
+# asgi.py; sob WSGI as views síncronas continuam sendo usadas
+MOVIES_ASYNC_VIEWS = os.environ.get('MOVIES_ASYNC_VIEWS', '0') == '1'
+MOVIES_ASYNC_IO_WORKERS = 4
+MOVIES_ASYNC_QUERY_WORKERS = 4
+
+# Serialização JSON do catálogo e das respostas: 'auto' usa orjson se instalado, 'json' força a stdlib
+MOVIES_JSON_BACKEND = 'auto'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -130,7 +199,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'movies.renderers.CatalogJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -14,9 +14,11 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
+from movies.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -35,7 +37,11 @@ urlpatterns = [
         auth_views.LogoutView.as_view(next_page='/accounts/login/'),
         name='logout'
     ),
-    
-    # Catálogo web (deve vir por último para não conflitar com /api/)
-    path('', include('catalog.urls')),
-]
\ No newline at end of file
+]
+
+# Métricas no formato do Prometheus (opcionais; token ou usuário staff)
+if getattr(settings, 'MOVIES_METRICS_ENABLED', False):
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
+
+# Catálogo web (deve vir por último para não conflitar com /api/)
+urlpatterns.append(path('', include('catalog.urls')))
\ No newline at end of file